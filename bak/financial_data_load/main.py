@@ -5,7 +5,14 @@ Usage from financial_data_load directory:
 
     One-time setup (slow — processes PDFs via LLM):
         uv run python main.py load --clear           # Load metadata + process PDFs
-        uv run python main.py backup                 # Back up database to JSON
+        uv run python main.py load --concurrency 4   # Process 4 PDFs at a time
+        uv run python main.py load --parse-workers 8 # Pre-chunk PDFs across 8 cores
+        uv run python main.py load --streaming       # Overlap extraction and writes
+        uv run python main.py load --lookup-indexes  # Index merge keys during load
+        uv run python main.py load --resume          # Retry only failed/new PDFs
+        uv run python main.py load --incremental     # Re-extract only new/changed PDFs
+        uv run python main.py backup                 # Back up database to backups/
+        uv run python main.py backup --diff          # Back up changes since the latest backup
 
     Entity resolution pipeline (fast — restore and iterate):
         uv run python main.py restore                # Restore database from backup
@@ -20,6 +27,8 @@ Usage from financial_data_load directory:
         uv run python main.py verify                 # Print node/relationship counts
         uv run python main.py clean                  # Clear all data
         uv run python main.py samples [--limit N]    # Run sample queries
+        uv run python main.py bench load             # Offline ingestion benchmark
+        uv run python main.py bench prefilter        # ER pre-filter candidate generation
 
     Workshop solution runner:
         uv run python main.py solutions              # Interactive menu
@@ -63,13 +72,28 @@ def cmd_load(args):
         clear_database, create_company_nodes,
         load_company_metadata,
     )
+    from src.manifest import IngestionManifest, reset_manifest
     from src.pipeline import process_all_pdfs
 
+    if args.clear and (args.resume or args.incremental):
+        print("--clear cannot be combined with --resume or --incremental.")
+        return
+
     start = time.monotonic()
 
     with connect() as driver:
         if args.clear:
             clear_database(driver)
+            reset_manifest()
+            print()
+
+        manifest = IngestionManifest.load()
+
+        if args.lookup_indexes:
+            from src.schema import create_lookup_indexes
+
+            print("Creating lookup indexes...")
+            create_lookup_indexes(driver)
             print()
 
         # Load metadata (no constraints yet -- pipeline needs to write freely)
@@ -93,12 +117,38 @@ def cmd_load(args):
             if not pdf_files:
                 print("No matching PDFs found.")
                 return
+            # Named PDFs are always reprocessed: drop what an earlier load wrote.
+            from src.incremental import IncrementalPlan, apply_deletions
+
+            apply_deletions(driver, IncrementalPlan(changed=pdf_files), manifest)
+        elif args.incremental:
+            from src.incremental import apply_deletions, plan_incremental
+
+            plan = plan_incremental(pdf_files, manifest)
+            print(f"Incremental: {len(plan.new)} new, {len(plan.changed)} changed, "
+                  f"{len(plan.removed)} removed, {len(plan.unchanged)} unchanged")
+            apply_deletions(driver, plan, manifest)
+            if not plan.to_process:
+                print("No new or changed PDFs to process.")
+                return
+            pdf_files = plan.to_process
+        elif args.resume:
+            pending = manifest.pending(pdf_files)
+            print(f"Resuming: {len(pdf_files) - len(pending)} complete, "
+                  f"{len(pending)} failed, interrupted or new")
+            if not pending:
+                print("Nothing to resume.")
+                return
+            pdf_files = pending
         elif args.limit:
             pdf_files = pdf_files[:args.limit]
 
         # Run pipeline
         print(f"\nProcessing {len(pdf_files)} PDFs...")
-        process_all_pdfs(driver, pdf_files, company_meta)
+        process_all_pdfs(
+            driver, pdf_files, company_meta,
+            concurrency=args.concurrency, manifest=manifest,
+            parse_workers=args.parse_workers, streaming=args.streaming)
 
     elapsed = time.monotonic() - start
     print(f"\nPDF processing done in {_fmt_elapsed(elapsed)}.")
@@ -106,18 +156,28 @@ def cmd_load(args):
 
 
 def cmd_backup(args):
-    """Back up the full database to a JSON file."""
+    """Back up the full database, or its changes since a base backup, to a backup directory."""
     from src.config import connect
-    from src.backup import backup_database
+    from src.backup import backup_database, latest_backup
+
+    base = None
+    if args.diff:
+        base = latest_backup() if args.diff == "latest" else Path(args.diff)
+        if base is None or not base.is_dir():
+            print("No backup directory to diff against. Run 'uv run python main.py backup' first.")
+            return
 
     with connect() as driver:
-        backup_database(driver)
+        backup_database(
+            driver, concurrency=args.concurrency, compress=not args.no_compress, base=base)
 
 
 def cmd_restore(args):
     """Restore database from a backup file."""
     from src.config import connect
     from src.backup import restore_database, latest_backup
+    from src.incremental import document_filenames
+    from src.manifest import IngestionManifest
 
     if args.backup:
         backup_path = Path(args.backup)
@@ -129,7 +189,11 @@ def cmd_restore(args):
 
     print(f"Using backup: {backup_path}")
     with connect() as driver:
-        restore_database(driver, backup_path)
+        restore_database(driver, backup_path, concurrency=args.concurrency)
+        # The manifest must describe the restored graph, not the one it replaced.
+        dropped = IngestionManifest.load().retain(document_filenames(driver))
+        if dropped:
+            print(f"Ingestion manifest: forgot {dropped} PDF(s) not in the restored backup")
 
 
 def cmd_snapshot(args):
@@ -168,6 +232,12 @@ def cmd_resolve(args):
         overrides["max_group_size"] = args.max_group_size
     if args.batch_size is not None:
         overrides["batch_size"] = args.batch_size
+    if args.concurrency is not None:
+        overrides["concurrency"] = args.concurrency
+    if args.blocking:
+        overrides["pre_filter_blocking"] = True
+    if args.top_k is not None:
+        overrides["ann_top_k"] = args.top_k
 
     print(f"Using snapshot: {snapshot_path}")
     if overrides:
@@ -190,7 +260,9 @@ def cmd_apply_merges(args):
 
     print(f"Using merge plan: {plan_path}")
     with connect() as driver:
-        apply_merge_plan(driver, plan_path)
+        apply_merge_plan(
+            driver, plan_path, batch_size=args.batch_size, concurrency=args.concurrency,
+        )
 
 
 def cmd_compare(args):
@@ -204,7 +276,7 @@ def cmd_finalize(args):
     """Run post-resolution steps: constraints → indexes → asset managers → verify."""
     from src.config import connect
     from src.loader import (
-        load_asset_managers, create_asset_manager_relationships, verify,
+        iter_asset_managers, create_asset_manager_relationships, verify,
     )
     from src.schema import (
         create_all_constraints, create_fulltext_indexes,
@@ -214,7 +286,7 @@ def cmd_finalize(args):
 
     with connect() as driver:
         print("Creating constraints...")
-        create_all_constraints(driver)
+        create_all_constraints(driver, dedup_concurrency=args.dedup_concurrency)
 
         print("\nCreating indexes...")
         create_embedding_indexes(driver)
@@ -222,8 +294,8 @@ def cmd_finalize(args):
 
         if ASSET_MANAGER_CSV.exists():
             print()
-            holdings = load_asset_managers(ASSET_MANAGER_CSV)
-            create_asset_manager_relationships(driver, holdings)
+            create_asset_manager_relationships(
+                driver, iter_asset_managers(ASSET_MANAGER_CSV), batch_size=args.batch_size)
 
         verify(driver)
         validate_enrichment(driver)
@@ -248,8 +320,11 @@ def cmd_clean(args):
     from src.config import connect
     from src.loader import clear_database
 
+    from src.manifest import reset_manifest
+
     with connect() as driver:
         clear_database(driver)
+    reset_manifest()
     print("\nDone.")
 
 
@@ -259,6 +334,44 @@ def cmd_test(args):
     test_connection.main()
 
 
+def cmd_bench(args):
+    """Benchmark PDF ingestion offline, or entity resolution pre-filters."""
+    if args.target == "prefilter":
+        from src.bench import print_prefilter_result, run_prefilter_benchmark
+
+        result = run_prefilter_benchmark(
+            args.sizes,
+            threshold=args.threshold,
+            exact_max=args.exact_max,
+            seed=args.seed,
+        )
+        print_prefilter_result(result)
+        return
+
+    from src.bench import print_bench_result, run_load_benchmark
+
+    pdf_files = sorted(PDF_DIR.glob("*.pdf"))
+    if not pdf_files:
+        print(f"No PDF files found in: {PDF_DIR}")
+        return
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    result = run_load_benchmark(
+        pdf_files,
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        streaming=args.streaming,
+        llm_latency=args.llm_latency,
+        embed_latency=args.embed_latency,
+        write_latency=args.write_latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        rate_limits=args.rate_limits,
+    )
+    print_bench_result(result)
+
+
 def cmd_samples(args):
     """Run sample queries showcasing the knowledge graph (read-only)."""
     from src.config import connect
@@ -458,20 +571,52 @@ def main():
     pdf_group.add_argument(
         "--files", nargs="+", metavar="PDF",
         help="Process only these specific PDF filenames (e.g. 0001004980-23-000029.pdf)")
+    pdf_group.add_argument(
+        "--resume", action="store_true",
+        help="Process only PDFs that failed or are new since the last load")
+    pdf_group.add_argument(
+        "--incremental", action="store_true",
+        help="Re-extract only new/changed PDFs; delete subgraphs of changed/removed ones")
     p_load.add_argument(
         "--clear", action="store_true", help="Clear database first")
+    p_load.add_argument(
+        "--concurrency", type=int, default=1, metavar="N",
+        help="Process up to N PDFs at once (default: 1)")
+    p_load.add_argument(
+        "--parse-workers", type=int, default=0, metavar="N",
+        help="Parse and chunk PDFs up front in N processes (default: 0, parse inline)")
+    p_load.add_argument(
+        "--streaming", action="store_true",
+        help="Stream chunk batches through embed, extract, and write stages")
+    p_load.add_argument(
+        "--lookup-indexes", action="store_true",
+        help="Index merge keys before loading; finalize swaps them for constraints")
     p_load.set_defaults(func=cmd_load)
 
     # backup
     p_backup = subparsers.add_parser(
-        "backup", help="Back up full database to JSON file")
+        "backup", help="Back up full database (float32 embeddings + JSONL)")
+    p_backup.add_argument(
+        "--concurrency", type=int, default=4, metavar="N",
+        help="Export up to N label/type partitions at once (default: 4)")
+    p_backup.add_argument(
+        "--no-compress", action="store_true",
+        help="Write plain .jsonl part files instead of gzip")
+    p_backup.add_argument(
+        "--diff", nargs="?", const="latest", metavar="BASE",
+        help="Store only changes since BASE backup directory (default: latest backup)")
     p_backup.set_defaults(func=cmd_backup)
 
     # restore
     p_restore = subparsers.add_parser(
         "restore", help="Restore database from backup file")
     p_restore.add_argument(
-        "--backup", help="Path to backup file (default: latest)")
+        "--backup",
+        help="Path to backup directory or legacy JSON file (default: latest); "
+             "a differential backup restores its whole chain")
+    p_restore.add_argument(
+        "--concurrency", type=int, default=4, metavar="N",
+        help="Write up to N node/relationship batches at once (default: 4)")
     p_restore.set_defaults(func=cmd_restore)
 
     # snapshot
@@ -485,7 +630,7 @@ def main():
     p_resolve.add_argument(
         "--snapshot", help="Path to snapshot file (default: latest)")
     p_resolve.add_argument(
-        "--strategy", choices=["fuzzy", "prefix"],
+        "--strategy", choices=["fuzzy", "prefix", "ann"],
         help="Pre-filter strategy (default: from .env or 'fuzzy')")
     p_resolve.add_argument(
         "--threshold", type=float,
@@ -502,6 +647,15 @@ def main():
     p_resolve.add_argument(
         "--batch-size", type=int,
         help="Pairs per LLM batch (default: from .env or 10)")
+    p_resolve.add_argument(
+        "--blocking", action="store_true",
+        help="Fuzzy pre-filter: score only pairs sharing a rare q-gram (misses pairs below ~0.8)")
+    p_resolve.add_argument(
+        "--concurrency", type=int, metavar="N",
+        help="LLM batches in flight at once (default: from .env or 4)")
+    p_resolve.add_argument(
+        "--top-k", type=int,
+        help="Neighbours per entity for the ann strategy (default: from .env or 10)")
     p_resolve.set_defaults(func=cmd_resolve)
 
     # apply-merges
@@ -509,6 +663,12 @@ def main():
         "apply-merges", help="Apply merge plan to Neo4j")
     p_apply.add_argument(
         "--plan", help="Path to merge plan file (default: latest)")
+    p_apply.add_argument(
+        "--batch-size", type=int, default=100, metavar="N",
+        help="Merge groups per UNWIND write transaction (default: 100)")
+    p_apply.add_argument(
+        "--concurrency", type=int, default=4, metavar="N",
+        help="Merge batches applied at once (default: 4)")
     p_apply.set_defaults(func=cmd_apply_merges)
 
     # compare
@@ -519,6 +679,12 @@ def main():
     # finalize
     p_finalize = subparsers.add_parser(
         "finalize", help="Post-resolution: constraints, indexes, asset managers, verify")
+    p_finalize.add_argument(
+        "--batch-size", type=int, default=1000, metavar="N",
+        help="Holdings rows per UNWIND write transaction (default: 1000)")
+    p_finalize.add_argument(
+        "--dedup-concurrency", type=int, default=1, metavar="N",
+        help="Dedup exact-name duplicates of up to N labels at once (default: 1)")
     p_finalize.set_defaults(func=cmd_finalize)
 
     # verify
@@ -538,6 +704,50 @@ def main():
         "--limit", type=int, default=10, help="Rows per section (default: 10)")
     p_samples.set_defaults(func=cmd_samples)
 
+    # bench
+    p_bench = subparsers.add_parser(
+        "bench", help="Offline benchmark with fake LLM, embedder, and Neo4j")
+    p_bench.add_argument(
+        "target", choices=["load", "prefilter"],
+        help="What to benchmark (load: PDF ingestion, prefilter: ER candidate generation)")
+    p_bench.add_argument(
+        "--limit", type=int, metavar="N", help="Benchmark only the first N PDFs")
+    p_bench.add_argument(
+        "--concurrency", type=int, default=1, metavar="N",
+        help="Process up to N PDFs at once (default: 1)")
+    p_bench.add_argument(
+        "--parse-workers", type=int, default=0, metavar="N",
+        help="Parse and chunk PDFs up front in N processes (default: 0)")
+    p_bench.add_argument(
+        "--streaming", action="store_true", help="Use the streaming pipeline")
+    p_bench.add_argument(
+        "--llm-latency", type=float, default=0.5, metavar="SECS",
+        help="Fake LLM latency per request (default: 0.5)")
+    p_bench.add_argument(
+        "--embed-latency", type=float, default=0.05, metavar="SECS",
+        help="Fake embedder latency per text (default: 0.05)")
+    p_bench.add_argument(
+        "--write-latency", type=float, default=0.01, metavar="SECS",
+        help="Fake Neo4j latency per query (default: 0.01)")
+    p_bench.add_argument(
+        "--error-rate", type=float, default=0.0, metavar="P",
+        help="Fraction of LLM/embedding requests failing with 429 (default: 0)")
+    p_bench.add_argument(
+        "--seed", type=int, default=0, help="Seed for latency jitter and errors")
+    p_bench.add_argument(
+        "--rate-limits", action="store_true",
+        help="Pace the stand-ins with the RATE_LIMIT_* quotas (default: unthrottled)")
+    p_bench.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000], metavar="N",
+        help="prefilter: synthetic entity counts (default: 1000 10000 100000)")
+    p_bench.add_argument(
+        "--threshold", type=float, default=0.6,
+        help="prefilter: pre-filter threshold (default: 0.6)")
+    p_bench.add_argument(
+        "--exact-max", type=int, default=10000, metavar="N",
+        help="prefilter: largest count to score every pair for recall (default: 10000)")
+    p_bench.set_defaults(func=cmd_bench)
+
     # test
     p_test = subparsers.add_parser(
         "test", help="Test Neo4j and Azure AI connections")
@@ -21,6 +21,7 @@ import argparse
 from neo4j import GraphDatabase
 
 from .config import Neo4jConfig
+from stats import SCHEMA_RELATIONSHIPS, graph_stats
 
 
 def test_merge_query_generation():
@@ -217,85 +218,68 @@ def test_graph_node_counts(driver):
     """Validate node counts by label."""
     print("\n=== Test: Graph Node Counts ===")
 
-    with driver.session() as session:
-        # Get all node labels and counts
-        result = session.run("""
-            MATCH (n)
-            WITH labels(n) AS lbls, count(n) AS cnt
-            UNWIND lbls AS label
-            RETURN label, sum(cnt) AS count
-            ORDER BY count DESC
-        """)
+    stats = graph_stats(driver)
+    counts = stats.labels
+    print("  Node counts by label:")
+    for label, count in sorted(counts.items(), key=lambda x: -x[1]):
+        print(f"    {label}: {count}")
 
-        counts = {record["label"]: record["count"] for record in result}
-        print("  Node counts by label:")
-        for label, count in sorted(counts.items(), key=lambda x: -x[1]):
-            print(f"    {label}: {count}")
+    # Define expected labels based on SEC 10-K schema
+    expected_labels = ["Company", "RiskFactor", "Product", "Executive", "FinancialMetric"]
+    infrastructure_labels = ["__KGBuilder__", "__Entity__", "Chunk", "Document"]
 
-        # Define expected labels based on SEC 10-K schema
-        expected_labels = ["Company", "RiskFactor", "Product", "Executive", "FinancialMetric"]
-        infrastructure_labels = ["__KGBuilder__", "__Entity__", "Chunk", "Document"]
-
-        checks = [
-            ("Has Company nodes", counts.get("Company", 0) > 0),
-            ("Has __KGBuilder__ nodes", counts.get("__KGBuilder__", 0) > 0),
-            ("Total nodes > 0", sum(counts.values()) > 0),
-        ]
+    checks = [
+        ("Has Company nodes", stats.count("Company") > 0),
+        ("Has __KGBuilder__ nodes", stats.count("__KGBuilder__") > 0),
+        ("Total nodes > 0", stats.nodes > 0),
+    ]
 
-        # Check for entity nodes (at least one type should exist)
-        entity_exists = any(counts.get(label, 0) > 0 for label in expected_labels)
-        checks.append(("Has at least one entity type", entity_exists))
+    # Check for entity nodes (at least one type should exist)
+    entity_exists = any(stats.count(label) > 0 for label in expected_labels)
+    checks.append(("Has at least one entity type", entity_exists))
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_relationship_counts(driver):
     """Validate relationship counts by type."""
     print("\n=== Test: Graph Relationship Counts ===")
 
-    with driver.session() as session:
-        # Get all relationship types and counts
-        result = session.run("""
-            MATCH ()-[r]->()
-            RETURN type(r) AS type, count(r) AS count
-            ORDER BY count DESC
-        """)
-
-        counts = {record["type"]: record["count"] for record in result}
-        print("  Relationship counts by type:")
-        for rel_type, count in sorted(counts.items(), key=lambda x: -x[1]):
-            print(f"    {rel_type}: {count}")
+    stats = graph_stats(driver)
+    counts = stats.relationship_types
+    print("  Relationship counts by type:")
+    for rel_type, count in sorted(counts.items(), key=lambda x: -x[1]):
+        print(f"    {rel_type}: {count}")
 
-        # Expected relationship types from SEC 10-K schema
-        schema_relationships = ["FACES_RISK", "OFFERS", "HAS_EXECUTIVE", "REPORTS", "COMPETES_WITH", "PARTNERS_WITH"]
-        lexical_relationships = ["FROM_CHUNK", "FROM_DOCUMENT", "NEXT_CHUNK"]
+    # Expected relationship types from SEC 10-K schema
+    lexical_relationships = ["FROM_CHUNK", "FROM_DOCUMENT", "NEXT_CHUNK"]
 
-        checks = [
-            ("Has relationships", sum(counts.values()) > 0),
-            ("Has FROM_CHUNK relationships (provenance)", counts.get("FROM_CHUNK", 0) > 0),
-        ]
+    checks = [
+        ("Has relationships", stats.relationships > 0),
+        ("Has FROM_CHUNK relationships (provenance)", stats.rel_count("FROM_CHUNK") > 0),
+    ]
 
-        # Check if at least one schema relationship exists
-        schema_rel_exists = any(counts.get(rel, 0) > 0 for rel in schema_relationships)
-        checks.append(("Has at least one schema relationship type", schema_rel_exists))
+    # Check if at least one schema relationship exists
+    schema_rel_exists = any(stats.rel_count(rel) > 0 for rel in SCHEMA_RELATIONSHIPS)
+    checks.append(("Has at least one schema relationship type", schema_rel_exists))
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_schema_compliance(driver):
@@ -368,263 +352,148 @@ def test_graph_lexical_structure(driver):
     """Validate the lexical graph structure (Document -> Chunk -> Entity)."""
     print("\n=== Test: Lexical Graph Structure ===")
 
-    with driver.session() as session:
-        # Check Document nodes
-        doc_result = session.run("""
-            MATCH (d:Document)
-            RETURN count(d) AS count
-        """)
-        doc_count = doc_result.single()["count"]
-
-        # Check Chunk nodes
-        chunk_result = session.run("""
-            MATCH (c:Chunk)
-            RETURN count(c) AS count,
-                   count(CASE WHEN c.text IS NOT NULL THEN 1 END) AS with_text,
-                   count(CASE WHEN c.index IS NOT NULL THEN 1 END) AS with_index
-        """)
-        chunk_record = chunk_result.single()
-
-        # Check Document-Chunk relationships
-        # Direction: (Chunk)-[:FROM_DOCUMENT]->(Document)
-        doc_chunk_result = session.run("""
-            MATCH (c:Chunk)-[:FROM_DOCUMENT]->(d:Document)
-            RETURN count(DISTINCT d) AS docs_with_chunks,
-                   count(c) AS chunks_linked
-        """)
-        doc_chunk_record = doc_chunk_result.single()
-
-        # Check Entity-Chunk relationships (provenance)
-        entity_chunk_result = session.run("""
-            MATCH (e:__Entity__)-[:FROM_CHUNK]->(c:Chunk)
-            RETURN count(DISTINCT e) AS entities_with_provenance,
-                   count(*) AS provenance_links
-        """)
-        entity_chunk_record = entity_chunk_result.single()
+    stats = graph_stats(driver)
+    chunks = stats.count("Chunk")
 
-        print(f"  Documents: {doc_count}")
-        print(f"  Chunks: {chunk_record['count']} (with text: {chunk_record['with_text']}, with index: {chunk_record['with_index']})")
-        print(f"  Documents with chunks: {doc_chunk_record['docs_with_chunks']}")
-        print(f"  Entities with provenance: {entity_chunk_record['entities_with_provenance']}")
-        print(f"  Provenance links: {entity_chunk_record['provenance_links']}")
+    print(f"  Documents: {stats.count('Document')}")
+    print(f"  Chunks: {chunks} (with text: {stats.chunks_with_text}, with index: {stats.chunks_with_index})")
+    print(f"  Documents with chunks: {stats.documents_with_chunks}")
+    print(f"  Entities with provenance: {stats.entities_with_provenance}")
+    print(f"  Provenance links: {stats.provenance_links}")
 
-        checks = [
-            ("Chunks have 'text' property", chunk_record["with_text"] == chunk_record["count"] or chunk_record["count"] == 0),
-            ("Chunks have 'index' property", chunk_record["with_index"] == chunk_record["count"] or chunk_record["count"] == 0),
-            ("Entities have provenance (FROM_CHUNK)", entity_chunk_record["provenance_links"] > 0 or chunk_record["count"] == 0),
-        ]
+    checks = [
+        ("Chunks have 'text' property", stats.chunks_with_text == chunks or chunks == 0),
+        ("Chunks have 'index' property", stats.chunks_with_index == chunks or chunks == 0),
+        ("Entities have provenance (FROM_CHUNK)", stats.provenance_links > 0 or chunks == 0),
+    ]
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_embeddings(driver):
     """Validate that embeddings exist on appropriate nodes."""
     print("\n=== Test: Graph Embeddings ===")
 
-    with driver.session() as session:
-        # Check for embedding properties on Chunk nodes
-        chunk_emb_result = session.run("""
-            MATCH (c:Chunk)
-            WHERE c.embedding IS NOT NULL
-            RETURN count(c) AS with_embedding
-        """)
-        chunks_with_emb = chunk_emb_result.single()["with_embedding"]
-
-        # Check for embedding properties on Entity nodes
-        entity_emb_result = session.run("""
-            MATCH (e:__Entity__)
-            WHERE e.embedding IS NOT NULL
-            RETURN count(e) AS with_embedding
-        """)
-        entities_with_emb = entity_emb_result.single()["with_embedding"]
-
-        # Get total counts
-        total_result = session.run("""
-            MATCH (c:Chunk) WITH count(c) AS chunks
-            MATCH (e:__Entity__) WITH chunks, count(e) AS entities
-            RETURN chunks, entities
-        """)
-        totals = total_result.single()
-
-        print(f"  Chunks with embeddings: {chunks_with_emb}/{totals['chunks']}")
-        print(f"  Entities with embeddings: {entities_with_emb}/{totals['entities']}")
+    stats = graph_stats(driver)
+    chunks = stats.count("Chunk")
 
-        # Check embedding dimensions
-        dim_result = session.run("""
-            MATCH (n)
-            WHERE n.embedding IS NOT NULL
-            RETURN labels(n)[0] AS label, size(n.embedding) AS dimension
-            LIMIT 1
-        """)
-        dim_record = dim_result.single()
-        if dim_record:
-            print(f"  Embedding dimension: {dim_record['dimension']}")
+    print(f"  Chunks with embeddings: {stats.chunks_with_embedding}/{chunks}")
+    print(f"  Entities with embeddings: {stats.entities_with_embedding}/{stats.count('__Entity__')}")
+    if stats.embedding_dimensions:
+        print(f"  Embedding dimension: {stats.embedding_dimensions}")
 
-        checks = [
-            ("Chunks have embeddings", chunks_with_emb > 0 or totals["chunks"] == 0),
-        ]
+    checks = [
+        ("Chunks have embeddings", stats.chunks_with_embedding > 0 or chunks == 0),
+    ]
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_entity_properties(driver):
     """Validate that entities have required properties."""
     print("\n=== Test: Entity Properties ===")
 
-    with driver.session() as session:
-        # Check Company nodes for required properties
-        company_result = session.run("""
-            MATCH (c:Company)
-            RETURN count(c) AS total,
-                   count(CASE WHEN c.name IS NOT NULL THEN 1 END) AS with_name,
-                   count(CASE WHEN c.ticker IS NOT NULL THEN 1 END) AS with_ticker
-        """)
-        company = company_result.single()
+    stats = graph_stats(driver)
+    companies = stats.count("Company")
+    entities = stats.count("__Entity__")
 
-        # Check __Entity__ nodes for name property (the merge key)
-        entity_result = session.run("""
-            MATCH (e:__Entity__)
-            RETURN count(e) AS total,
-                   count(CASE WHEN e.name IS NOT NULL THEN 1 END) AS with_name
-        """)
-        entity = entity_result.single()
+    print(f"  Company nodes: {companies}")
+    print(f"    with name: {stats.companies_with_name}")
+    print(f"    with ticker: {stats.companies_with_ticker}")
+    print(f"  Entity nodes: {entities}")
+    print(f"    with name (merge key): {stats.entities_with_name}")
 
-        print(f"  Company nodes: {company['total']}")
-        print(f"    with name: {company['with_name']}")
-        print(f"    with ticker: {company['with_ticker']}")
-        print(f"  Entity nodes: {entity['total']}")
-        print(f"    with name (merge key): {entity['with_name']}")
-
-        checks = [
-            ("All Company nodes have 'name'", company["with_name"] == company["total"] or company["total"] == 0),
-            ("All Entity nodes have 'name' (merge key)", entity["with_name"] == entity["total"] or entity["total"] == 0),
-        ]
+    checks = [
+        ("All Company nodes have 'name'", stats.companies_with_name == companies or companies == 0),
+        ("All Entity nodes have 'name' (merge key)", stats.entities_with_name == entities or entities == 0),
+    ]
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_no_orphan_entities(driver):
     """Check for orphan entities (entities with no relationships)."""
     print("\n=== Test: No Orphan Entities ===")
 
-    with driver.session() as session:
-        # Find entities with no relationships at all
-        orphan_result = session.run("""
-            MATCH (e:__Entity__)
-            WHERE NOT (e)--()
-            RETURN count(e) AS orphan_count,
-                   collect(e.name)[0..5] AS examples
-        """)
-        orphan = orphan_result.single()
-
-        # Find entities with no schema relationships (only FROM_CHUNK)
-        no_schema_rel_result = session.run("""
-            MATCH (e:__Entity__)
-            WHERE NOT (e)-[:FACES_RISK|OFFERS|HAS_EXECUTIVE|REPORTS|COMPETES_WITH|PARTNERS_WITH]-()
-              AND NOT (e)<-[:FACES_RISK|OFFERS|HAS_EXECUTIVE|REPORTS|COMPETES_WITH|PARTNERS_WITH]-()
-            RETURN count(e) AS count
-        """)
-        no_schema_rel = no_schema_rel_result.single()["count"]
-
-        # Get total entity count
-        total_result = session.run("MATCH (e:__Entity__) RETURN count(e) AS total")
-        total = total_result.single()["total"]
+    stats = graph_stats(driver)
+    total = stats.count("__Entity__")
 
-        print(f"  Total entities: {total}")
-        print(f"  Orphan entities (no relationships): {orphan['orphan_count']}")
-        if orphan["examples"]:
-            print(f"    Examples: {orphan['examples']}")
-        print(f"  Entities without schema relationships: {no_schema_rel}")
+    print(f"  Total entities: {total}")
+    print(f"  Orphan entities (no relationships): {stats.orphan_entities}")
+    if stats.orphan_examples:
+        print(f"    Examples: {stats.orphan_examples}")
+    print(f"  Entities without schema relationships: {stats.entities_without_schema_relationships}")
 
-        # Some orphan entities may be acceptable
-        orphan_ratio = orphan["orphan_count"] / total if total > 0 else 0
+    # Some orphan entities may be acceptable
+    orphan_ratio = stats.orphan_entities / total if total > 0 else 0
 
-        checks = [
-            ("Less than 10% orphan entities", orphan_ratio < 0.1 or total == 0),
-        ]
+    checks = [
+        ("Less than 10% orphan entities", orphan_ratio < 0.1 or total == 0),
+    ]
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "WARN"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "WARN"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_graph_no_duplicates(driver):
     """Check for duplicate entities that should have been merged."""
     print("\n=== Test: No Duplicate Entities ===")
 
-    with driver.session() as session:
-        # Find potential duplicates (same label and name)
-        dup_result = session.run("""
-            MATCH (e:__Entity__)
-            WITH labels(e) AS lbls, e.name AS name, count(e) AS cnt
-            WHERE cnt > 1
-            RETURN lbls[0] AS label, name, cnt
-            ORDER BY cnt DESC
-            LIMIT 10
-        """)
-
-        duplicates = list(dup_result)
-
-        if duplicates:
-            print("  Potential duplicates found:")
-            for record in duplicates:
-                print(f"    {record['label']}:{record['name']} appears {record['cnt']} times")
-        else:
-            print("  No duplicate entities found")
+    stats = graph_stats(driver)
+    duplicates = stats.duplicate_names
 
-        # Check specifically for Company duplicates (most critical)
-        company_dup_result = session.run("""
-            MATCH (c:Company)
-            WITH c.name AS name, count(c) AS cnt
-            WHERE cnt > 1
-            RETURN name, cnt
-        """)
-        company_dups = list(company_dup_result)
+    if duplicates:
+        print("  Potential duplicates found:")
+        for d in duplicates:
+            print(f"    {d.label}:{d.name} appears {d.count} times")
+    else:
+        print("  No duplicate entities found")
 
-        checks = [
-            ("No duplicate Company nodes", len(company_dups) == 0),
-            ("No duplicate entities overall", len(duplicates) == 0),
-        ]
+    checks = [
+        ("No duplicate Company nodes", not stats.duplicate_company_names),
+        ("No duplicate entities overall", not duplicates),
+    ]
 
-        passed = 0
-        for name, result in checks:
-            status = "PASS" if result else "FAIL"
-            print(f"  {status}: {name}")
-            if result:
-                passed += 1
+    passed = 0
+    for name, result in checks:
+        status = "PASS" if result else "FAIL"
+        print(f"  {status}: {name}")
+        if result:
+            passed += 1
 
-        print(f"\n  Result: {passed}/{len(checks)} checks passed")
-        return passed == len(checks)
+    print(f"\n  Result: {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
 
 
 def test_asset_manager_relationships(driver):
@@ -731,30 +600,25 @@ def test_graph_summary(driver):
     """Print a comprehensive graph summary."""
     print("\n=== Graph Summary ===")
 
-    with driver.session() as session:
-        # Get stats with OPTIONAL MATCH to handle missing labels
-        total_nodes = session.run("MATCH (n) RETURN count(n) AS count").single()["count"]
-        total_rels = session.run("MATCH ()-[r]->() RETURN count(r) AS count").single()["count"]
-        entities = session.run("OPTIONAL MATCH (e:__Entity__) RETURN count(e) AS count").single()["count"]
-        companies = session.run("OPTIONAL MATCH (c:Company) RETURN count(c) AS count").single()["count"]
-        chunks = session.run("OPTIONAL MATCH (ch:Chunk) RETURN count(ch) AS count").single()["count"]
-        documents = session.run("OPTIONAL MATCH (d:Document) RETURN count(d) AS count").single()["count"]
-
-        print(f"  Total nodes: {total_nodes}")
-        print(f"  Total relationships: {total_rels}")
-        print(f"  Documents: {documents}")
-        print(f"  Chunks: {chunks}")
-        print(f"  Entity nodes: {entities}")
-        print(f"  Company nodes: {companies}")
-
-        # Calculate ratios
-        if chunks > 0:
-            entities_per_chunk = entities / chunks
-            print(f"  Entities per chunk: {entities_per_chunk:.2f}")
-
-        if entities > 0:
-            rels_per_entity = total_rels / entities
-            print(f"  Relationships per entity: {rels_per_entity:.2f}")
+    stats = graph_stats(driver)
+    entities = stats.count("__Entity__")
+    chunks = stats.count("Chunk")
+
+    print(f"  Total nodes: {stats.nodes}")
+    print(f"  Total relationships: {stats.relationships}")
+    print(f"  Documents: {stats.count('Document')}")
+    print(f"  Chunks: {chunks}")
+    print(f"  Entity nodes: {entities}")
+    print(f"  Company nodes: {stats.count('Company')}")
+
+    # Calculate ratios
+    if chunks > 0:
+        entities_per_chunk = entities / chunks
+        print(f"  Entities per chunk: {entities_per_chunk:.2f}")
+
+    if entities > 0:
+        rels_per_entity = stats.relationships / entities
+        print(f"  Relationships per entity: {rels_per_entity:.2f}")
 
     return True  # Summary always passes
 
@@ -13,11 +13,14 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from neo4j_graphrag.embeddings import OpenAIEmbeddings
+from neo4j_graphrag.embeddings import Embedder, OpenAIEmbeddings
 from neo4j_graphrag.llm import OpenAILLM
 from pydantic import Field, computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# From the workshop's shared/ directory, which main.py puts on sys.path.
+from embedding_cache import with_embedding_cache
+
 # Load .env from financial_data_load directory
 _root_env = Path(__file__).parent.parent / ".env"
 load_dotenv(_root_env)
@@ -134,22 +137,27 @@ def _get_azure_token() -> str:
         ) from e
 
 
-def get_embedder() -> OpenAIEmbeddings:
-    """Get embedder configured from environment (OpenAI or Azure AI Foundry)."""
+def get_embedder() -> Embedder:
+    """Get embedder configured from environment (OpenAI or Azure AI Foundry).
+
+    Set EMBED_CACHE_ENABLED=true in .env to wrap it in a persistent
+    embedding cache (see embedding_cache.py); it is off by default.
+    """
     config = get_agent_config()
 
     if config.use_openai:
-        return OpenAIEmbeddings(
+        embedder = OpenAIEmbeddings(
             model=config.embedding_name,
             api_key=config.openai_api_key,
         )
-
-    token = _get_azure_token()
-    return OpenAIEmbeddings(
-        model=config.embedding_name,
-        base_url=config.inference_endpoint,
-        api_key=token,
-    )
+    else:
+        token = _get_azure_token()
+        embedder = OpenAIEmbeddings(
+            model=config.embedding_name,
+            base_url=config.inference_endpoint,
+            api_key=token,
+        )
+    return with_embedding_cache(embedder, config.embedding_name)
 
 
 def get_llm() -> OpenAILLM:
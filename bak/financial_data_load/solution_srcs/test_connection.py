@@ -8,6 +8,7 @@ from neo4j_graphrag.schema import get_schema
 from openai import OpenAI
 
 from config import get_neo4j_driver, Neo4jConfig, get_agent_config, _get_azure_token
+from stats import GraphStats, graph_stats
 
 
 def print_section(title: str, items: list[str]) -> None:
@@ -53,35 +54,25 @@ def print_schema_sections(schema: str) -> None:
 
 def get_database_counts(driver) -> tuple[int, int]:
     """Get total count of nodes and relationships in the database."""
-    node_records, _, _ = driver.execute_query("MATCH (n) RETURN count(n) AS cnt")
-    rel_records, _, _ = driver.execute_query("MATCH ()-[r]->() RETURN count(r) AS cnt")
-    node_count = node_records[0]["cnt"] if node_records else 0
-    rel_count = rel_records[0]["cnt"] if rel_records else 0
-    return node_count, rel_count
+    stats = graph_stats(driver)
+    return stats.nodes, stats.relationships
 
 
-def get_entity_count(driver, entity_type: str, labels: list[str]) -> int | None:
+def get_entity_count(stats: GraphStats, entity_type: str, labels: list[str]) -> int | None:
     """Get count of entities matching the index."""
     if not labels:
         return None
-    try:
-        if entity_type == "NODE":
-            label = labels[0]
-            query = f"MATCH (n:`{label}`) RETURN count(n) AS cnt"
-        elif entity_type == "RELATIONSHIP":
-            rel_type = labels[0]
-            query = f"MATCH ()-[r:`{rel_type}`]->() RETURN count(r) AS cnt"
-        else:
-            return None
-        records, _, _ = driver.execute_query(query)
-        return records[0]["cnt"] if records else None
-    except Exception:
-        return None
+    if entity_type == "NODE":
+        return stats.count(labels[0])
+    if entity_type == "RELATIONSHIP":
+        return stats.rel_count(labels[0])
+    return None
 
 
 def get_indexes(driver) -> list[str]:
     """Get all indexes from the database."""
     indexes = []
+    stats = graph_stats(driver)
     records, _, _ = driver.execute_query("SHOW INDEXES")
     for record in records:
         name = record.get("name", "unknown")
@@ -95,7 +86,7 @@ def get_indexes(driver) -> list[str]:
         props_str = ", ".join(properties) if properties else ""
 
         # Get count of indexed entities
-        count = get_entity_count(driver, entity_type, labels)
+        count = get_entity_count(stats, entity_type, labels)
         count_str = f" - {count:,} entities" if count is not None else ""
 
         indexes.append(f"{name} ({index_type}) on {entity_type} {labels_str}({props_str}) [{state}]{count_str}")
@@ -1,81 +1,500 @@
 """Full database backup and restore for skipping PDF reprocessing.
 
-Exports all nodes and relationships to a JSON file. Restoring clears the
-database and recreates everything from the backup, avoiding the ~25 min
+Exports all nodes and relationships to a backup directory. Restoring clears
+the database and recreates everything from the backup, avoiding the ~25 min
 PDF processing step.
+
+Nodes are exported in label partitions (each node in exactly one) and
+relationships in type partitions, up to ``concurrency`` partitions at a
+time, each on its own session streaming records ``_FETCH_SIZE`` at a time.
+Every partition writes its own files, so memory stays bounded by the
+partitions in flight rather than the size of the graph:
+
+- ``manifest.json`` -- counts and the part files of every partition
+- ``nodes-NNN.jsonl[.gz]`` -- one node per line: backup id, labels, properties
+- ``relationships-NNN.jsonl[.gz]`` -- one relationship per line: endpoint
+  backup ids, type, properties
+- ``<property>-NNN.npy`` -- each embedding property of a node partition as
+  one float32 matrix; a node's line holds its row number instead of the vector
+
+Backup ids are the nodes' elementIds at export time. The manifest also
+records the constraint and index definitions, which restore recreates.
+
+A differential backup (``backup --diff``) stores only what changed since a
+base backup. Nodes are identified by a content hash of their labels and
+properties (embeddings hashed as float32) plus their position among nodes
+with identical content, and relationships by their endpoints' keys, type,
+and property hash. The diff holds the added nodes and relationships in the
+same part files, with keys as backup ids, plus ``removed.jsonl[.gz]`` for
+removed ones. A changed node is a removal plus an addition, and so are its
+relationships, whose keys include the node's. Restoring a
+diff restores its base and applies each diff in the chain.
+
+Restore streams the part files in batches, up to ``concurrency`` batches at
+a time. Restored nodes carry a temporary ``__Restore__`` label and an
+indexed ``__backup_id`` so relationship batches find their endpoints with an
+index seek; both are removed once every relationship exists. Single-file
+JSON backups from earlier versions can still be restored.
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import shutil
+import threading
+import time
 from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
+from itertools import islice
 from pathlib import Path
 
+import numpy as np
 from neo4j import Driver
+from neo4j.exceptions import Neo4jError, TransientError
 
 BACKUP_DIR = Path(__file__).resolve().parent.parent / "backups"
 
 _BATCH_SIZE = 500
 
+# Partitions exported at once, and records the driver buffers per partition.
+BACKUP_CONCURRENCY = 4
+_FETCH_SIZE = 1000
 
-def backup_database(driver: Driver) -> Path:
-    """Export all nodes and relationships to a JSON file."""
-    BACKUP_DIR.mkdir(exist_ok=True)
+# Restore: batches written at once, retries for batches that deadlock, and
+# the temporary label/property/index that map backup ids to new nodes.
+RESTORE_CONCURRENCY = 4
+_RESTORE_RETRIES = 5
+_RESTORE_LABEL = "__Restore__"
+_RESTORE_ID = "__backup_id"
+_RESTORE_INDEX = "restore_backup_id"
+_INDEX_WAIT_SECONDS = 300
 
-    print("Exporting nodes...")
-    nodes, _, _ = driver.execute_query(
-        "MATCH (n) "
-        "RETURN elementId(n) AS eid, labels(n) AS labels, properties(n) AS props"
+# Lists of at least this many floats are stored as float32 embedding matrices.
+_MIN_EMBEDDING_DIMS = 64
+
+_MANIFEST = "manifest.json"
+_REMOVED = "removed"
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+def _is_embedding(value) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) >= _MIN_EMBEDDING_DIMS
+        and isinstance(value[0], float)
     )
 
-    print("Exporting relationships...")
-    rels, _, _ = driver.execute_query(
-        "MATCH (a)-[r]->(b) "
-        "RETURN elementId(a) AS start_eid, elementId(b) AS end_eid, "
-        "       type(r) AS type, properties(r) AS props"
+
+class _EmbeddingWriter:
+    """Appends vectors of one property to a raw float32 file, then wraps it as .npy."""
+
+    def __init__(self, path: Path, dims: int):
+        self.path = path
+        self.raw_path = path.with_suffix(".f32")
+        self.dims = dims
+        self.rows = 0
+        self._raw = open(self.raw_path, "wb")
+
+    def append(self, vector: list[float]) -> int | None:
+        """Write one vector; return its row, or None if its size doesn't match."""
+        if len(vector) != self.dims:
+            return None
+        np.asarray(vector, dtype="<f4").tofile(self._raw)
+        self.rows += 1
+        return self.rows - 1
+
+    def close(self) -> None:
+        self._raw.close()
+        with open(self.path, "wb") as out, open(self.raw_path, "rb") as raw:
+            np.lib.format.write_array_header_1_0(out, {
+                "descr": "<f4", "fortran_order": False, "shape": (self.rows, self.dims),
+            })
+            shutil.copyfileobj(raw, out)
+        self.raw_path.unlink()
+
+
+def _clean_props(props: dict | None) -> dict:
+    return {k: v for k, v in (props or {}).items() if v is not None}
+
+
+def _open_part(path: Path, mode: str):
+    return gzip.open(path, mode) if path.suffix == ".gz" else open(path, mode)
+
+
+def _content_hash(labels: list[str], props: dict) -> str:
+    """Hash of labels and properties; embeddings are hashed as float32 so a
+    restored vector hashes the same as the original."""
+    h = hashlib.blake2b(json.dumps(sorted(labels)).encode(), digest_size=16)
+    for key in sorted(props):
+        value = props[key]
+        h.update(key.encode())
+        if _is_embedding(value):
+            h.update(np.asarray(value, dtype="<f4").tobytes())
+        else:
+            h.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class _Keys:
+    """Content keys: a hash plus the occurrence among items with the same hash.
+
+    Which of several identical nodes gets which occurrence is arbitrary, but
+    relationships are keyed by their endpoints' keys, so whatever is assigned
+    restores an identical graph.
+    """
+
+    def __init__(self):
+        self.eid_to_key: dict[str, str] = {}
+        self._counts: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _next(self, signature: str) -> str:
+        with self._lock:
+            occurrence = self._counts[signature]
+            self._counts[signature] += 1
+        return f"{signature}#{occurrence}"
+
+    def node(self, eid: str, content_hash: str) -> str:
+        key = self._next(content_hash)
+        self.eid_to_key[eid] = key
+        return key
+
+    def rel(self, start_key: str, rel_type: str, end_key: str, props: dict) -> str:
+        props_hash = _content_hash([rel_type], props)
+        return self._next(f"{start_key}|{rel_type}|{end_key}|{props_hash}")
+
+
+class _Diff:
+    """Keys of the base backup chain, and of the graph as it is exported."""
+
+    def __init__(self, base_nodes: set[str], base_rels: dict[str, dict]):
+        self.base_nodes = base_nodes
+        self.base_rels = base_rels
+        self.keys = _Keys()
+        self.seen_nodes: set[str] = set()
+        self.seen_rels: set[str] = set()
+        self._lock = threading.Lock()
+
+    def node(self, eid: str, content_hash: str) -> str | None:
+        """Key of a node; None if the base already has it."""
+        key = self.keys.node(eid, content_hash)
+        with self._lock:
+            self.seen_nodes.add(key)
+        return None if key in self.base_nodes else key
+
+    def rel(self, start_eid: str, rel_type: str, end_eid: str, props: dict) -> dict | None:
+        """Relationship line keyed by content; None if the base already has it."""
+        start = self.keys.eid_to_key[start_eid]
+        end = self.keys.eid_to_key[end_eid]
+        key = self.keys.rel(start, rel_type, end, props)
+        with self._lock:
+            self.seen_rels.add(key)
+        if key in self.base_rels:
+            return None
+        return {"s": start, "e": end, "type": rel_type, "props": props, "key": key}
+
+
+def _export_nodes(
+    driver: Driver, directory: Path, part: str, query: str, params: dict, suffix: str,
+    diff: _Diff | None = None,
+) -> dict:
+    """Stream one node partition to its part file; return its manifest entry.
+
+    With ``diff``, only nodes missing from the base are written, keyed by content.
+    """
+    path = directory / f"nodes-{part}{suffix}"
+    embeddings: dict[str, _EmbeddingWriter] = {}
+    count = 0
+    with driver.session(fetch_size=_FETCH_SIZE) as session, _open_part(path, "wt") as out:
+        for node in session.run(query, params):
+            props = _clean_props(node["props"])
+            content_hash = _content_hash(node["labels"], props)
+            bid = node["eid"]
+            if diff is not None:
+                bid = diff.node(node["eid"], content_hash)
+                if bid is None:
+                    continue
+            rows = {}
+            for key, value in list(props.items()):
+                if not _is_embedding(value):
+                    continue
+                writer = embeddings.get(key)
+                if writer is None:
+                    writer = embeddings[key] = _EmbeddingWriter(
+                        directory / f"{key}-{part}.npy", len(value))
+                row = writer.append(value)
+                if row is not None:
+                    rows[key] = row
+                    del props[key]
+            line = {"bid": bid, "hash": content_hash, "labels": node["labels"], "props": props}
+            if rows:
+                line["emb"] = rows
+            out.write(json.dumps(line, default=str) + "\n")
+            count += 1
+    for writer in embeddings.values():
+        writer.close()
+    return {
+        "file": path.name,
+        "count": count,
+        "embeddings": {
+            key: {"file": w.path.name, "rows": w.rows, "dimensions": w.dims}
+            for key, w in embeddings.items()
+        },
+    }
+
+
+def _export_relationships(
+    driver: Driver, directory: Path, part: str, query: str, params: dict, suffix: str,
+    diff: _Diff | None = None,
+) -> dict:
+    """Stream one relationship partition to its part file; return its manifest entry.
+
+    With ``diff``, only relationships missing from the base are written, with
+    their endpoints' content keys.
+    """
+    path = directory / f"relationships-{part}{suffix}"
+    count = 0
+    with driver.session(fetch_size=_FETCH_SIZE) as session, _open_part(path, "wt") as out:
+        for rel in session.run(query, params):
+            line = {
+                "s": rel["start_eid"],
+                "e": rel["end_eid"],
+                "type": rel["type"],
+                "props": _clean_props(rel["props"]),
+            }
+            if diff is not None:
+                line = diff.rel(line["s"], line["type"], line["e"], line["props"])
+                if line is None:
+                    continue
+            out.write(json.dumps(line, default=str) + "\n")
+            count += 1
+    return {"file": path.name, "count": count}
+
+
+def _run_partitions(export, driver: Driver, directory: Path, partitions, concurrency: int,
+                    suffix: str, kind: str) -> list[dict]:
+    """Export partitions concurrently; return manifest entries in partition order."""
+    start = time.monotonic()
+    entries: list[dict | None] = [None] * len(partitions)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(export, driver, directory, f"{i:03d}", query, params, suffix): i
+            for i, (_name, query, params) in enumerate(partitions)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            entries[i] = {"partition": partitions[i][0], **future.result()}
+            if entries[i]["count"]:
+                print(f"    {entries[i]['count']:>8,}  {partitions[i][0]}")
+    total = sum(e["count"] for e in entries)
+    elapsed = time.monotonic() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"  Exported {total:,} {kind} in {elapsed:.1f}s ({rate:,.0f}/sec)")
+    return entries
+
+
+def _capture_schema(driver: Driver) -> dict[str, list[str]]:
+    """CREATE statements for user constraints and indexes (not constraint-owned
+    or token lookup indexes, which Neo4j manages itself)."""
+    constraints, _, _ = driver.execute_query(
+        "SHOW CONSTRAINTS YIELD createStatement RETURN createStatement"
     )
+    indexes, _, _ = driver.execute_query(
+        "SHOW INDEXES YIELD type, owningConstraint, createStatement "
+        "WHERE owningConstraint IS NULL AND type <> 'LOOKUP' "
+        "RETURN createStatement"
+    )
+    return {
+        "constraints": [r["createStatement"] for r in constraints],
+        "indexes": [r["createStatement"] for r in indexes],
+    }
 
-    # Map element IDs to sequential backup IDs
-    eid_to_bid: dict[str, int] = {}
-    node_list = []
-    for i, node in enumerate(nodes):
-        eid_to_bid[node["eid"]] = i
-        props = {k: v for k, v in node["props"].items() if v is not None}
-        node_list.append({"bid": i, "labels": node["labels"], "props": props})
-
-    rel_list = []
-    for rel in rels:
-        props = (
-            {k: v for k, v in rel["props"].items() if v is not None}
-            if rel["props"]
-            else {}
-        )
-        rel_list.append({
-            "s": eid_to_bid[rel["start_eid"]],
-            "e": eid_to_bid[rel["end_eid"]],
-            "type": rel["type"],
-            "props": props,
-        })
+
+def _write_removed(path: Path, diff: _Diff) -> tuple[int, int]:
+    """Write base nodes and relationships no longer in the graph; return their counts."""
+    removed_nodes = removed_rels = 0
+    with _open_part(path, "wt") as out:
+        for key in diff.base_nodes - diff.seen_nodes:
+            out.write(json.dumps({"node": key}) + "\n")
+            removed_nodes += 1
+        for key, rel in diff.base_rels.items():
+            if key not in diff.seen_rels:
+                out.write(json.dumps({"rel": key, **rel}, default=str) + "\n")
+                removed_rels += 1
+    return removed_nodes, removed_rels
+
+
+def backup_database(
+    driver: Driver,
+    concurrency: int = BACKUP_CONCURRENCY,
+    compress: bool = True,
+    base: Path | None = None,
+) -> Path:
+    """Export all nodes and relationships to a backup directory.
+
+    With ``base``, write a differential backup holding only the changes since
+    that backup (itself full or differential).
+    """
+    diff = None
+    if base is not None:
+        print(f"Reading base backup chain ending at {base.name}...")
+        diff = _Diff(*_chain_state(_backup_chain(base)))
 
     now = datetime.now()
-    backup = {
+    output_path = BACKUP_DIR / f"backup_{now.strftime('%Y%m%d_%H%M%S')}"
+    output_path.mkdir(parents=True)
+    suffix = ".jsonl.gz" if compress else ".jsonl"
+
+    labels = [r["label"] for r in driver.execute_query(
+        "CALL db.labels() YIELD label RETURN label"
+    )[0]]
+    rel_types = [r["relationshipType"] for r in driver.execute_query(
+        "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+    )[0]]
+
+    node_return = "RETURN elementId(n) AS eid, labels(n) AS labels, properties(n) AS props"
+    node_partitions = [
+        (f":{label}", f"""
+            MATCH (n:`{label}`)
+            WHERE none(l IN labels(n) WHERE l IN $earlier)
+            {node_return}
+        """, {"earlier": labels[:i]})
+        for i, label in enumerate(labels)
+    ]
+    # Unlabelled nodes belong to no label partition.
+    node_partitions.append(
+        ("(no label)", f"MATCH (n) WHERE size(labels(n)) = 0 {node_return}", {}))
+    rel_partitions = [
+        (f":{rel_type}", f"""
+            MATCH (a)-[r:`{rel_type}`]->(b)
+            RETURN elementId(a) AS start_eid, elementId(b) AS end_eid,
+                   type(r) AS type, properties(r) AS props
+        """, {})
+        for rel_type in rel_types
+    ]
+
+    print("Exporting nodes...")
+    node_parts = _run_partitions(
+        partial(_export_nodes, diff=diff), driver, output_path, node_partitions,
+        concurrency, suffix, "nodes")
+    print("Exporting relationships...")
+    rel_parts = _run_partitions(
+        partial(_export_relationships, diff=diff), driver, output_path, rel_partitions,
+        concurrency, suffix, "relationships")
+
+    n_nodes = sum(p["count"] for p in node_parts)
+    n_rels = sum(p["count"] for p in rel_parts)
+    manifest = {
         "exported_at": now.isoformat(),
-        "node_count": len(node_list),
-        "relationship_count": len(rel_list),
-        "nodes": node_list,
-        "relationships": rel_list,
+        "kind": "full",
+        "node_count": n_nodes,
+        "relationship_count": n_rels,
+        "node_parts": node_parts,
+        "relationship_parts": rel_parts,
+        "schema": _capture_schema(driver),
     }
+    if diff is not None:
+        removed_file = f"{_REMOVED}{suffix}"
+        removed_nodes, removed_rels = _write_removed(output_path / removed_file, diff)
+        manifest.update({
+            "kind": "differential",
+            "base": base.name,
+            "node_count": len(diff.seen_nodes),
+            "relationship_count": len(diff.seen_rels),
+            "added_nodes": n_nodes,
+            "added_relationships": n_rels,
+            "removed_nodes": removed_nodes,
+            "removed_relationships": removed_rels,
+            "removed": removed_file,
+        })
+    (output_path / _MANIFEST).write_text(json.dumps(manifest, indent=2))
 
-    output_path = BACKUP_DIR / f"backup_{now.strftime('%Y%m%d_%H%M%S')}.json"
-    output_path.write_text(json.dumps(backup, default=str))
-
-    size_mb = output_path.stat().st_size / (1024 * 1024)
-    print(f"Backed up {len(node_list)} nodes, {len(rel_list)} relationships ({size_mb:.1f} MB)")
+    size_mb = sum(f.stat().st_size for f in output_path.iterdir()) / (1024 * 1024)
+    if diff is not None:
+        print(f"Differential backup vs {base.name}: "
+              f"+{n_nodes}/-{removed_nodes} nodes, "
+              f"+{n_rels}/-{removed_rels} relationships ({size_mb:.1f} MB)")
+    else:
+        print(f"Backed up {n_nodes} nodes, {n_rels} relationships ({size_mb:.1f} MB)")
     print(f"Backup: {output_path}")
     return output_path
 
 
+# ---------------------------------------------------------------------------
+# Differential chains
+# ---------------------------------------------------------------------------
+
+
+def _backup_chain(backup_path: Path) -> list[Path]:
+    """The full backup a backup builds on, then each differential up to it."""
+    if not backup_path.is_dir():
+        raise ValueError(f"{backup_path.name}: differential backups need a backup directory")
+    chain = [backup_path]
+    while True:
+        manifest = json.loads((chain[0] / _MANIFEST).read_text())
+        if manifest.get("kind") != "differential":
+            return chain
+        chain.insert(0, chain[0].parent / manifest["base"])
+
+
+def _keyed_nodes(lines: Iterator[dict], keys: _Keys) -> Iterator[dict]:
+    """Nodes of a full backup with their elementId backup ids replaced by content keys."""
+    for line in lines:
+        if "hash" not in line:
+            raise ValueError("Backup predates content hashes; take a new full backup first")
+        yield {**line, "bid": keys.node(line["bid"], line["hash"])}
+
+
+def _keyed_rels(lines: Iterator[dict], keys: _Keys) -> Iterator[dict]:
+    """Relationships of a full backup with endpoints mapped to content keys."""
+    for line in lines:
+        yield {**line, "s": keys.eid_to_key[line["s"]], "e": keys.eid_to_key[line["e"]]}
+
+
+def _chain_state(chain: list[Path]) -> tuple[set[str], dict[str, dict]]:
+    """Node keys and keyed relationships of the graph a backup chain restores."""
+    full, diffs = chain[0], chain[1:]
+    manifest = _validate_backup_dir(full)
+    keys = _Keys()
+    nodes: set[str] = set()
+    rels: dict[str, dict] = {}
+    for part in manifest["node_parts"]:
+        for line in _keyed_nodes(_read_jsonl(full / part["file"]), keys):
+            nodes.add(line["bid"])
+    for part in manifest["relationship_parts"]:
+        for line in _keyed_rels(_read_jsonl(full / part["file"]), keys):
+            key = keys.rel(line["s"], line["type"], line["e"], line["props"])
+            rels[key] = {k: line[k] for k in ("s", "e", "type", "props")}
+
+    for diff_path in diffs:
+        manifest = _validate_backup_dir(diff_path)
+        for line in _read_jsonl(diff_path / manifest["removed"]):
+            if "node" in line:
+                nodes.discard(line["node"])
+            else:
+                rels.pop(line["rel"], None)
+        for part in manifest["node_parts"]:
+            nodes.update(line["bid"] for line in _read_jsonl(diff_path / part["file"]))
+        for part in manifest["relationship_parts"]:
+            for line in _read_jsonl(diff_path / part["file"]):
+                rels[line["key"]] = {k: line[k] for k in ("s", "e", "type", "props")}
+    return nodes, rels
+
+
+# ---------------------------------------------------------------------------
+# Restore
+# ---------------------------------------------------------------------------
+
+
 def _validate_backup(backup: dict) -> None:
     """Check backup structure before destructive restore."""
     for key in ("node_count", "relationship_count", "nodes", "relationships"):
@@ -89,83 +508,335 @@ def _validate_backup(backup: dict) -> None:
             raise ValueError(f"Invalid backup file: node missing '{key}'")
 
 
-def restore_database(driver: Driver, backup_path: Path) -> None:
-    """Clear database and restore all nodes and relationships from a backup."""
-    backup = json.loads(backup_path.read_text())
-    _validate_backup(backup)
+def _validate_backup_dir(backup_path: Path) -> dict:
+    """Check a backup directory before destructive restore; return its manifest."""
+    manifest_path = backup_path / _MANIFEST
+    if not manifest_path.exists():
+        raise ValueError(f"Invalid backup directory: missing '{_MANIFEST}'")
+    manifest = json.loads(manifest_path.read_text())
+    for key in ("node_count", "relationship_count", "node_parts", "relationship_parts"):
+        if key not in manifest:
+            raise ValueError(f"Invalid backup manifest: missing '{key}'")
+    if not manifest["node_count"]:
+        raise ValueError("Invalid backup directory: no nodes found")
+    for part in manifest["node_parts"] + manifest["relationship_parts"]:
+        if not (backup_path / part["file"]).exists():
+            raise ValueError(f"Invalid backup directory: missing '{part['file']}'")
+    for part in manifest["node_parts"]:
+        for info in part["embeddings"].values():
+            path = backup_path / info["file"]
+            if not path.exists():
+                raise ValueError(f"Invalid backup directory: missing '{path.name}'")
+            shape = np.load(path, mmap_mode="r").shape
+            if shape != (info["rows"], info["dimensions"]):
+                raise ValueError(f"Invalid backup directory: {path.name} has shape {shape}")
+    if manifest.get("kind") == "differential":
+        if not (backup_path / manifest.get("removed", _REMOVED)).exists():
+            raise ValueError("Invalid differential backup: missing removed list")
+    return manifest
 
-    n_nodes = backup["node_count"]
-    n_rels = backup["relationship_count"]
 
-    print(f"Restoring {n_nodes} nodes, {n_rels} relationships...")
+def _batches(items, size: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
 
-    # Use the robust batched clear from loader (handles constraints + indexes)
-    from .loader import clear_database
-    clear_database(driver)
 
-    # Group nodes by label combination for batch creation.
-    # Return elementId from each CREATE so we can map bid -> eid
-    # without a separate query or temporary property.
+def _read_jsonl(path: Path) -> Iterator[dict]:
+    with _open_part(path, "rt") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _node_batches(backup_path: Path, manifest: dict) -> Iterator[tuple[list[dict], dict]]:
+    """Node batches from every part, each with that part's embedding matrices."""
+    for part in manifest["node_parts"]:
+        # Memory-mapped: only the rows of the batch being written are read.
+        embeddings = {
+            key: np.load(backup_path / info["file"], mmap_mode="r")
+            for key, info in part["embeddings"].items()
+        }
+        for batch in _batches(_read_jsonl(backup_path / part["file"]), _BATCH_SIZE):
+            yield batch, embeddings
+
+
+def _rel_batches(backup_path: Path, manifest: dict) -> Iterator[list[dict]]:
+    for part in manifest["relationship_parts"]:
+        yield from _batches(_read_jsonl(backup_path / part["file"]), _BATCH_SIZE)
+
+
+def _write_batch(driver: Driver, query: str, batch: list[dict]) -> None:
+    """Run one UNWIND batch in its own transaction, re-running it after deadlocks.
+
+    A deadlocked transaction is rolled back as a whole, so re-running the
+    batch cannot create anything twice.
+    """
+    for attempt in range(_RESTORE_RETRIES):
+        try:
+            driver.execute_query(query, batch=batch)
+            return
+        except TransientError:
+            if attempt == _RESTORE_RETRIES - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def _run_concurrently(jobs: Iterator, concurrency: int) -> None:
+    """Run zero-argument callables on a pool, with one job queued beyond the
+    running ones so batches are read from disk as they are written."""
+    concurrency = max(1, concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(job))
+            if len(pending) > concurrency:
+                done = next(as_completed(pending))
+                pending.remove(done)
+                done.result()
+        for future in as_completed(pending):
+            future.result()
+
+
+def _node_jobs(
+    driver: Driver,
+    batch: list[dict],
+    embeddings: dict[str, np.ndarray],
+    counts: dict[tuple[str, ...], int],
+) -> Iterator:
+    """Jobs creating one batch of nodes, one per label combination.
+
+    Embedding rows are read from the memory-mapped matrices and written with
+    db.create.setNodeVectorProperty, as the pipeline writes them.
+    """
     label_groups: dict[tuple[str, ...], list[dict]] = defaultdict(list)
-    for node in backup["nodes"]:
-        key = tuple(sorted(node["labels"]))
-        label_groups[key].append(node)
+    for node in batch:
+        label_groups[tuple(sorted(node["labels"]))].append(node)
 
-    bid_to_eid: dict[int, str] = {}
-    created_nodes = 0
     for labels, group_nodes in label_groups.items():
-        labels_cypher = ":".join(f"`{l}`" for l in labels)
-        for i in range(0, len(group_nodes), _BATCH_SIZE):
-            batch = group_nodes[i:i + _BATCH_SIZE]
-            batch_props = [n["props"] for n in batch]
-            rows, _, _ = driver.execute_query(
-                f"UNWIND $batch AS props "
-                f"CREATE (n:{labels_cypher}) SET n = props "
-                f"RETURN elementId(n) AS eid",
-                batch=batch_props,
-            )
-            for node, row in zip(batch, rows):
-                bid_to_eid[node["bid"]] = row["eid"]
-        created_nodes += len(group_nodes)
-        print(f"    {len(group_nodes):>5}  :{':'.join(labels)}")
+        labels_cypher = "".join(f":`{l}`" for l in (*labels, _RESTORE_LABEL))
+        rows = [
+            {
+                "bid": node["bid"],
+                "props": node["props"],
+                "emb": {
+                    key: embeddings[key][row].tolist()
+                    for key, row in node.get("emb", {}).items()
+                },
+            }
+            for node in group_nodes
+        ]
+        query = (
+            f"UNWIND $batch AS row "
+            f"CREATE (n{labels_cypher}) SET n = row.props, n.{_RESTORE_ID} = row.bid "
+            f"WITH n, row "
+            f"CALL (n, row) {{ "
+            f"  UNWIND keys(row.emb) AS key "
+            f"  CALL db.create.setNodeVectorProperty(n, key, row.emb[key]) "
+            f"}}"
+        )
+        counts[labels] += len(group_nodes)
+        yield lambda query=query, rows=rows: _write_batch(driver, query, rows)
 
-    print(f"  {created_nodes} nodes created")
 
-    # Group relationships by type for batch creation
+def _rel_jobs(driver: Driver, batch: list[dict], counts: dict[str, int]) -> Iterator:
+    """Jobs creating one batch of relationships, one per type."""
     rel_groups: dict[str, list[dict]] = defaultdict(list)
-    for rel in backup["relationships"]:
-        rel_groups[rel["type"]].append({
-            "s": bid_to_eid[rel["s"]],
-            "e": bid_to_eid[rel["e"]],
-            "props": rel["props"],
-        })
+    for rel in batch:
+        rel_groups[rel["type"]].append({"s": rel["s"], "e": rel["e"], "props": rel["props"]})
 
-    created_rels = 0
     for rel_type, group_rels in rel_groups.items():
-        for i in range(0, len(group_rels), _BATCH_SIZE):
-            batch = group_rels[i:i + _BATCH_SIZE]
-            driver.execute_query(
-                f"""
-                UNWIND $batch AS rel
-                MATCH (a) WHERE elementId(a) = rel.s
-                MATCH (b) WHERE elementId(b) = rel.e
-                CREATE (a)-[r:`{rel_type}`]->(b)
-                SET r = rel.props
-                """,
-                batch=batch,
+        query = f"""
+            UNWIND $batch AS rel
+            MATCH (a:{_RESTORE_LABEL} {{{_RESTORE_ID}: rel.s}})
+            MATCH (b:{_RESTORE_LABEL} {{{_RESTORE_ID}: rel.e}})
+            CREATE (a)-[r:`{rel_type}`]->(b)
+            SET r = rel.props
+        """
+        counts[rel_type] += len(group_rels)
+        yield lambda query=query, rows=group_rels: _write_batch(driver, query, rows)
+
+
+def _drop_restore_ids(driver: Driver) -> None:
+    """Remove the temporary backup-id index, label, and property."""
+    driver.execute_query(f"DROP INDEX {_RESTORE_INDEX} IF EXISTS")
+    with driver.session() as session:
+        # CALL ... IN TRANSACTIONS needs an auto-commit transaction (session.run).
+        session.run(f"""
+            MATCH (n:{_RESTORE_LABEL})
+            CALL (n) {{ REMOVE n:{_RESTORE_LABEL}, n.{_RESTORE_ID} }} IN TRANSACTIONS OF 10000 ROWS
+        """).consume()
+
+
+def _restore_schema(driver: Driver, schema: dict[str, list[str]]) -> None:
+    """Recreate constraints, then indexes, from their captured CREATE statements."""
+    for kind in ("constraints", "indexes"):
+        for statement in schema.get(kind, []):
+            try:
+                driver.execute_query(statement)
+                print(f"  [OK] {statement}")
+            except Neo4jError as e:
+                print(f"  [WARN] {statement}: {e.message}")
+    driver.execute_query("CALL db.awaitIndexes($timeout)", timeout=_INDEX_WAIT_SECONDS)
+
+
+def _remove_jobs(driver: Driver, removed: Iterator[dict]) -> Iterator:
+    """Jobs deleting one differential's removed relationships, then its removed nodes."""
+    node_keys: list[str] = []
+    rel_groups: dict[str, list[dict]] = defaultdict(list)
+    for line in removed:
+        if "node" in line:
+            node_keys.append(line["node"])
+        else:
+            rel_groups[line["type"]].append({"s": line["s"], "e": line["e"], "props": line["props"]})
+
+    for rel_type, group_rels in rel_groups.items():
+        # Parallel relationships with equal properties are interchangeable;
+        # each removed entry deletes exactly one of them.
+        query = f"""
+            UNWIND $batch AS rel
+            CALL (rel) {{
+                MATCH (:{_RESTORE_LABEL} {{{_RESTORE_ID}: rel.s}})
+                      -[r:`{rel_type}`]->
+                      (:{_RESTORE_LABEL} {{{_RESTORE_ID}: rel.e}})
+                WHERE properties(r) = rel.props
+                WITH r LIMIT 1
+                DELETE r
+            }}
+        """
+        for batch in _batches(group_rels, _BATCH_SIZE):
+            yield lambda query=query, rows=batch: _write_batch(driver, query, rows)
+    query = f"""
+        UNWIND $batch AS key
+        MATCH (n:{_RESTORE_LABEL} {{{_RESTORE_ID}: key}})
+        DETACH DELETE n
+    """
+    for batch in _batches(node_keys, _BATCH_SIZE):
+        yield lambda rows=batch: _write_batch(driver, query, rows)
+
+
+def _create_nodes(driver: Driver, node_batches, concurrency: int) -> None:
+    start = time.monotonic()
+    label_counts: dict[tuple[str, ...], int] = defaultdict(int)
+    _run_concurrently((
+        job
+        for batch, embeddings in node_batches
+        for job in _node_jobs(driver, batch, embeddings, label_counts)
+    ), concurrency)
+    for labels, count in label_counts.items():
+        print(f"    {count:>5}  :{':'.join(labels)}")
+    created = sum(label_counts.values())
+    elapsed = time.monotonic() - start
+    print(f"  {created} nodes created in {elapsed:.1f}s "
+          f"({created / elapsed if elapsed > 0 else 0.0:,.0f}/sec)")
+
+
+def _create_relationships(driver: Driver, rel_batches, concurrency: int) -> None:
+    start = time.monotonic()
+    type_counts: dict[str, int] = defaultdict(int)
+    _run_concurrently((
+        job
+        for batch in rel_batches
+        for job in _rel_jobs(driver, batch, type_counts)
+    ), concurrency)
+    for rel_type, count in type_counts.items():
+        print(f"    {count:>5}  {rel_type}")
+    created = sum(type_counts.values())
+    elapsed = time.monotonic() - start
+    print(f"  {created} relationships created in {elapsed:.1f}s "
+          f"({created / elapsed if elapsed > 0 else 0.0:,.0f}/sec)")
+
+
+def restore_database(
+    driver: Driver,
+    backup_path: Path,
+    concurrency: int = RESTORE_CONCURRENCY,
+) -> None:
+    """Clear database and restore all nodes, relationships, and schema from a backup.
+
+    A differential backup is restored by loading its full base backup and
+    applying each differential in the chain in order.
+    """
+    schema = None
+    diffs: list[tuple[Path, dict]] = []
+    if backup_path.is_dir():
+        chain = _backup_chain(backup_path)
+        full_path = chain[0]
+        manifest = _validate_backup_dir(full_path)
+        diffs = [(path, _validate_backup_dir(path)) for path in chain[1:]]
+        last = diffs[-1][1] if diffs else manifest
+        n_nodes = last["node_count"]
+        n_rels = last["relationship_count"]
+        schema = last.get("schema")
+        node_batches = _node_batches(full_path, manifest)
+        rel_batches = _rel_batches(full_path, manifest)
+        if diffs:
+            # Differentials name nodes by content key, so the base is keyed the same way.
+            keys = _Keys()
+            node_batches = (
+                (list(_keyed_nodes(batch, keys)), embeddings)
+                for batch, embeddings in node_batches
             )
-        created_rels += len(group_rels)
-        print(f"    {len(group_rels):>5}  {rel_type}")
+            rel_batches = (list(_keyed_rels(batch, keys)) for batch in rel_batches)
+    else:
+        # Single-file JSON backup from earlier versions.
+        backup = json.loads(backup_path.read_text())
+        _validate_backup(backup)
+        n_nodes = backup["node_count"]
+        n_rels = backup["relationship_count"]
+        node_batches = ((batch, {}) for batch in _batches(backup["nodes"], _BATCH_SIZE))
+        rel_batches = _batches(backup["relationships"], _BATCH_SIZE)
+
+    if diffs:
+        print(f"Restoring {n_nodes} nodes, {n_rels} relationships "
+              f"({full_path.name} + {len(diffs)} differential(s))...")
+    else:
+        print(f"Restoring {n_nodes} nodes, {n_rels} relationships...")
+
+    # Use the robust batched clear from loader (handles constraints + indexes)
+    from .loader import clear_database
+    clear_database(driver)
+
+    driver.execute_query(
+        f"CREATE INDEX {_RESTORE_INDEX} IF NOT EXISTS "
+        f"FOR (n:{_RESTORE_LABEL}) ON (n.{_RESTORE_ID})"
+    )
+    driver.execute_query("CALL db.awaitIndexes($timeout)", timeout=_INDEX_WAIT_SECONDS)
+
+    _create_nodes(driver, node_batches, concurrency)
+    _create_relationships(driver, rel_batches, concurrency)
+
+    for diff_path, diff_manifest in diffs:
+        print(f"Applying {diff_path.name}: "
+              f"+{diff_manifest['added_nodes']}/-{diff_manifest['removed_nodes']} nodes, "
+              f"+{diff_manifest['added_relationships']}/"
+              f"-{diff_manifest['removed_relationships']} relationships")
+        # Removals run one batch at a time: two batches could otherwise pick
+        # the same one of several identical parallel relationships.
+        _run_concurrently(
+            _remove_jobs(driver, _read_jsonl(diff_path / diff_manifest["removed"])), 1)
+        _create_nodes(driver, _node_batches(diff_path, diff_manifest), concurrency)
+        _create_relationships(driver, _rel_batches(diff_path, diff_manifest), concurrency)
+
+    _drop_restore_ids(driver)
 
-    print(f"  {created_rels} relationships created")
-    print("Restore complete.")
-    print("\nNote: indexes and constraints were not restored.")
-    print("Run 'uv run python main.py finalize' after entity resolution to recreate them.")
+    if schema is not None:
+        print("Recreating constraints and indexes...")
+        _restore_schema(driver, schema)
+        print("Restore complete.")
+    else:
+        print("Restore complete.")
+        print("\nNote: indexes and constraints were not restored.")
+        print("Run 'uv run python main.py finalize' after entity resolution to recreate them.")
 
 
 def latest_backup() -> Path | None:
-    """Find the most recent backup file."""
+    """Find the most recent backup (directory, or JSON file from earlier versions)."""
     if not BACKUP_DIR.exists():
         return None
-    files = sorted(BACKUP_DIR.glob("backup_*.json"), reverse=True)
-    return files[0] if files else None
+    backups = [
+        p for p in BACKUP_DIR.glob("backup_*")
+        if (p / _MANIFEST).exists() or p.suffix == ".json"
+    ]
+    # Names embed the timestamp; ties between formats go to the directory.
+    backups.sort(key=lambda p: (p.stem, p.is_dir()), reverse=True)
+    return backups[0] if backups else None
@@ -0,0 +1,605 @@
+"""Offline ingestion benchmark: the real pipeline against local stand-ins.
+
+``process_all_pdfs`` normally needs Azure credentials and a live Neo4j
+instance. The benchmark runs it unchanged -- loader, splitter, rate limiter,
+extractor, pruner, Neo4jWriter -- with three deterministic stand-ins:
+
+- FakeOpenAIClient: an OpenAI-compatible chat completions client plugged
+  into a real OpenAILLM. It answers extraction prompts with a small graph
+  built from the chunk text after a configurable latency, and fails a
+  configurable fraction of requests with 429s.
+- HashEmbedder: vectors derived from a hash of the text, with latency and
+  error rate of its own.
+- RecordingDriver: a neo4j.Driver stand-in that records the nodes and
+  relationships Neo4jWriter sends, after a configurable write latency.
+
+The LLM and embedding caches are disabled for the run, and the stand-ins'
+limiters ignore the RATE_LIMIT_* quotas unless ``rate_limits`` is set, so
+the run measures the pipeline rather than the token buckets (429 retries
+and AIMD still apply to injected errors). Results (PDFs/min,
+chunks/sec, memory high-water mark) are printed and written to
+``logs/bench_*.json`` so runs can be compared for regressions.
+
+The pre-filter benchmark times entity resolution candidate generation on
+synthetic entity names and writes ``logs/bench_prefilter_*.json``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import neo4j
+import openai
+from neo4j_graphrag.embeddings import Embedder
+from pydantic import BaseModel
+
+_LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
+
+BENCH_LLM_MODEL = "bench-llm"
+BENCH_EMBEDDING_MODEL = "bench-embedding"
+
+# Entity labels the fake LLM assigns, with the relationship from the
+# filing's Company node to each (see schema.build_extraction_schema).
+_ENTITY_RELATIONSHIPS = {
+    "RiskFactor": "FACES_RISK",
+    "Product": "OFFERS",
+    "Executive": "HAS_EXECUTIVE",
+    "FinancialMetric": "REPORTS",
+}
+_ENTITIES_PER_CHUNK = 5
+
+# In-flight request cap for the stand-ins when RATE_LIMIT_* is ignored, high
+# enough that the pipeline's own concurrency is what limits the run.
+_UNTHROTTLED_CONCURRENCY = 1024
+_NAME_PATTERN = re.compile(r"\b[A-Z][A-Za-z]{3,}\b")
+
+
+def _digest(*parts: Any) -> int:
+    payload = "\x00".join(str(p) for p in parts).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(payload).digest()[:8], "big")
+
+
+class FakeAPIError(openai.OpenAIError):
+    """Simulated API failure carrying an HTTP status, like openai.APIStatusError."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Error code: {status_code} - simulated by bench")
+        self.status_code = status_code
+
+
+class LatencyModel:
+    """Deterministic latency and failure injection for one stand-in service.
+
+    Each request is identified by a key (prompt, text, ...). Its latency is
+    ``latency`` +/- 20% and whether it fails is drawn from a hash of the key
+    and the attempt number, so a run is repeatable and retries of a failed
+    request eventually succeed.
+    """
+
+    def __init__(self, latency: float, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.requests = 0
+        self.errors = 0
+        self._attempts: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, key: str) -> tuple[float, bool]:
+        """Return (delay, fail) for the next attempt of the request ``key``."""
+        request = _digest(self.seed, key)
+        with self._lock:
+            attempt = self._attempts.get(request, 0)
+            self._attempts[request] = attempt + 1
+            rng = random.Random(_digest(request, attempt))
+            fail = rng.random() < self.error_rate
+            self.requests += 1
+            self.errors += fail
+        return self.latency * rng.uniform(0.8, 1.2), fail
+
+
+# ---------------------------------------------------------------------------
+# Fake OpenAI-compatible LLM
+# ---------------------------------------------------------------------------
+
+
+def fake_extraction(text: str) -> str:
+    """Extraction JSON for a chunk: a Company node linked to names in the text."""
+    names = list(dict.fromkeys(_NAME_PATTERN.findall(text)))[:_ENTITIES_PER_CHUNK + 1]
+    if not names:
+        return json.dumps({"nodes": [], "relationships": []})
+
+    labels = list(_ENTITY_RELATIONSHIPS)
+    nodes = [{"id": "0", "label": "Company", "properties": {"name": names[0]}}]
+    relationships = []
+    for i, name in enumerate(names[1:], 1):
+        label = labels[_digest(name) % len(labels)]
+        nodes.append({"id": str(i), "label": label, "properties": {"name": name}})
+        relationships.append({
+            "type": _ENTITY_RELATIONSHIPS[label],
+            "start_node_id": "0",
+            "end_node_id": str(i),
+            "properties": {},
+        })
+    return json.dumps({"nodes": nodes, "relationships": relationships})
+
+
+def _completion(model: str, messages: list[dict]) -> Any:
+    from openai.types.chat import ChatCompletion
+
+    prompt = messages[-1]["content"] if messages else ""
+    text = prompt.rsplit("Input text:", 1)[-1]
+    return ChatCompletion.model_validate({
+        "id": f"bench-{_digest(prompt):x}",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": fake_extraction(text)},
+        }],
+    })
+
+
+class _FakeCompletions:
+    def __init__(self, latency: LatencyModel, is_async: bool):
+        self._latency = latency
+        self._is_async = is_async
+
+    def create(self, model: str, messages: list[dict], **kwargs: Any) -> Any:
+        delay, fail = self._latency.next(json.dumps(messages, sort_keys=True, default=str))
+        if self._is_async:
+            return self._acreate(model, messages, delay, fail)
+        time.sleep(delay)
+        if fail:
+            raise FakeAPIError(429)
+        return _completion(model, messages)
+
+    async def _acreate(self, model: str, messages: list[dict], delay: float, fail: bool) -> Any:
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeAPIError(429)
+        return _completion(model, messages)
+
+
+class FakeOpenAIClient:
+    """The ``chat.completions.create`` surface of openai.OpenAI / AsyncOpenAI."""
+
+    def __init__(self, latency: LatencyModel, is_async: bool = False):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(latency, is_async))
+
+    async def close(self) -> None:
+        pass
+
+
+def fake_llm(model_name: str, latency: LatencyModel):
+    """A rate-limited OpenAILLM whose clients are FakeOpenAIClients."""
+    from neo4j_graphrag.llm import OpenAILLM
+    from neo4j_graphrag.utils.rate_limit import NoOpRateLimitHandler
+
+    from .rate_limit import RateLimitedLLM
+
+    llm = OpenAILLM(
+        model_name=model_name,
+        api_key="bench",
+        rate_limit_handler=NoOpRateLimitHandler(),
+        max_retries=0,
+    )
+    llm.client = FakeOpenAIClient(latency)
+    llm.async_client = FakeOpenAIClient(latency, is_async=True)
+    return RateLimitedLLM(llm)
+
+
+# ---------------------------------------------------------------------------
+# Hash embedder
+# ---------------------------------------------------------------------------
+
+
+class HashEmbedder(Embedder):
+    """Unit vectors seeded from the text hash; equal texts embed equally."""
+
+    def __init__(self, latency: LatencyModel, dimensions: int = 1536):
+        super().__init__()
+        self.latency = latency
+        self.dimensions = dimensions
+
+    def _vector(self, text: str) -> list[float]:
+        rng = random.Random(_digest(text))
+        vector = [rng.gauss(0, 1) for _ in range(self.dimensions)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        delay, fail = self.latency.next(text)
+        time.sleep(delay)
+        if fail:
+            raise FakeAPIError(429)
+        return self._vector(text)
+
+    async def async_embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        delay, fail = self.latency.next(text)
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeAPIError(429)
+        return self._vector(text)
+
+
+# ---------------------------------------------------------------------------
+# Recording graph store
+# ---------------------------------------------------------------------------
+
+
+class _RecordingSession:
+    def __init__(self, driver: RecordingDriver):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query: str, parameters: dict | None = None, **kwargs: Any):
+        return self._driver.execute_query(query, parameters_=parameters, **kwargs)[0]
+
+
+class RecordingDriver(neo4j.Driver):
+    """neo4j.Driver stand-in that records what the KG writer sends.
+
+    It subclasses neo4j.Driver only to pass SimpleKGPipeline's type check;
+    no connection pool is created. Only the structure needed for reporting is kept (labels, Document
+    paths, chunk and entity provenance), not properties or embeddings, so
+    the store adds little to the measured memory.
+    """
+
+    def __init__(self, write_latency: float = 0.0, version: str = "5.26.0"):
+        self.write_latency = write_latency
+        self.version = version
+        self.queries = 0
+        self.rows = 0
+        self.labels: dict[str, list[str]] = {}
+        self.document_ids: dict[str, str] = {}
+        self.chunk_document: dict[str, str] = {}
+        self.entity_chunks: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        # Neo4jWriter sets the user agent on the driver's pool config.
+        self._pool = SimpleNamespace(pool_config=SimpleNamespace(user_agent=None))
+        self._closed = False
+
+    def session(self, **kwargs: Any) -> _RecordingSession:
+        return _RecordingSession(self)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def execute_query(self, query: str, parameters_: dict | None = None, **kwargs: Any):
+        params = {**(parameters_ or {}), **{k: v for k, v in kwargs.items() if not k.endswith("_")}}
+        if "dbms.components" in query:
+            return [{"name": "Neo4j Kernel", "versions": [self.version],
+                     "edition": "enterprise"}], None, ["name", "versions", "edition"]
+        if "FROM_DOCUMENT" in query and "path" in params:
+            return [self._document_counts(params["path"])], None, ["chunks", "entities"]
+
+        rows = params.get("rows") or []
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        with self._lock:
+            self.queries += 1
+            self.rows += len(rows)
+            for row in rows:
+                if "labels" in row:
+                    self._record_node(row)
+                elif "start_node_id" in row:
+                    self._record_relationship(row)
+        return [], None, []
+
+    def _record_node(self, row: dict) -> None:
+        self.labels[row["id"]] = row["labels"]
+        if "Document" in row["labels"]:
+            self.document_ids[str(row["properties"].get("path"))] = row["id"]
+
+    def _record_relationship(self, row: dict) -> None:
+        if row["type"] == "FROM_DOCUMENT":
+            self.chunk_document[row["start_node_id"]] = row["end_node_id"]
+        elif row["type"] == "FROM_CHUNK":
+            self.entity_chunks.setdefault(row["start_node_id"], set()).add(row["end_node_id"])
+
+    def _document_counts(self, path: str) -> dict[str, int]:
+        with self._lock:
+            document = self.document_ids.get(path)
+            chunks = {c for c, d in self.chunk_document.items() if d == document}
+            entities = [e for e, cs in self.entity_chunks.items() if cs & chunks]
+        return {"chunks": len(chunks), "entities": len(entities)}
+
+    def count(self, label: str) -> int:
+        with self._lock:
+            return sum(label in labels for labels in self.labels.values())
+
+
+# ---------------------------------------------------------------------------
+# Benchmark run
+# ---------------------------------------------------------------------------
+
+
+class BenchResult(BaseModel):
+    """Throughput and memory for one offline load benchmark."""
+
+    pdfs: int
+    failed: int
+    chunks: int
+    entities: int
+    rows_written: int
+    wall_time: float
+    pdfs_per_min: float
+    chunks_per_sec: float
+    peak_rss_mb: float | None
+    llm_requests: int
+    llm_errors: int
+    embed_requests: int
+    embed_errors: int
+    settings: dict[str, Any]
+
+
+def _peak_rss_mb() -> float | None:
+    """Process memory high-water mark, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def _caches_disabled():
+    """Keep the benchmark off the on-disk LLM and embedding caches."""
+    keys = ("LLM_CACHE_ENABLED", "EMBED_CACHE_ENABLED")
+    saved = {k: os.environ.get(k) for k in keys}
+    os.environ.update({k: "false" for k in keys})
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def run_load_benchmark(
+    pdf_files: list[Path],
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    streaming: bool = False,
+    llm_latency: float = 0.5,
+    embed_latency: float = 0.05,
+    write_latency: float = 0.01,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    rate_limits: bool = False,
+) -> BenchResult:
+    """Run process_all_pdfs over ``pdf_files`` against the local stand-ins.
+
+    With ``rate_limits`` the stand-ins are paced by the RATE_LIMIT_* quotas
+    like a real deployment; otherwise only 429 retries and AIMD apply.
+    """
+    from embedding_cache import with_embedding_cache
+
+    from .pipeline import process_all_pdfs
+    from .rate_limit import RateLimitConfig, RateLimitedEmbedder, get_rate_limiter
+
+    settings = {
+        "concurrency": concurrency, "parse_workers": parse_workers,
+        "streaming": streaming, "llm_latency": llm_latency,
+        "embed_latency": embed_latency, "write_latency": write_latency,
+        "error_rate": error_rate, "seed": seed, "rate_limits": rate_limits,
+    }
+    if not rate_limits:
+        unthrottled = RateLimitConfig(
+            requests_per_minute=None, tokens_per_minute=None,
+            max_concurrency=_UNTHROTTLED_CONCURRENCY,
+        )
+        for model in (BENCH_LLM_MODEL, BENCH_EMBEDDING_MODEL):
+            get_rate_limiter(model, unthrottled)
+    llm_latency_model = LatencyModel(llm_latency, error_rate, seed)
+    embed_latency_model = LatencyModel(embed_latency, error_rate, seed)
+    driver = RecordingDriver(write_latency)
+
+    with _caches_disabled():
+        llm = fake_llm(BENCH_LLM_MODEL, llm_latency_model)
+        embedder = with_embedding_cache(
+            RateLimitedEmbedder(HashEmbedder(embed_latency_model), BENCH_EMBEDDING_MODEL),
+            BENCH_EMBEDDING_MODEL,
+        )
+        start = time.time()
+        results = process_all_pdfs(
+            driver, pdf_files, {}, concurrency=concurrency,
+            parse_workers=parse_workers, streaming=streaming,
+            llm=llm, embedder=embedder,
+        )
+        wall_time = time.time() - start
+    driver.close()
+
+    successful = [r for r in results if r.success]
+    chunks = driver.count("Chunk")
+    return BenchResult(
+        pdfs=len(successful),
+        failed=len(results) - len(successful),
+        chunks=chunks,
+        entities=driver.count("__Entity__"),
+        rows_written=driver.rows,
+        wall_time=wall_time,
+        pdfs_per_min=len(successful) / wall_time * 60 if wall_time else 0.0,
+        chunks_per_sec=chunks / wall_time if wall_time else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+        llm_requests=llm_latency_model.requests,
+        llm_errors=llm_latency_model.errors,
+        embed_requests=embed_latency_model.requests,
+        embed_errors=embed_latency_model.errors,
+        settings=settings,
+    )
+
+
+def print_bench_result(result: BenchResult) -> Path:
+    """Print a benchmark report and write it to ``logs/bench_*.json``."""
+    print(f"\n{'=' * 60}")
+    print("Load benchmark (offline stand-ins)")
+    print(f"{'=' * 60}")
+    print("  " + ", ".join(f"{k}={v}" for k, v in result.settings.items()))
+    print(f"  PDFs: {result.pdfs} ok, {result.failed} failed "
+          f"in {result.wall_time:.1f}s")
+    print(f"  Throughput: {result.pdfs_per_min:.2f} PDFs/min, "
+          f"{result.chunks_per_sec:.2f} chunks/sec")
+    print(f"  Graph: {result.chunks} chunks, {result.entities} entities, "
+          f"{result.rows_written} rows written")
+    print(f"  LLM: {result.llm_requests} requests, {result.llm_errors} injected errors | "
+          f"Embedder: {result.embed_requests} requests, {result.embed_errors} injected errors")
+    if result.peak_rss_mb is not None:
+        print(f"  Peak memory (RSS): {result.peak_rss_mb:.0f} MB")
+
+    _LOG_DIR.mkdir(exist_ok=True)
+    out = _LOG_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.write_text(result.model_dump_json(indent=2))
+    print(f"  Results written to: {out}")
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Entity resolution pre-filter benchmark
+# ---------------------------------------------------------------------------
+
+_SYLLABLES = [
+    "ar", "ban", "cor", "dyn", "el", "fin", "gen", "hal", "ix", "kor",
+    "lum", "mar", "nex", "or", "pax", "qua", "ros", "sol", "tel", "ven",
+]
+_NAME_SUFFIXES = [
+    "Inc.", "Corp", "Corporation", "LLC", "Holdings", "Group", "Services",
+    "Technologies", "Risk", "Platform",
+]
+_VARIANT_RATE = 0.1
+
+
+class PreFilterBenchRow(BaseModel):
+    """Candidate generation time for one pre-filter at one entity count."""
+
+    entities: int
+    pre_filter: str
+    candidates: int
+    seconds: float
+    # n*(n-1)/2 / seconds: the all-pairs rate this run is equivalent to. The
+    # blocked and prefix filters score far fewer pairs than that.
+    all_pairs_per_sec: float
+    recall: float | None  # share of the exact candidates found, where measured
+
+
+class PreFilterBenchResult(BaseModel):
+    threshold: float
+    seed: int
+    rows: list[PreFilterBenchRow]
+
+
+def synthetic_entity_names(n: int, seed: int = 0) -> list[str]:
+    """``n`` distinct entity names; about 10% are variants of earlier ones
+    (typo, added or dropped suffix), the near-duplicates resolution looks for."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4))).title()
+        for _ in range(max(50, n // 2))
+    ]
+    names: list[str] = []
+    seen: set[str] = set()
+    while len(names) < n:
+        if names and rng.random() < _VARIANT_RATE:
+            name = rng.choice(names)
+            if rng.random() < 0.5 and len(name) > 4:
+                k = rng.randrange(1, len(name) - 1)
+                name = name[:k] + name[k + 1 :]
+            elif name.split()[-1] in _NAME_SUFFIXES:
+                name = name.rsplit(" ", 1)[0]
+            else:
+                name = f"{name} {rng.choice(_NAME_SUFFIXES)}"
+        else:
+            name = " ".join(rng.choices(vocabulary, k=rng.randint(1, 3)))
+            if rng.random() < 0.4:
+                name = f"{name} {rng.choice(_NAME_SUFFIXES)}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def run_prefilter_benchmark(
+    sizes: list[int],
+    threshold: float = 0.6,
+    exact_max: int = 10_000,
+    seed: int = 0,
+) -> PreFilterBenchResult:
+    """Time the fuzzy (blocked and exact) and prefix pre-filters on synthetic names.
+
+    The exact fuzzy pre-filter scores every pair, so it runs only up to
+    ``exact_max`` entities; there it gives the recall of the blocked one.
+    """
+    from .entity_resolution import _fuzzy_pre_filter, _prefix_pre_filter
+    from .snapshot import SnapshotEntity
+
+    rows = []
+    for n in sizes:
+        entities = [
+            SnapshotEntity(
+                element_id=f"bench:{i}", name=name, labels=["Product"],
+                properties={}, source_chunks=[], relationship_count=0,
+            )
+            for i, name in enumerate(synthetic_entity_names(n, seed))
+        ]
+        runs = [("fuzzy (blocked)", lambda: _fuzzy_pre_filter(entities, threshold, blocking=True))]
+        if n <= exact_max:
+            runs.append(("fuzzy (exact)", lambda: _fuzzy_pre_filter(entities, threshold, blocking=False)))
+        runs.append(("prefix", lambda: _prefix_pre_filter(entities, threshold)))
+
+        found: dict[str, set[tuple[str, str]]] = {}
+        for pre_filter, run in runs:
+            start = time.perf_counter()
+            pairs = run()
+            seconds = time.perf_counter() - start
+            found[pre_filter] = {(p.entity_a.element_id, p.entity_b.element_id) for p in pairs}
+            rows.append(PreFilterBenchRow(
+                entities=n, pre_filter=pre_filter, candidates=len(pairs), seconds=seconds,
+                all_pairs_per_sec=n * (n - 1) / 2 / seconds if seconds else 0.0, recall=None,
+            ))
+        exact = found.get("fuzzy (exact)")
+        if exact:
+            blocked_row = next(r for r in rows if r.entities == n and r.pre_filter == "fuzzy (blocked)")
+            blocked_row.recall = len(found["fuzzy (blocked)"] & exact) / len(exact)
+    return PreFilterBenchResult(threshold=threshold, seed=seed, rows=rows)
+
+
+def print_prefilter_result(result: PreFilterBenchResult) -> Path:
+    """Print a pre-filter benchmark table and write it to ``logs/bench_prefilter_*.json``."""
+    print(f"\n{'=' * 60}")
+    print(f"Pre-filter benchmark (synthetic names, threshold={result.threshold})")
+    print(f"{'=' * 60}")
+    print(f"  {'entities':>8}  {'pre-filter':<16} {'candidates':>10} {'seconds':>8} "
+          f"{'all-pairs/s':>11}  recall")
+    for r in result.rows:
+        recall = f"{r.recall:.3f}" if r.recall is not None else "-"
+        print(f"  {r.entities:>8}  {r.pre_filter:<16} {r.candidates:>10} {r.seconds:>8.2f} "
+              f"{r.all_pairs_per_sec:>11.2e}  {recall}")
+
+    _LOG_DIR.mkdir(exist_ok=True)
+    out = _LOG_DIR / f"bench_prefilter_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.write_text(result.model_dump_json(indent=2))
+    print(f"  Results written to: {out}")
+    return out
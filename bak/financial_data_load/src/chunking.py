@@ -0,0 +1,180 @@
+"""Process-pool PDF parsing and chunking, decoupled from LLM extraction.
+
+PDF text extraction and splitting are CPU-bound. Run inline inside
+SimpleKGPipeline they block the event loop that is waiting on LLM and
+embedding calls. This pre-stage parses and chunks every PDF across cores
+in a ProcessPoolExecutor and caches the result as JSONL in ``chunk_cache/``
+(keyed by content hash and splitter settings). The pipeline then consumes
+the cached text through CachedPdfLoader and CachedTextSplitter, so the
+graph it writes is the same as when parsing inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+from neo4j_graphrag.experimental.components.pdf_loader import PdfDocument, PdfLoader
+from neo4j_graphrag.experimental.components.text_splitters.base import TextSplitter
+from neo4j_graphrag.experimental.components.text_splitters.fixed_size_splitter import (
+    FixedSizeSplitter,
+)
+from neo4j_graphrag.experimental.components.types import TextChunk, TextChunks
+from pydantic import BaseModel
+
+from .manifest import file_hash
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CACHE_DIR = Path(__file__).resolve().parent.parent / "chunk_cache"
+
+# Match SimpleKGPipeline's default FixedSizeSplitter so cached chunks are
+# identical to the ones the pipeline would have produced inline.
+CHUNK_SIZE = 4000
+CHUNK_OVERLAP = 200
+
+
+class CachedDocument(BaseModel):
+    """Parsed text and chunks for one PDF."""
+
+    filename: str
+    content_hash: str
+    text: str
+    chunks: list[str]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_path(content_hash: str) -> Path:
+    return CHUNK_CACHE_DIR / f"{content_hash[:16]}_{CHUNK_SIZE}_{CHUNK_OVERLAP}.jsonl"
+
+
+def _read_cache(path: Path) -> CachedDocument:
+    with open(path) as f:
+        header = json.loads(f.readline())
+        chunks = [json.loads(line)["text"] for line in f if line.strip()]
+    return CachedDocument(chunks=chunks, **header)
+
+
+def _write_cache(path: Path, doc: CachedDocument) -> None:
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        header = doc.model_dump(exclude={"chunks"})
+        f.write(json.dumps(header) + "\n")
+        for i, text in enumerate(doc.chunks):
+            f.write(json.dumps({"index": i, "text": text}) + "\n")
+    tmp_path.replace(path)
+
+
+def _parse_and_chunk(pdf_path: str, content_hash: str) -> CachedDocument:
+    """Worker: extract PDF text and split it into chunks (runs in a child process)."""
+    text = PdfLoader.load_file(pdf_path, LocalFileSystem())
+    splitter = FixedSizeSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    result = asyncio.run(splitter.run(text))
+    return CachedDocument(
+        filename=Path(pdf_path).name,
+        content_hash=content_hash,
+        text=text,
+        chunks=[c.text for c in result.chunks],
+    )
+
+
+def prechunk_pdfs(
+    pdf_files: list[Path],
+    workers: Optional[int] = None,
+) -> dict[str, CachedDocument]:
+    """Parse and chunk PDFs in a process pool, reusing cached results.
+
+    Returns cached documents keyed by ``str(pdf_path)``, the same path the
+    pipeline is given as ``file_path``.
+    """
+    workers = workers or os.cpu_count() or 1
+    documents: dict[str, CachedDocument] = {}
+    misses: dict[str, str] = {}
+
+    for pdf_path in pdf_files:
+        content_hash = file_hash(pdf_path)
+        path = _cache_path(content_hash)
+        if path.exists():
+            documents[str(pdf_path)] = _read_cache(path)
+        else:
+            misses[str(pdf_path)] = content_hash
+
+    print(f"Pre-chunking {len(pdf_files)} PDFs: {len(documents)} cached, "
+          f"{len(misses)} to parse ({workers} workers)...")
+    if not misses:
+        return documents
+
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=min(workers, len(misses))) as pool:
+        futures = {
+            path: pool.submit(_parse_and_chunk, path, content_hash)
+            for path, content_hash in misses.items()
+        }
+        for path, future in futures.items():
+            try:
+                doc = future.result()
+            except Exception as e:
+                # Leave it out of the cache; the pipeline will parse it inline
+                # and report the error against the PDF as before.
+                print(f"  [WARN] {Path(path).name}: parse failed ({e})")
+                logger.warning(f"Pre-chunk failed for {path}: {e}")
+                continue
+            _write_cache(_cache_path(doc.content_hash), doc)
+            documents[path] = doc
+            print(f"  [OK] {doc.filename}: {len(doc.chunks)} chunks")
+
+    print(f"  Parsed {len(misses)} PDFs in {time.monotonic() - start:.1f}s")
+    return documents
+
+
+# ---------------------------------------------------------------------------
+# Pipeline components that consume the cache
+# ---------------------------------------------------------------------------
+
+
+class CachedPdfLoader(PdfLoader):
+    """PdfLoader that returns cached text, parsing only on a cache miss."""
+
+    def __init__(self, documents: dict[str, CachedDocument]):
+        self._documents = documents
+
+    async def run(
+        self,
+        filepath: Union[str, Path],
+        metadata: Optional[dict[str, str]] = None,
+        fs: Optional[Union[AbstractFileSystem, str]] = None,
+    ) -> PdfDocument:
+        return await super().run(filepath, metadata, fs)
+
+    def load_file(self, file: str, fs: AbstractFileSystem) -> str:
+        doc = self._documents.get(file)
+        return doc.text if doc else PdfLoader.load_file(file, fs)
+
+
+class CachedTextSplitter(TextSplitter):
+    """Splitter that returns cached chunks for known text, splitting anything else."""
+
+    def __init__(self, documents: dict[str, CachedDocument]):
+        self._chunks_by_text = {_text_hash(d.text): d.chunks for d in documents.values()}
+        self._fallback = FixedSizeSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+    async def run(self, text: str) -> TextChunks:
+        chunks = self._chunks_by_text.get(_text_hash(text))
+        if chunks is None:
+            return await self._fallback.run(text)
+        return TextChunks(chunks=[
+            TextChunk(text=t, index=i) for i, t in enumerate(chunks)
+        ])
@@ -126,43 +126,70 @@ def get_azure_token() -> str:
 
 
 def get_llm():
-    """Get LLM configured from environment (OpenAI or Azure AI Foundry)."""
+    """Get LLM configured from environment (OpenAI or Azure AI Foundry).
+
+    Calls go through the deployment's shared rate limiter (see rate_limit.py),
+    which owns retries, so neo4j-graphrag's own retry handler is disabled.
+    """
     from neo4j_graphrag.llm import OpenAILLM
+    from neo4j_graphrag.utils.rate_limit import NoOpRateLimitHandler
+
+    from .rate_limit import RateLimitedLLM
 
     config = AgentConfig()
 
     if config.use_openai:
-        return OpenAILLM(
+        llm = OpenAILLM(
             model_name=config.model_name,
             api_key=config.openai_api_key,
+            rate_limit_handler=NoOpRateLimitHandler(),
+            max_retries=0,
         )
-
-    token = get_azure_token()
-    return OpenAILLM(
-        model_name=config.model_name,
-        base_url=config.inference_endpoint,
-        api_key=token,
-    )
+    else:
+        token = get_azure_token()
+        llm = OpenAILLM(
+            model_name=config.model_name,
+            base_url=config.inference_endpoint,
+            api_key=token,
+            rate_limit_handler=NoOpRateLimitHandler(),
+            max_retries=0,
+        )
+    return RateLimitedLLM(llm)
 
 
 def get_embedder():
-    """Get embedder configured from environment (OpenAI or Azure AI Foundry)."""
+    """Get embedder configured from environment (OpenAI or Azure AI Foundry).
+
+    The embedder is wrapped in a persistent embedding cache (see
+    embedding_cache.py); set EMBED_CACHE_ENABLED=false to disable it.
+    Cache misses go through the deployment's shared rate limiter.
+    """
+    from embedding_cache import with_embedding_cache
     from neo4j_graphrag.embeddings import OpenAIEmbeddings
+    from neo4j_graphrag.utils.rate_limit import NoOpRateLimitHandler
+
+    from .rate_limit import RateLimitedEmbedder
 
     config = AgentConfig()
 
     if config.use_openai:
-        return OpenAIEmbeddings(
+        embedder = OpenAIEmbeddings(
             model=config.embedding_name,
             api_key=config.openai_api_key,
+            rate_limit_handler=NoOpRateLimitHandler(),
+            max_retries=0,
         )
-
-    token = get_azure_token()
-    return OpenAIEmbeddings(
-        model=config.embedding_name,
-        base_url=config.inference_endpoint,
-        api_key=token,
-    )
+    else:
+        token = get_azure_token()
+        embedder = OpenAIEmbeddings(
+            model=config.embedding_name,
+            base_url=config.inference_endpoint,
+            api_key=token,
+            rate_limit_handler=NoOpRateLimitHandler(),
+            max_retries=0,
+        )
+    embedder = RateLimitedEmbedder(embedder, config.embedding_name)
+    return with_embedding_cache(embedder, config.embedding_name, enabled_by_default=True)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,89 @@
+"""On-disk cache of pairwise entity resolution verdicts.
+
+``resolve`` is meant to be re-run with different thresholds and
+strategies, and most candidate pairs come back every time. Each LLM verdict
+(same_entity, confidence, reasoning) is stored in a local SQLite file keyed
+by model, prompt version, and the fingerprints of both entities -- a hash of
+exactly what the prompt shows about each one -- in sorted order, so (A, B)
+and (B, A) share an entry. The raw verdict is stored rather than the merge
+decision, so changing the confidence mode or threshold still reuses it.
+The cache is capped at ``max_entries`` (least recently used first). Hits
+update ``last_used`` in batches and each LLM batch's verdicts are written in
+one transaction (see shared/sqlite_cache.py), so the resolve event loop does
+not wait on a commit per pair.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlite_cache import SQLiteCache
+
+DECISION_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "er_decisions.sqlite"
+
+
+class DecisionCacheConfig(BaseSettings):
+    """Decision cache settings loaded from .env (DECISION_CACHE_ prefix)."""
+
+    model_config = SettingsConfigDict(env_prefix="DECISION_CACHE_", extra="ignore")
+
+    enabled: bool = True
+    max_entries: int = 200_000
+    path: Path = DECISION_CACHE_PATH
+
+
+def fingerprint(text: str) -> str:
+    """Hash of the text the LLM is shown for one entity."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """Pairwise verdicts keyed by (model, prompt version, entity fingerprints)."""
+
+    def __init__(
+        self,
+        model: str,
+        prompt_version: str,
+        path: Path = DECISION_CACHE_PATH,
+        max_entries: int = 200_000,
+    ):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.cache = SQLiteCache(path, "decisions", "verdict", max_entries=max_entries)
+
+    def _key(self, fingerprint_a: str, fingerprint_b: str) -> str:
+        first, second = sorted((fingerprint_a, fingerprint_b))
+        payload = f"{self.model}:{self.prompt_version}:{first}:{second}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, fingerprint_a: str, fingerprint_b: str) -> dict[str, Any] | None:
+        verdict = self.cache.get(self._key(fingerprint_a, fingerprint_b))
+        return json.loads(verdict) if verdict is not None else None
+
+    def put_many(self, verdicts: list[tuple[str, str, dict[str, Any]]]) -> None:
+        """Store the verdicts of one LLM batch in a single transaction."""
+        self.cache.put_many(
+            (self._key(a, b), json.dumps(verdict)) for a, b, verdict in verdicts
+        )
+
+    # -- reporting -----------------------------------------------------------
+
+    def summary(self) -> str:
+        return self.cache.summary()
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def open_decision_cache(model: str, prompt_version: str) -> DecisionCache | None:
+    """Open the decision cache unless DECISION_CACHE_ENABLED=false."""
+    config = DecisionCacheConfig()
+    if not config.enabled:
+        return None
+    return DecisionCache(
+        model, prompt_version, path=config.path, max_entries=config.max_entries,
+    )
@@ -6,17 +6,24 @@ pairwise entity comparison. Operates on snapshot files for iterative testing.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import time
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator
+from functools import partial
 from itertools import combinations
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+import numpy as np
+import openai
+from pydantic import BaseModel, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .decision_cache import DecisionCache, fingerprint, open_decision_cache
 from .snapshot import EntitySnapshot, SnapshotEntity, SNAPSHOT_DIR
 
 logger = logging.getLogger(__name__)
@@ -36,11 +43,16 @@ class EntityResolutionConfig(BaseSettings):
 
     pre_filter_strategy: str = "fuzzy"
     pre_filter_threshold: float = 0.6
+    pre_filter_blocking: bool = False
     batch_size: int = 10
     confidence_mode: str = "binary"
     confidence_threshold: float = 0.8
     max_group_size: int = 10
     model_name: str = "gpt-4o"
+    concurrency: int = 4
+    batch_retries: int = 2
+    ann_top_k: int = 10
+    ann_vectors: Path | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -79,21 +91,113 @@ class MergePlan(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+_QGRAM = 3
+_BLOCK_KEYS = 4  # rarest q-grams of a name used to look up its block
+_BLOCK_MAX_SIZE = 1000  # q-grams in more names than this are too common to block on
+_CDIST_ROWS = 500  # names scored against all later names per cdist call
+_CUTOFF_SLACK = 0.01
+
+
+def _qgrams(key: str) -> set[str]:
+    padded = f" {key} "
+    return {padded[i : i + _QGRAM] for i in range(len(padded) - _QGRAM + 1)}
+
+
+def _exact_fuzzy_pairs(keys: list[str], cutoff: float) -> Iterator[tuple[int, int]]:
+    """Every pair scoring at least ``cutoff``, in (i, j) order with i < j.
+
+    Each block of rows is scored only against the names from its first row
+    on, so apart from the block diagonal only the upper triangle is scored.
+    """
+    from rapidfuzz import fuzz, process
+
+    for start in range(0, len(keys), _CDIST_ROWS):
+        scores = process.cdist(
+            keys[start : start + _CDIST_ROWS], keys[start:],
+            scorer=fuzz.WRatio, score_cutoff=cutoff, workers=-1,
+        )
+        for row, col in zip(*np.nonzero(scores >= cutoff)):
+            if col > row:
+                yield start + int(row), start + int(col)
+
+
+def _blocked_fuzzy_pairs(keys: list[str], cutoff: float) -> Iterator[tuple[int, int]]:
+    """Pairs scoring at least ``cutoff`` among names that share a rare q-gram.
+
+    Every q-gram of every name is indexed. A name looks up its
+    ``_BLOCK_KEYS`` rarest q-grams plus the rarest q-gram of each of its
+    words, skipping q-grams shared by more than ``_BLOCK_MAX_SIZE`` names, so
+    a pair is found when the names share a word or a rare q-gram. Each name
+    is then scored against its block with one cdist call.
+    """
+    from rapidfuzz import fuzz, process
+
+    index: dict[str, list[int]] = defaultdict(list)
+    grams = [_qgrams(key) for key in keys]
+    for i, key_grams in enumerate(grams):
+        for gram in key_grams:
+            index[gram].append(i)
+    postings = {gram: np.array(ids) for gram, ids in index.items()}
+    rarity = lambda gram: len(postings[gram])
+
+    # Pairs as a * n + b (a < b): deduplicated and sorted in one np.unique.
+    n = len(keys)
+    codes = []
+    for i, key_grams in enumerate(grams):
+        if not key_grams:
+            continue
+        probes = set(sorted(key_grams, key=rarity)[:_BLOCK_KEYS])
+        probes.update(min(_qgrams(word), key=rarity) for word in keys[i].split())
+        rare = [g for g in probes if rarity(g) <= _BLOCK_MAX_SIZE] or [min(probes, key=rarity)]
+        block = np.unique(np.concatenate([postings[g] for g in rare]))
+        block = block[block != i]
+        codes.append(np.minimum(block, i) * n + np.maximum(block, i))
+    if not codes:
+        return
+    codes = np.unique(np.concatenate(codes))
+
+    anchors = codes // n
+    bounds = np.flatnonzero(np.diff(anchors)) + 1
+    for group in np.split(codes, bounds):
+        a = int(group[0] // n)
+        others = group % n
+        scores = process.cdist(
+            [keys[a]], [keys[b] for b in others],
+            scorer=fuzz.WRatio, score_cutoff=cutoff,
+        )[0]
+        for b in others[scores >= cutoff]:
+            yield a, int(b)
+
+
 def _fuzzy_pre_filter(
     entities: list[SnapshotEntity],
     threshold: float,
+    blocking: bool = False,
 ) -> list[CandidatePair]:
-    """Generate candidate pairs using fuzzy string similarity."""
+    """Generate candidate pairs using fuzzy string similarity.
+
+    By default every pair is scored (vectorised). With ``blocking=True``
+    only pairs within q-gram blocks are, which is near-linear but misses
+    candidates at low thresholds: on synthetic names it finds about 68% of
+    them at 0.6 and 99.9% at 0.8.
+    """
     from rapidfuzz import fuzz, utils
 
+    keys = [utils.default_process(e.name) for e in entities]
+    if blocking:
+        print(f"  [WARN] Fuzzy pre-filter uses q-gram blocking at threshold {threshold}; "
+              f"it misses candidate pairs, many of them below 0.8")
+    find_pairs = _blocked_fuzzy_pairs if blocking else _exact_fuzzy_pairs
+
+    # cdist scores are float32 and WRatio rescales the cutoff internally, so
+    # the cutoff gets some slack and candidates are re-scored exactly.
     pairs = []
-    for i, a in enumerate(entities):
-        for b in entities[i + 1 :]:
-            score = fuzz.WRatio(a.name, b.name, processor=utils.default_process) / 100
-            if score >= threshold:
-                pairs.append(
-                    CandidatePair(entity_a=a, entity_b=b, pre_filter_score=score)
-                )
+    for i, j in find_pairs(keys, threshold * 100 - _CUTOFF_SLACK):
+        score = fuzz.WRatio(keys[i], keys[j], processor=None) / 100
+        if score >= threshold:
+            pairs.append(
+                CandidatePair(entity_a=entities[i], entity_b=entities[j], pre_filter_score=score)
+            )
     return pairs
 
 
@@ -101,26 +205,178 @@ def _prefix_pre_filter(
     entities: list[SnapshotEntity],
     threshold: float,
 ) -> list[CandidatePair]:
-    """Generate candidate pairs where one name is a prefix of another."""
-    pairs = []
-    for i, a in enumerate(entities):
-        for b in entities[i + 1 :]:
-            a_lower = a.name.lower().strip()
-            b_lower = b.name.lower().strip()
-            if a_lower.startswith(b_lower) or b_lower.startswith(a_lower):
-                score = min(len(a_lower), len(b_lower)) / max(
-                    len(a_lower), len(b_lower), 1
-                )
-                if score >= threshold:
-                    pairs.append(
-                        CandidatePair(entity_a=a, entity_b=b, pre_filter_score=score)
-                    )
-    return pairs
+    """Generate candidate pairs where one name is a prefix of another.
+
+    Sorted neighbourhood: in sorted order, the names starting with a given
+    name directly follow it, so each name is compared only with those.
+    """
+    keys = [e.name.lower().strip() for e in entities]
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+
+    found = []
+    for pos, i in enumerate(order):
+        for j in order[pos + 1 :]:
+            if not keys[j].startswith(keys[i]):
+                break
+            score = len(keys[i]) / max(len(keys[j]), 1)
+            if score >= threshold:
+                found.append((min(i, j), max(i, j), score))
+
+    found.sort()
+    return [
+        CandidatePair(entity_a=entities[i], entity_b=entities[j], pre_filter_score=score)
+        for i, j, score in found
+    ]
+
+
+# Up to this many names the ann pre-filter compares every vector with every
+# other; above it, it searches an IVF index.
+ANN_EXACT_MAX = 20_000
+_ANN_CONTEXT_CHARS = 100  # source text embedded along with each name
+_ANN_EMBED_CONCURRENCY = 16
+_ANN_SEARCH_ROWS = 1024  # query vectors per matrix product
+_IVF_PROBES = 8  # nearest clusters searched per query cluster
+_IVF_ITERATIONS = 10
+_IVF_SAMPLE_PER_LIST = 40
+
+
+def _ann_text(entity: SnapshotEntity) -> str:
+    """Name, labels, and the start of the first source chunk, for embedding."""
+    labels = ", ".join(l for l in entity.labels if not l.startswith("__"))
+    context = entity.source_chunks[0][:_ANN_CONTEXT_CHARS] if entity.source_chunks else ""
+    return f"{entity.name} [{labels}]: {context}".strip()
+
+
+def _embed_texts(texts: list[str], vectors_path: Path | None) -> np.ndarray:
+    """Unit-length embeddings of ``texts``, one row each.
+
+    With ``vectors_path`` set, vectors are read from that ``.npz`` file
+    (``texts`` and ``vectors`` arrays) and only texts missing from it are
+    sent to the configured embedder; the file is then rewritten with them.
+    The ``.npz`` suffix is added if missing, as ``np.savez`` would.
+    """
+    if vectors_path and vectors_path.suffix != ".npz":
+        vectors_path = vectors_path.with_name(vectors_path.name + ".npz")
+    known: dict[str, np.ndarray] = {}
+    if vectors_path and vectors_path.exists():
+        with np.load(vectors_path) as data:
+            known = dict(zip(data["texts"].tolist(), data["vectors"]))
+
+    missing = list(dict.fromkeys(t for t in texts if t not in known))
+    if missing:
+        from .config import get_embedder
+
+        embedder = get_embedder()
+        semaphore = asyncio.Semaphore(_ANN_EMBED_CONCURRENCY)
+
+        async def embed(text: str) -> list[float]:
+            async with semaphore:
+                return await embedder.async_embed_query(text)
+
+        async def embed_all() -> list[list[float]]:
+            return await asyncio.gather(*(embed(t) for t in missing))
+
+        print(f"  Embedding {len(missing)} entities for the ann pre-filter...")
+        for text, vector in zip(missing, asyncio.run(embed_all())):
+            known[text] = np.asarray(vector, dtype=np.float32)
+        if vectors_path:
+            vectors_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                vectors_path,
+                texts=np.array(list(known)),
+                vectors=np.stack(list(known.values())),
+            )
+
+    vectors = np.stack([known[t] for t in texts]).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(
+    queries: np.ndarray, query_ids: np.ndarray, vectors: np.ndarray,
+    vector_ids: np.ndarray, k: int,
+) -> Iterator[tuple[int, int, float]]:
+    """The ``k`` most similar vectors for each query, excluding itself."""
+    for start in range(0, len(queries), _ANN_SEARCH_ROWS):
+        ids = query_ids[start : start + _ANN_SEARCH_ROWS]
+        sims = queries[start : start + _ANN_SEARCH_ROWS] @ vectors.T
+        sims[ids[:, None] == vector_ids[None, :]] = -np.inf
+        kk = min(k, sims.shape[1])
+        best = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+        for row, cols in enumerate(best):
+            for col in cols:
+                yield int(ids[row]), int(vector_ids[col]), float(sims[row, col])
+
+
+def _exact_neighbours(vectors: np.ndarray, k: int) -> Iterator[tuple[int, int, float]]:
+    ids = np.arange(len(vectors))
+    yield from _top_k(vectors, ids, vectors, ids, k)
+
+
+def _ivf_neighbours(vectors: np.ndarray, k: int) -> Iterator[tuple[int, int, float]]:
+    """Approximate neighbours from an inverted-file index.
+
+    Vectors are clustered with spherical k-means into about sqrt(n) lists.
+    The vectors of each list are searched together against the lists of
+    the ``_IVF_PROBES`` centroids nearest to their own centroid.
+    """
+    n = len(vectors)
+    n_lists = max(1, int(np.sqrt(n)))
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(n, min(n, n_lists * _IVF_SAMPLE_PER_LIST), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+    for _ in range(_IVF_ITERATIONS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_lists):
+            members = sample[assign == c]
+            if len(members):
+                mean = members.sum(axis=0)
+                centroids[c] = mean / max(np.linalg.norm(mean), 1e-12)
+
+    assign = np.concatenate([
+        np.argmax(vectors[i : i + _ANN_SEARCH_ROWS] @ centroids.T, axis=1)
+        for i in range(0, n, _ANN_SEARCH_ROWS)
+    ])
+    lists = [np.flatnonzero(assign == c) for c in range(n_lists)]
+    probes = np.argsort(-(centroids @ centroids.T), axis=1)[:, :_IVF_PROBES]
+    for c, query_ids in enumerate(lists):
+        if len(query_ids):
+            vector_ids = np.concatenate([lists[p] for p in probes[c]])
+            yield from _top_k(vectors[query_ids], query_ids, vectors[vector_ids], vector_ids, k)
+
+
+def _ann_pre_filter(
+    entities: list[SnapshotEntity],
+    threshold: float,
+    top_k: int = 10,
+    vectors_path: Path | None = None,
+) -> list[CandidatePair]:
+    """Generate candidate pairs from embedding nearest neighbours.
+
+    Each entity's name and a little source context is embedded, and its
+    ``top_k`` nearest neighbours with cosine similarity of at least
+    ``threshold`` become candidates. Up to ANN_EXACT_MAX entities the search
+    is exact; above it an IVF index is searched.
+    """
+    if len(entities) < 2:
+        return []
+    vectors = _embed_texts([_ann_text(e) for e in entities], vectors_path)
+    search = _exact_neighbours if len(entities) <= ANN_EXACT_MAX else _ivf_neighbours
+
+    found: dict[tuple[int, int], float] = {}
+    for i, j, score in search(vectors, top_k):
+        if score >= threshold:
+            found[(min(i, j), max(i, j))] = score
+    return [
+        CandidatePair(entity_a=entities[i], entity_b=entities[j], pre_filter_score=score)
+        for (i, j), score in sorted(found.items())
+    ]
 
 
 PRE_FILTERS = {
     "fuzzy": _fuzzy_pre_filter,
     "prefix": _prefix_pre_filter,
+    "ann": _ann_pre_filter,
 }
 
 
@@ -198,18 +454,25 @@ than to incorrectly merge distinct entities.
 Return JSON: {"decisions": [{"pair_index": N, "same_entity": bool, \
 "confidence": float, "reasoning": "..."}]}"""
 
+# Cached verdicts are only reused with the system prompt they were given under.
+PROMPT_VERSION = fingerprint(SYSTEM_PROMPT)[:16]
+
 
 def _create_llm_client():
-    """Create an OpenAI client using the same credentials as the pipeline."""
-    from openai import OpenAI
+    """Create an async OpenAI client using the same credentials as the pipeline.
+
+    Client retries are disabled; _call_llm_batch retries through the shared
+    rate limiter instead.
+    """
+    from openai import AsyncOpenAI
 
     from .config import AgentConfig, get_azure_token
 
     agent_config = AgentConfig()
     if agent_config.use_openai:
-        return OpenAI(api_key=agent_config.openai_api_key)
+        return AsyncOpenAI(api_key=agent_config.openai_api_key, max_retries=0)
     token = get_azure_token()
-    return OpenAI(base_url=agent_config.inference_endpoint, api_key=token)
+    return AsyncOpenAI(base_url=agent_config.inference_endpoint, api_key=token, max_retries=0)
 
 
 def _format_entity(entity: SnapshotEntity) -> str:
@@ -245,16 +508,72 @@ def _build_batch_prompt(pairs: list[CandidatePair]) -> str:
     return "\n".join(lines)
 
 
-def _call_llm_batch(
+def _pair_fingerprints(pair: CandidatePair) -> tuple[str, str]:
+    return (
+        fingerprint(_format_entity(pair.entity_a)),
+        fingerprint(_format_entity(pair.entity_b)),
+    )
+
+
+def _to_decision(
+    pair: CandidatePair,
+    verdict: dict[str, Any],
+    config: EntityResolutionConfig,
+) -> MergeDecision:
+    """Turn an LLM verdict into a merge decision under the confidence mode."""
+    same_entity = verdict.get("same_entity", False)
+    confidence = verdict.get("confidence", 1.0 if same_entity else 0.0)
+
+    # Apply confidence mode
+    if config.confidence_mode == "scored":
+        is_merge = same_entity and confidence >= config.confidence_threshold
+    else:
+        is_merge = same_entity
+
+    return MergeDecision(
+        entity_a_name=pair.entity_a.name,
+        entity_a_element_id=pair.entity_a.element_id,
+        entity_b_name=pair.entity_b.name,
+        entity_b_element_id=pair.entity_b.element_id,
+        decision="merge" if is_merge else "no_merge",
+        confidence=confidence,
+        reasoning=verdict.get("reasoning", ""),
+    )
+
+
+class _BatchVerdict(BaseModel):
+    pair_index: int
+    same_entity: bool = False
+    confidence: float | None = None
+    reasoning: str = ""
+
+
+class _BatchResponse(BaseModel):
+    """The JSON object SYSTEM_PROMPT asks the LLM to return."""
+
+    decisions: list[_BatchVerdict] = []
+
+
+async def _call_llm_batch(
     pairs: list[CandidatePair],
     config: EntityResolutionConfig,
     client,
+    cache: DecisionCache | None = None,
 ) -> list[MergeDecision]:
-    """Send a batch of candidate pairs to the LLM and parse decisions."""
+    """Send a batch of candidate pairs to the LLM and parse decisions.
+
+    Raises openai.APIError if the call fails after the rate limiter's
+    retries, or ValidationError if the response is not the expected JSON;
+    _evaluate_candidates retries the batch on either.
+    Verdicts are stored in ``cache``, if given.
+    """
+    from .rate_limit import get_rate_limiter, llm_request_tokens
+
     prompt = _build_batch_prompt(pairs)
+    limiter = get_rate_limiter(config.model_name)
 
-    try:
-        response = client.chat.completions.create(
+    response = await limiter.run(
+        lambda: client.chat.completions.create(
             model=config.model_name,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -262,45 +581,27 @@ def _call_llm_batch(
             ],
             response_format={"type": "json_object"},
             temperature=0,
-        )
-        result = json.loads(response.choices[0].message.content)
-        decisions_raw = result.get("decisions", [])
-    except (json.JSONDecodeError, KeyError, IndexError) as e:
-        logger.error(f"Failed to parse LLM response: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"LLM call failed: {e}")
-        return []
+        ),
+        tokens=llm_request_tokens(SYSTEM_PROMPT + prompt),
+    )
+    result = _BatchResponse.model_validate_json(response.choices[0].message.content or "")
 
     decisions = []
-    for d in decisions_raw:
-        idx = d.get("pair_index", 0) - 1
+    verdicts = []
+    for d in result.decisions:
+        idx = d.pair_index - 1
         if idx < 0 or idx >= len(pairs):
-            logger.warning(f"LLM returned invalid pair_index: {d.get('pair_index')}")
+            logger.warning(f"LLM returned invalid pair_index: {d.pair_index}")
             continue
 
         pair = pairs[idx]
-        same_entity = d.get("same_entity", False)
-        confidence = d.get("confidence", 1.0 if same_entity else 0.0)
-
-        # Apply confidence mode
-        if config.confidence_mode == "scored":
-            is_merge = same_entity and confidence >= config.confidence_threshold
-        else:
-            is_merge = same_entity
-
-        decisions.append(
-            MergeDecision(
-                entity_a_name=pair.entity_a.name,
-                entity_a_element_id=pair.entity_a.element_id,
-                entity_b_name=pair.entity_b.name,
-                entity_b_element_id=pair.entity_b.element_id,
-                decision="merge" if is_merge else "no_merge",
-                confidence=confidence,
-                reasoning=d.get("reasoning", ""),
-            )
-        )
+        # Only the fields the LLM returned, so _to_decision's defaults apply.
+        verdict = d.model_dump(exclude_unset=True, exclude={"pair_index"})
+        verdicts.append((*_pair_fingerprints(pair), verdict))
+        decisions.append(_to_decision(pair, verdict, config))
 
+    if cache is not None:
+        cache.put_many(verdicts)
     return decisions
 
 
@@ -470,6 +771,12 @@ def resolve(snapshot_path: Path | str, config_overrides: dict | None = None) ->
             f"Unknown pre-filter: {config.pre_filter_strategy}. "
             f"Available: {list(PRE_FILTERS.keys())}"
         )
+    if pre_filter_fn is _fuzzy_pre_filter:
+        pre_filter_fn = partial(_fuzzy_pre_filter, blocking=config.pre_filter_blocking)
+    elif pre_filter_fn is _ann_pre_filter:
+        pre_filter_fn = partial(
+            _ann_pre_filter, top_k=config.ann_top_k, vectors_path=config.ann_vectors,
+        )
 
     candidates = pre_filter_fn(unique_entities, config.pre_filter_threshold)
     print(f"Pre-filter generated {len(candidates)} candidate pairs")
@@ -479,12 +786,8 @@ def resolve(snapshot_path: Path | str, config_overrides: dict | None = None) ->
     all_decisions: list[MergeDecision] = []
 
     if candidates:
-        client = _create_llm_client()
-        all_decisions = _evaluate_candidates(candidates, config, client)
-
-        # Build merge groups with transitive confirmation
-        llm_groups = _build_and_confirm_groups(
-            all_decisions, snapshot, config, client
+        all_decisions, llm_groups = asyncio.run(
+            _evaluate_and_group(candidates, snapshot, config)
         )
 
     # Combine auto-merge and LLM merge groups
@@ -525,34 +828,101 @@ def resolve(snapshot_path: Path | str, config_overrides: dict | None = None) ->
     return plan_path
 
 
-def _evaluate_candidates(
+async def _evaluate_and_group(
+    candidates: list[CandidatePair],
+    snapshot: EntitySnapshot,
+    config: EntityResolutionConfig,
+) -> tuple[list[MergeDecision], list[dict[str, Any]]]:
+    """Evaluate candidates, then build merge groups with transitive confirmation."""
+    client = _create_llm_client()
+    cache = open_decision_cache(config.model_name, PROMPT_VERSION)
+    try:
+        all_decisions = await _evaluate_candidates(candidates, config, client, cache)
+        llm_groups = await _build_and_confirm_groups(
+            all_decisions, snapshot, config, client, cache
+        )
+    finally:
+        await client.close()
+        if cache is not None:
+            print(f"\nDecision cache: {cache.summary()}")
+            cache.close()
+    return all_decisions, llm_groups
+
+
+async def _evaluate_candidates(
     candidates: list[CandidatePair],
     config: EntityResolutionConfig,
     client,
+    cache: DecisionCache | None = None,
 ) -> list[MergeDecision]:
-    """Evaluate all candidate pairs in batches via LLM."""
-    all_decisions: list[MergeDecision] = []
+    """Evaluate all candidate pairs in batches via LLM.
+
+    Pairs with a verdict in ``cache`` are decided without the LLM; the rest
+    are batched. Up to ``config.concurrency`` batches are in flight at
+    once. Decisions are returned in candidate order, so the result matches
+    a serial run. A failed batch is retried up to ``config.batch_retries``
+    times and only then dropped.
+    """
+    decided: list[list[MergeDecision]] = [[] for _ in candidates]
+    position = {}
+    pending = []
+    for i, pair in enumerate(candidates):
+        verdict = cache.get(*_pair_fingerprints(pair)) if cache is not None else None
+        if verdict is not None:
+            decided[i].append(_to_decision(pair, verdict, config))
+        else:
+            position[(pair.entity_a.element_id, pair.entity_b.element_id)] = i
+            pending.append(pair)
+    if cache is not None and len(pending) < len(candidates):
+        print(f"  {len(candidates) - len(pending)} pairs decided from the decision cache")
+
     batches = [
-        candidates[i : i + config.batch_size]
-        for i in range(0, len(candidates), config.batch_size)
+        pending[i : i + config.batch_size]
+        for i in range(0, len(pending), config.batch_size)
     ]
-
-    for i, batch in enumerate(batches, 1):
-        print(f"  LLM batch {i}/{len(batches)} ({len(batch)} pairs)...")
-        decisions = _call_llm_batch(batch, config, client)
-        all_decisions.extend(decisions)
+    semaphore = asyncio.Semaphore(max(1, config.concurrency))
+    failed = 0
+
+    async def evaluate(i: int, batch: list[CandidatePair]) -> list[MergeDecision]:
+        nonlocal failed
+        async with semaphore:
+            for attempt in range(config.batch_retries + 1):
+                try:
+                    decisions = await _call_llm_batch(batch, config, client, cache)
+                    break
+                except (openai.APIError, ValidationError) as e:
+                    logger.warning(
+                        f"LLM batch {i} failed (attempt {attempt + 1}): {e}"
+                    )
+            else:
+                logger.error(f"LLM batch {i} dropped after {attempt + 1} attempts")
+                failed += 1
+                return []
 
         merges = sum(1 for d in decisions if d.decision == "merge")
-        print(f"    -> {merges} merge, {len(decisions) - merges} no_merge")
+        print(
+            f"  LLM batch {i}/{len(batches)} ({len(batch)} pairs) -> "
+            f"{merges} merge, {len(decisions) - merges} no_merge"
+        )
+        return decisions
 
-    return all_decisions
+    results = await asyncio.gather(
+        *(evaluate(i, batch) for i, batch in enumerate(batches, 1))
+    )
+    if failed:
+        print(f"  {failed} of {len(batches)} LLM batches failed; their pairs have no decision")
+    for decisions in results:
+        for d in decisions:
+            decided[position[(d.entity_a_element_id, d.entity_b_element_id)]].append(d)
+    return [d for decisions in decided for d in decisions]
 
 
-def _build_and_confirm_groups(
+async def _build_and_confirm_groups(
     all_decisions: list[MergeDecision],
     snapshot: EntitySnapshot,
     config: EntityResolutionConfig,
     client,
+    cache: DecisionCache | None = None,
 ) -> list[dict[str, Any]]:
     """Build merge groups, confirming any transitive gaps with additional LLM calls."""
     entity_map = {e.element_id: e for e in snapshot.entities}
@@ -601,8 +971,8 @@ def _build_and_confirm_groups(
             f"\n  Confirming {len(additional_pairs)} transitive pairs "
             f"(round {round_num + 1})..."
         )
-        additional_decisions = _evaluate_candidates(
-            additional_pairs, config, client
+        additional_decisions = await _evaluate_candidates(
+            additional_pairs, config, client, cache
         )
         all_decisions.extend(additional_decisions)
         for d in additional_decisions:
@@ -642,8 +1012,105 @@ def _write_empty_plan(
 # ---------------------------------------------------------------------------
 
 
-def apply_merge_plan(driver, plan_path: Path | str) -> None:
-    """Apply a merge plan to Neo4j, merging confirmed entity groups."""
+# Merge groups per UNWIND transaction, batches applied at once, and attempts
+# per batch when it deadlocks on a shared neighbour.
+APPLY_BATCH_SIZE = 100
+APPLY_CONCURRENCY = 4
+_APPLY_RETRIES = 5
+
+_APPLY_QUERY = """
+UNWIND $batch AS group
+MATCH (survivor) WHERE elementId(survivor) = group.survivor_id
+OPTIONAL MATCH (consumed) WHERE elementId(consumed) IN group.consumed_ids
+WITH group, survivor, collect(consumed) AS consumed
+CALL apoc.refactor.mergeNodes([survivor] + consumed,
+     {properties: 'discard', mergeRels: true})
+YIELD node
+SET node += group.fill_props
+RETURN group.index AS index, size(consumed) AS merged
+"""
+
+
+def _merge_row(
+    index: int, group: dict[str, Any], entity_map: dict[str, SnapshotEntity],
+) -> dict[str, Any]:
+    """UNWIND row for the ready group at ``index``.
+
+    Fill properties are the consumed entities' non-null properties the
+    survivor lacks; a later consumed entity wins, as if merged one by one.
+    """
+    survivor_entity = entity_map.get(group["survivor"]["element_id"])
+    fill_props = {}
+    for consumed in group["consumed"]:
+        consumed_entity = entity_map.get(consumed["element_id"])
+        if not (survivor_entity and consumed_entity):
+            continue
+        for k, v in consumed_entity.properties.items():
+            if k.startswith("__"):
+                continue
+            if v and not survivor_entity.properties.get(k):
+                fill_props[k] = v
+    return {
+        "index": index,
+        "survivor_id": group["survivor"]["element_id"],
+        "consumed_ids": [c["element_id"] for c in group["consumed"]],
+        "fill_props": fill_props,
+    }
+
+
+def _merge_waves(rows: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Split rows, in plan order, into waves whose groups share no node.
+
+    Groups within a wave can be merged concurrently. A group touching a node
+    of the current wave (e.g. an LLM group consuming an exact-name survivor)
+    starts the next wave, so it runs after the group it depends on.
+    """
+    waves: list[list[dict[str, Any]]] = [[]]
+    seen: set[str] = set()
+    for row in rows:
+        ids = {row["survivor_id"], *row["consumed_ids"]}
+        if ids & seen:
+            waves.append([])
+            seen = set()
+        waves[-1].append(row)
+        seen |= ids
+    return [w for w in waves if w]
+
+
+def _apply_batch(driver, batch: list[dict[str, Any]]) -> dict[int, int]:
+    """Merge one batch of groups in one transaction; return merges per group index.
+
+    A deadlocked transaction is rolled back as a whole, so the batch is
+    simply re-run.
+    """
+    from neo4j.exceptions import TransientError
+
+    for attempt in range(_APPLY_RETRIES):
+        try:
+            with driver.session() as session:
+                records = session.execute_write(
+                    lambda tx: list(tx.run(_APPLY_QUERY, batch=batch))
+                )
+            return {r["index"]: r["merged"] for r in records}
+        except TransientError:
+            if attempt == _APPLY_RETRIES - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def apply_merge_plan(
+    driver,
+    plan_path: Path | str,
+    batch_size: int = APPLY_BATCH_SIZE,
+    concurrency: int = APPLY_CONCURRENCY,
+) -> None:
+    """Apply a merge plan to Neo4j, merging confirmed entity groups.
+
+    Each group is merged with one apoc.refactor.mergeNodes call, and
+    ``batch_size`` groups share one UNWIND transaction. Groups are disjoint
+    within a wave (see _merge_waves), so up to ``concurrency`` batches of a
+    wave run at once on separate sessions; deadlocked batches are retried.
+    """
     plan_path = Path(plan_path)
     plan = MergePlan.model_validate_json(plan_path.read_text())
 
@@ -662,65 +1129,48 @@ def apply_merge_plan(driver, plan_path: Path | str) -> None:
     total_consumed = sum(len(g["consumed"]) for g in ready_groups)
     print(f"Applying {len(ready_groups)} merge groups ({total_consumed} merges)...")
 
-    ok_count = 0
-    fail_count = 0
-
-    for i, group in enumerate(ready_groups, 1):
-        survivor_id = group["survivor"]["element_id"]
-        survivor_name = group["survivor"]["name"]
-        survivor_entity = entity_map.get(survivor_id)
-        consumed_list = group["consumed"]
-        merge_type = group.get("merge_type", "llm")
-
-        if len(consumed_list) > 3:
-            print(f"  [{i}/{len(ready_groups)}] {survivor_name} <- {len(consumed_list)} duplicates ({merge_type})")
-        else:
-            consumed_names = ", ".join(c["name"] for c in consumed_list)
-            print(f"  [{i}/{len(ready_groups)}] {survivor_name} <- {consumed_names} ({merge_type})")
-
-        group_ok = 0
-        group_fail = 0
-
-        for consumed in consumed_list:
-            consumed_id = consumed["element_id"]
-            consumed_entity = entity_map.get(consumed_id)
-
-            # Compute fill properties: consumed's non-null props that survivor lacks
-            fill_props = {}
-            if survivor_entity and consumed_entity:
-                for k, v in consumed_entity.properties.items():
-                    if k.startswith("__"):
-                        continue
-                    survivor_val = survivor_entity.properties.get(k)
-                    if v and (not survivor_val):
-                        fill_props[k] = v
-
-            try:
-                driver.execute_query(
-                    """
-                    MATCH (survivor) WHERE elementId(survivor) = $survivor_id
-                    MATCH (consumed) WHERE elementId(consumed) = $consumed_id
-                    CALL apoc.refactor.mergeNodes([survivor, consumed],
-                         {properties: 'discard', mergeRels: true})
-                    YIELD node
-                    SET node += $fill_props
-                    RETURN node.name AS name
-                    """,
-                    survivor_id=survivor_id,
-                    consumed_id=consumed_id,
-                    fill_props=fill_props,
-                )
-                group_ok += 1
-            except Exception as e:
-                group_fail += 1
-                logger.error(f"Failed merging {consumed['name']} into {survivor_name}: {e}")
+    for group in ready_groups:
+        if group.get("merge_type", "llm") == "llm":
+            consumed_names = ", ".join(c["name"] for c in group["consumed"])
+            print(f"  {group['survivor']['name']} <- {consumed_names}")
 
-        ok_count += group_ok
-        fail_count += group_fail
-        if group_fail:
-            print(f"       {group_ok} OK, {group_fail} FAILED")
+    start = time.monotonic()
+    waves = _merge_waves(
+        [_merge_row(i, g, entity_map) for i, g in enumerate(ready_groups)]
+    )
+    merged: dict[int, int] = {}
+    failed_batches = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for wave in waves:
+            futures = [
+                pool.submit(_apply_batch, driver, wave[i : i + batch_size])
+                for i in range(0, len(wave), batch_size)
+            ]
+            for future in as_completed(futures):
+                try:
+                    merged.update(future.result())
+                except Exception as e:
+                    failed_batches += 1
+                    logger.error(f"Failed applying a batch of merge groups: {e}")
 
-    print(f"\nDone: {ok_count} merged, {fail_count} failed.")
+    ok_count = 0
+    fail_count = 0
+    for i, group in enumerate(ready_groups):
+        expected = len(group["consumed"])
+        done = merged.get(i, 0)
+        ok_count += done
+        fail_count += expected - done
+        if done < expected:
+            print(f"  [WARN] {group['survivor']['name']}: {expected - done} of "
+                  f"{expected} merges not applied")
+
+    elapsed = time.monotonic() - start
+    rate = ok_count / elapsed if elapsed > 0 else 0.0
+    print(f"\nDone: {ok_count} merged, {fail_count} failed "
+          f"in {elapsed:.1f}s ({rate:,.0f}/sec, {len(waves)} waves).")
+    if failed_batches:
+        print(f"  {failed_batches} batches failed; re-run apply-merges to retry them "
+              f"(groups already merged have nothing left to consume).")
     print("Run 'uv run python main.py verify' to check results.")
 
 
@@ -0,0 +1,104 @@
+"""Incremental re-ingestion: only re-extract PDFs that are new, changed, or removed.
+
+Compares the PDFs on disk against the ingestion manifest by content hash.
+Changed and removed filings have their Document/Chunk subgraph (and any
+entities left without provenance) deleted; new and changed filings are then
+re-run through the pipeline. Unchanged filings are left untouched.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from neo4j import Driver
+from pydantic import BaseModel
+
+from .manifest import IngestionManifest, file_hash
+
+
+class IncrementalPlan(BaseModel):
+    """PDFs grouped by how they differ from the manifest."""
+
+    new: list[Path] = []
+    changed: list[Path] = []
+    removed: list[str] = []
+    unchanged: list[Path] = []
+
+    @property
+    def to_process(self) -> list[Path]:
+        return sorted(self.new + self.changed)
+
+    @property
+    def to_delete(self) -> list[str]:
+        return sorted([p.name for p in self.changed] + self.removed)
+
+
+def plan_incremental(pdf_files: list[Path], manifest: IngestionManifest) -> IncrementalPlan:
+    """Classify PDFs on disk as new, changed, or unchanged; find removed ones."""
+    by_name = manifest.latest()
+    plan = IncrementalPlan()
+
+    for pdf_path in pdf_files:
+        entry = by_name.get(pdf_path.name)
+        if entry is None:
+            plan.new.append(pdf_path)
+        elif entry.content_hash != file_hash(pdf_path) or entry.status != "complete":
+            plan.changed.append(pdf_path)
+        else:
+            plan.unchanged.append(pdf_path)
+
+    on_disk = {p.name for p in pdf_files}
+    plan.removed = sorted(name for name in by_name if name not in on_disk)
+    return plan
+
+
+def document_filenames(driver: Driver) -> set[str]:
+    """File names of the Document nodes in the graph."""
+    rows, _, _ = driver.execute_query(
+        "MATCH (d:Document) WHERE d.path IS NOT NULL RETURN d.path AS path"
+    )
+    return {Path(row["path"]).name for row in rows}
+
+
+def delete_document(driver: Driver, filename: str) -> dict[str, int]:
+    """Delete a filing's Document, its Chunks, and entities orphaned by the delete.
+
+    An entity is orphaned when it has no FROM_CHUNK provenance left. Company
+    nodes loaded from the CSV (they carry a ``cik``) are always kept.
+    """
+    rows, _, _ = driver.execute_query("""
+        MATCH (d:Document)
+        WHERE d.path = $filename OR d.path ENDS WITH $suffix
+        OPTIONAL MATCH (c:Chunk)-[:FROM_DOCUMENT]->(d)
+        OPTIONAL MATCH (e:__Entity__)-[:FROM_CHUNK]->(c)
+        WITH collect(DISTINCT d) AS docs,
+             collect(DISTINCT c) AS chunks,
+             collect(DISTINCT e) AS entities
+        CALL (chunks) {
+            UNWIND chunks AS c
+            DETACH DELETE c
+        }
+        CALL (docs) {
+            UNWIND docs AS d
+            DETACH DELETE d
+        }
+        CALL (entities) {
+            UNWIND entities AS e
+            WITH e
+            WHERE NOT (e)-[:FROM_CHUNK]->()
+              AND NOT (e:Company AND e.cik IS NOT NULL)
+            DETACH DELETE e
+            RETURN count(e) AS orphans
+        }
+        RETURN size(docs) AS documents, size(chunks) AS chunks, orphans
+    """, filename=filename, suffix=f"/{filename}")
+    return dict(rows[0]) if rows else {"documents": 0, "chunks": 0, "orphans": 0}
+
+
+def apply_deletions(driver: Driver, plan: IncrementalPlan, manifest: IngestionManifest) -> None:
+    """Delete the subgraphs of changed/removed filings and drop them from the manifest."""
+    for filename in plan.to_delete:
+        counts = delete_document(driver, filename)
+        print(f"  [DELETE] {filename}: {counts['documents']} document(s), "
+              f"{counts['chunks']} chunks, {counts['orphans']} orphaned entities")
+        manifest.forget(filename)
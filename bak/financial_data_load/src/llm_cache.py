@@ -0,0 +1,183 @@
+"""On-disk cache of LLM extraction responses for SimpleKGPipeline reruns.
+
+Wraps the LLM returned by ``get_llm()`` so a prompt that has already been
+answered is served from a local SQLite file. Entries are keyed by model,
+model parameters, extraction schema hash, and a hash of the full prompt
+(input, message history, system instruction, response format), so a
+rerun after a crash costs no LLM calls for chunks already answered and
+returns the same graph. Any schema change alters every key, so it starts
+from an empty cache. Only responses the extractor can parse into a graph
+are stored; a malformed answer is asked again on the next run rather than
+replayed as an empty chunk graph. Entries older than ``max_age_days`` are
+evicted, and the cache is capped at ``max_entries`` (least recently used
+first).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from neo4j_graphrag.experimental.components.entity_relation_extractor import (
+    fix_invalid_json,
+)
+from neo4j_graphrag.experimental.components.types import Neo4jGraph
+from neo4j_graphrag.experimental.pipeline.exceptions import InvalidJSONError
+from neo4j_graphrag.llm import LLMInterface
+from neo4j_graphrag.llm.types import LLMResponse
+from pydantic import BaseModel, ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlite_cache import SQLiteCache
+
+LLM_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "llm_responses.sqlite"
+
+
+class LLMCacheConfig(BaseSettings):
+    """LLM response cache settings loaded from .env (LLM_CACHE_ prefix)."""
+
+    model_config = SettingsConfigDict(env_prefix="LLM_CACHE_", extra="ignore")
+
+    enabled: bool = True
+    max_entries: int = 50_000
+    max_age_days: float = 30
+    path: Path = LLM_CACHE_PATH
+
+
+def schema_hash(schema: Any) -> str:
+    """Stable hash of an extraction schema (GraphSchema or plain dict)."""
+    if isinstance(schema, BaseModel):
+        payload = schema.model_dump_json()
+    else:
+        payload = json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _jsonable(value: Any) -> Any:
+    """Reduce prompt parts (messages, history, response formats) to JSON data."""
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return value.model_json_schema()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if hasattr(value, "messages"):  # MessageHistory
+        return [_jsonable(m) for m in value.messages]
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    return value
+
+
+def is_extraction_graph(response: LLMResponse) -> bool:
+    """True if the extractor would parse the response into a graph.
+
+    Mirrors LLMEntityRelationExtractor.extract_for_chunk, which repairs the
+    JSON and validates it as a Neo4jGraph, and falls back to an empty graph
+    when either step fails.
+    """
+    try:
+        Neo4jGraph.model_validate(json.loads(fix_invalid_json(response.content)))
+    except (json.JSONDecodeError, InvalidJSONError, ValidationError):
+        return False
+    return True
+
+
+class CachedLLM(LLMInterface):
+    """LLM that serves previously answered prompts from a local SQLite cache.
+
+    Attributes not defined here (``async_client``, ``client``, ...) are
+    forwarded to the wrapped LLM.
+    """
+
+    def __init__(
+        self,
+        llm: LLMInterface,
+        schema_hash: str = "",
+        path: Path = LLM_CACHE_PATH,
+        max_entries: int = 50_000,
+        max_age_days: float = 30,
+    ):
+        super().__init__(model_name=llm.model_name, model_params=llm.model_params)
+        self.llm = llm
+        self.supports_structured_output = llm.supports_structured_output
+        self.schema_hash = schema_hash
+        self.cache = SQLiteCache(
+            path, "responses", "response",
+            max_entries=max_entries, max_age_days=max_age_days,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the wrapper itself.
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    # -- cache access --------------------------------------------------------
+
+    def _key(self, input: Any, **prompt: Any) -> str:
+        payload = json.dumps({
+            "model": self.model_name,
+            "params": self.model_params,
+            "schema": self.schema_hash,
+            "input": _jsonable(input),
+            **{k: _jsonable(v) for k, v in prompt.items() if v is not None},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> LLMResponse | None:
+        # Entries stored before responses were validated are dropped and asked again.
+        raw = self.cache.get(
+            key, accept=lambda raw: is_extraction_graph(LLMResponse.model_validate_json(raw)),
+        )
+        return LLMResponse.model_validate_json(raw) if raw is not None else None
+
+    def _put(self, key: str, response: LLMResponse) -> None:
+        if is_extraction_graph(response):
+            self.cache.put(key, response.model_dump_json())
+
+    # -- LLMInterface --------------------------------------------------------
+
+    def invoke(self, input: Any, message_history: Any = None,
+               system_instruction: str | None = None, **kwargs: Any) -> LLMResponse:
+        key = self._key(input, message_history=message_history,
+                        system_instruction=system_instruction, **kwargs)
+        response = self._get(key)
+        if response is None:
+            response = self.llm.invoke(input, message_history, system_instruction, **kwargs)
+            self._put(key, response)
+        return response
+
+    async def ainvoke(self, input: Any, message_history: Any = None,
+                      system_instruction: str | None = None, **kwargs: Any) -> LLMResponse:
+        key = self._key(input, message_history=message_history,
+                        system_instruction=system_instruction, **kwargs)
+        response = self._get(key)
+        if response is None:
+            response = await self.llm.ainvoke(
+                input, message_history, system_instruction, **kwargs
+            )
+            self._put(key, response)
+        return response
+
+    # -- reporting -----------------------------------------------------------
+
+    def summary(self) -> str:
+        return self.cache.summary()
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def with_llm_cache(llm: LLMInterface, schema: Any = None) -> LLMInterface:
+    """Wrap an LLM in a CachedLLM unless LLM_CACHE_ENABLED=false."""
+    config = LLMCacheConfig()
+    if not config.enabled:
+        return llm
+    return CachedLLM(
+        llm,
+        schema_hash=schema_hash(schema) if schema is not None else "",
+        path=config.path,
+        max_entries=config.max_entries,
+        max_age_days=config.max_age_days,
+    )
@@ -3,9 +3,30 @@
 from __future__ import annotations
 
 import csv
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 
 from neo4j import Driver
+from neo4j.exceptions import TransientError
+from stats import graph_stats
+
+
+# Rows per UNWIND batch (one managed write transaction each) for CSV loads.
+LOAD_BATCH_SIZE = 1000
+
+# Batches parsed ahead of the writer before the CSV reader blocks.
+_PREFETCH_BATCHES = 4
+
+# clear_database: rows per server-side delete transaction, label/type
+# partitions deleted at once, and attempts per partition after deadlocks.
+CLEAR_BATCH_SIZE = 10_000
+CLEAR_CONCURRENCY = 4
+_CLEAR_RETRIES = 5
 
 # ---------------------------------------------------------------------------
 # Company name normalization
@@ -58,18 +79,16 @@ def load_company_metadata(csv_path: Path) -> dict[str, dict]:
     return companies
 
 
-def load_asset_managers(csv_path: Path) -> list[dict]:
-    """Load asset manager holdings from CSV."""
-    holdings = []
+def iter_asset_managers(csv_path: Path) -> Iterator[dict]:
+    """Yield asset manager holdings from CSV one row at a time."""
     with open(csv_path, newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            holdings.append({
+            yield {
                 "manager_name": row.get("managerName", ""),
                 "company_name": row.get("companyName", ""),
                 "shares": int(row.get("shares", 0)),
-            })
-    return holdings
+            }
 
 
 # ---------------------------------------------------------------------------
@@ -77,41 +96,133 @@ def load_asset_managers(csv_path: Path) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
-def create_company_nodes(driver: Driver, companies: dict[str, dict]) -> None:
+def _batched(rows: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    it = iter(rows)
+    while batch := list(islice(it, batch_size)):
+        yield batch
+
+
+_DONE = object()
+
+
+def _prefetch(batches: Iterator[list[dict]], depth: int = _PREFETCH_BATCHES) -> Iterator[list[dict]]:
+    """Produce ``batches`` in a background thread, at most ``depth`` ahead.
+
+    CSV parsing then overlaps with database writes, and the bounded queue
+    stops the reader from running ahead of a slow writer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+        except BaseException as e:
+            put(e)
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, name="csv-reader", daemon=True)
+    thread.start()
+    try:
+        while (item := buffer.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _write_batches(
+    driver: Driver, query: str, rows: Iterable[dict], batch_size: int,
+) -> tuple[int, float]:
+    """Run ``query`` over ``rows`` in UNWIND batches, one managed write
+    transaction per batch (retried on transient errors).
+
+    ``rows`` may be a generator; batches are built in a reader thread while
+    earlier ones are written, so only a few batches are in memory at once.
+    Returns (rows written, rows/sec).
+    """
+    start = time.monotonic()
+    written = 0
+    with driver.session() as session:
+        for batch in _prefetch(_batched(rows, batch_size)):
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+            written += len(batch)
+            if written > batch_size:
+                print(f"  {written:,} rows", end="\r")
+    if written > batch_size:
+        print()
+    elapsed = time.monotonic() - start
+    return written, written / elapsed if elapsed > 0 else 0.0
+
+
+def create_company_nodes(
+    driver: Driver,
+    companies: dict[str, dict],
+    batch_size: int = LOAD_BATCH_SIZE,
+) -> None:
     """Create Company nodes from CSV metadata."""
     print(f"Creating {len(companies)} Company nodes...")
-    with driver.session() as session:
-        for filename, meta in companies.items():
-            normalized_name = normalize_company_name(meta["name"])
-            session.run("""
-                MERGE (c:Company:__Entity__ {name: $name})
-                SET c.ticker = $ticker,
-                    c.cik = $cik,
-                    c.cusip = $cusip
-            """, name=normalized_name, ticker=meta["ticker"],
-                cik=meta["cik"], cusip=meta["cusip"])
-    print(f"  [OK] Created {len(companies)} Company nodes.")
+    rows = [
+        {
+            "name": normalize_company_name(meta["name"]),
+            "ticker": meta["ticker"],
+            "cik": meta["cik"],
+            "cusip": meta["cusip"],
+        }
+        for meta in companies.values()
+    ]
+    _, rate = _write_batches(driver, """
+        UNWIND $rows AS row
+        MERGE (c:Company:__Entity__ {name: row.name})
+        SET c.ticker = row.ticker,
+            c.cik = row.cik,
+            c.cusip = row.cusip
+    """, rows, batch_size)
+    print(f"  [OK] Created {len(companies)} Company nodes ({rate:,.0f} rows/sec).")
 
 
 def create_asset_manager_relationships(
     driver: Driver,
-    holdings: list[dict],
+    holdings: Iterable[dict],
+    batch_size: int = LOAD_BATCH_SIZE,
 ) -> None:
-    """Create AssetManager nodes and OWNS relationships."""
-    print(f"Creating {len(holdings)} asset manager relationships...")
-    with driver.session() as session:
-        for holding in holdings:
-            normalized_company = normalize_company_name(holding["company_name"])
-            session.run("""
-                MERGE (a:AssetManager {managerName: $manager_name})
-                WITH a
-                MATCH (c:Company {name: $company_name})
-                MERGE (a)-[r:OWNS]->(c)
-                SET r.shares = $shares
-            """, manager_name=holding["manager_name"],
-                company_name=normalized_company,
-                shares=holding["shares"])
-    print(f"  [OK] Created {len(holdings)} asset manager relationships.")
+    """Create AssetManager nodes and OWNS relationships.
+
+    ``holdings`` may be a list or a generator such as iter_asset_managers();
+    a generator is streamed into the database in constant memory.
+    """
+    print("Creating asset manager relationships...")
+    rows = (
+        {
+            "manager_name": holding["manager_name"],
+            "company_name": normalize_company_name(holding["company_name"]),
+            "shares": holding["shares"],
+        }
+        for holding in holdings
+    )
+    written, rate = _write_batches(driver, """
+        UNWIND $rows AS row
+        MERGE (a:AssetManager {managerName: row.manager_name})
+        WITH a, row
+        MATCH (c:Company {name: row.company_name})
+        MERGE (a)-[r:OWNS]->(c)
+        SET r.shares = row.shares
+    """, rows, batch_size)
+    print(f"  [OK] Created {written} asset manager relationships ({rate:,.0f} rows/sec).")
 
 
 # ---------------------------------------------------------------------------
@@ -119,90 +230,142 @@ def create_asset_manager_relationships(
 # ---------------------------------------------------------------------------
 
 
-def clear_database(driver: Driver) -> None:
-    """Delete all nodes, relationships, constraints, and indexes."""
+def _drop_schema(driver: Driver) -> tuple[int, int]:
+    """Drop every constraint, then every remaining index, in one session."""
+    with driver.session() as session:
+        constraints = [r["name"] for r in session.run("SHOW CONSTRAINTS YIELD name RETURN name")]
+        for name in constraints:
+            session.run(f"DROP CONSTRAINT `{name}` IF EXISTS").consume()
+        # Listed after the constraint drops, which remove their backing indexes.
+        indexes = [r["name"] for r in session.run(
+            "SHOW INDEXES YIELD name, type WHERE type <> 'LOOKUP' RETURN name"
+        )]
+        for name in indexes:
+            session.run(f"DROP INDEX `{name}` IF EXISTS").consume()
+    return len(constraints), len(indexes)
+
+
+def _delete_partition(driver: Driver, query: str, params: dict) -> int:
+    """Run one server-side batched delete, re-running it after deadlocks.
+
+    Partitions touching the same nodes can deadlock when run concurrently;
+    committed batches stay deleted, so a retry only finishes the remainder.
+    """
+    for attempt in range(_CLEAR_RETRIES):
+        try:
+            # CALL ... IN TRANSACTIONS needs an auto-commit transaction (session.run).
+            with driver.session() as session:
+                return session.run(query, params).single()["deleted"]
+        except TransientError:
+            if attempt == _CLEAR_RETRIES - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+    return 0
+
+
+def clear_database(
+    driver: Driver,
+    concurrency: int = CLEAR_CONCURRENCY,
+    batch_size: int = CLEAR_BATCH_SIZE,
+) -> None:
+    """Delete all nodes, relationships, constraints, and indexes.
+
+    Schema is dropped first so deletes do no index maintenance. Deletes run
+    server-side with ``CALL { ... } IN TRANSACTIONS``: relationships
+    partitioned by type, then nodes partitioned by label (each node in
+    exactly one partition), up to ``concurrency`` partitions at a time.
+    """
     print("Clearing database...")
+    start = time.monotonic()
 
-    # Drop all constraints first (avoids conflicts on re-load)
-    constraints, _, _ = driver.execute_query("SHOW CONSTRAINTS YIELD name RETURN name")
-    for row in constraints:
-        driver.execute_query(f"DROP CONSTRAINT {row['name']} IF EXISTS")
-    if constraints:
-        print(f"  Dropped {len(constraints)} constraints.")
+    n_constraints, n_indexes = _drop_schema(driver)
+    if n_constraints or n_indexes:
+        print(f"  Dropped {n_constraints} constraints, {n_indexes} indexes.")
+
+    rel_types = [r["relationshipType"] for r in driver.execute_query(
+        "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+    )[0]]
+    labels = [r["label"] for r in driver.execute_query(
+        "CALL db.labels() YIELD label RETURN label"
+    )[0]]
+
+    rel_partitions = [
+        (f":{rel_type}", f"""
+            MATCH ()-[r:`{rel_type}`]->()
+            CALL (r) {{ DELETE r }} IN TRANSACTIONS OF {batch_size} ROWS
+            RETURN count(*) AS deleted
+        """, {})
+        for rel_type in rel_types
+    ]
+    node_partitions = [
+        (label, f"""
+            MATCH (n:`{label}`)
+            WHERE none(l IN labels(n) WHERE l IN $earlier)
+            CALL (n) {{ DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS
+            RETURN count(*) AS deleted
+        """, {"earlier": labels[:i]})
+        for i, label in enumerate(labels)
+    ]
+
+    totals = {}
+    for kind, partitions in (("relationships", rel_partitions), ("nodes", node_partitions)):
+        phase_start = time.monotonic()
+        totals[kind] = 0
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {
+                pool.submit(_delete_partition, driver, query, params): name
+                for name, query, params in partitions
+            }
+            for future in as_completed(futures):
+                deleted = future.result()
+                totals[kind] += deleted
+                if deleted:
+                    print(f"    {deleted:>8,}  {futures[future]}")
+        elapsed = time.monotonic() - phase_start
+        rate = totals[kind] / elapsed if elapsed > 0 else 0.0
+        print(f"  Deleted {totals[kind]:,} {kind} in {elapsed:.1f}s ({rate:,.0f}/sec)")
+
+    # Unlabelled nodes belong to no partition.
+    totals["nodes"] += _delete_partition(driver, f"""
+        MATCH (n)
+        CALL (n) {{ DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS
+        RETURN count(*) AS deleted
+    """, {})
+
+    print(f"  [OK] Database cleared ({totals['nodes']:,} nodes, "
+          f"{totals['relationships']:,} relationships deleted "
+          f"in {time.monotonic() - start:.1f}s).")
 
-    # Drop all indexes (vector, fulltext, etc.)
-    indexes, _, _ = driver.execute_query(
-        "SHOW INDEXES YIELD name, type WHERE type <> 'LOOKUP' RETURN name"
-    )
-    for row in indexes:
-        driver.execute_query(f"DROP INDEX {row['name']} IF EXISTS")
-    if indexes:
-        print(f"  Dropped {len(indexes)} indexes.")
-
-    # Delete all nodes and relationships in batches
-    deleted_total = 0
-    while True:
-        records, _, _ = driver.execute_query(
-            "MATCH (n) WITH n LIMIT 500 DETACH DELETE n RETURN count(*) AS deleted"
-        )
-        count = records[0]["deleted"]
-        deleted_total += count
-        if count > 0:
-            print(f"  Deleted {deleted_total} nodes so far...", end="\r")
-        if count == 0:
-            break
-    print(f"\n  [OK] Database cleared ({deleted_total} nodes deleted).")
+
+_VERIFY_LABELS = [
+    "Company", "RiskFactor", "Product", "Executive", "FinancialMetric",
+    "AssetManager", "Document", "Chunk",
+]
 
 
 def verify(driver: Driver) -> None:
     """Print node counts per label and total relationship count."""
-    # Use explicit per-label counts to avoid inflation from multi-label nodes
-    # (e.g. __Entity__ + Company would double-count in a labels(n)/UNWIND approach).
-    node_counts, _, _ = driver.execute_query("""
-        CALL () {
-            MATCH (n:Company) RETURN 'Company' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:RiskFactor) RETURN 'RiskFactor' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:Product) RETURN 'Product' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:Executive) RETURN 'Executive' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:FinancialMetric) RETURN 'FinancialMetric' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:AssetManager) RETURN 'AssetManager' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:Document) RETURN 'Document' AS label, count(n) AS count
-            UNION ALL
-            MATCH (n:Chunk) RETURN 'Chunk' AS label, count(n) AS count
-        }
-        RETURN label, count
-        ORDER BY count DESC
-    """)
-
-    total_nodes, _, _ = driver.execute_query(
-        "MATCH (n) RETURN count(n) AS total"
+    # Per-label counts from the count store; multi-label nodes (e.g.
+    # __Entity__ + Company) are counted once under each listed label.
+    stats = graph_stats(driver)
+    node_counts = sorted(
+        ((label, stats.count(label)) for label in _VERIFY_LABELS),
+        key=lambda item: item[1], reverse=True,
     )
 
     print()
     print("=" * 50)
     print("Node Counts:")
-    for row in node_counts:
-        if row["count"] > 0:
-            print(f"  {row['label']}: {row['count']:,}")
+    for label, count in node_counts:
+        if count > 0:
+            print(f"  {label}: {count:,}")
     print(f"  ---------------------")
-    print(f"  Total Nodes: {total_nodes[0]['total']:,}")
+    print(f"  Total Nodes: {stats.nodes:,}")
 
-    rel_records, _, _ = driver.execute_query("""
-        MATCH ()-[r]->()
-        RETURN type(r) AS type, count(r) AS count
-        ORDER BY count DESC
-    """)
     print(f"\nRelationship Counts:")
-    total_rels = 0
-    for row in rel_records:
-        print(f"  {row['type']}: {row['count']:,}")
-        total_rels += row["count"]
+    for rel_type, count in sorted(stats.relationship_types.items(), key=lambda item: item[1], reverse=True):
+        if count > 0:
+            print(f"  {rel_type}: {count:,}")
     print(f"  ---------------------")
-    print(f"  Total Relationships: {total_rels:,}")
+    print(f"  Total Relationships: {stats.relationships:,}")
     print("=" * 50)
@@ -0,0 +1,142 @@
+"""Persistent ingestion manifest for resumable PDF loading.
+
+Records one entry per PDF, keyed by the SHA-256 of the file contents, so a
+failed or interrupted ``load`` can pick up where it left off instead of
+clearing the database and reprocessing every filing. A PDF is marked
+``started`` before the pipeline writes anything for it, so a run killed
+mid-PDF still leaves a trace of the partial write. Recording a new hash
+for a filename drops the entries of its earlier contents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+MANIFEST_PATH = Path(__file__).resolve().parent.parent / "logs" / "ingestion_manifest.json"
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ManifestEntry(BaseModel):
+    """Ingestion state for a single PDF."""
+
+    filename: str
+    content_hash: str
+    status: Literal["started", "complete", "failed"]
+    duration: float = 0.0
+    chunk_count: int = 0
+    entity_count: int = 0
+    error: str | None = None
+    updated_at: str
+
+
+class IngestionManifest(BaseModel):
+    """All PDFs the pipeline has attempted, keyed by content hash."""
+
+    documents: dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, path: Path = MANIFEST_PATH) -> IngestionManifest:
+        """Read the manifest from disk, or return an empty one."""
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path = MANIFEST_PATH) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(self.model_dump_json(indent=2))
+        tmp_path.replace(path)
+
+    def is_complete(self, content_hash: str) -> bool:
+        entry = self.documents.get(content_hash)
+        return entry is not None and entry.status == "complete"
+
+    def has_partial_writes(self, filename: str) -> bool:
+        """True if a run for this filename started or failed without completing."""
+        return any(
+            e.filename == filename and e.status != "complete"
+            for e in self.documents.values()
+        )
+
+    def latest(self) -> dict[str, ManifestEntry]:
+        """The most recently updated entry per filename.
+
+        Manifests written by earlier versions can still hold several hashes
+        for one filename.
+        """
+        by_name: dict[str, ManifestEntry] = {}
+        for entry in sorted(self.documents.values(), key=lambda e: e.updated_at):
+            by_name[entry.filename] = entry
+        return by_name
+
+    def _put(self, entry: ManifestEntry) -> None:
+        """Store an entry, dropping other hashes recorded for its filename, and persist."""
+        self.documents = {
+            h: e for h, e in self.documents.items() if e.filename != entry.filename
+        }
+        self.documents[entry.content_hash] = entry
+        self.save()
+
+    def mark_started(self, content_hash: str, filename: str) -> None:
+        """Record that the pipeline is about to write a PDF, and persist."""
+        self._put(ManifestEntry(
+            filename=filename,
+            content_hash=content_hash,
+            status="started",
+            updated_at=datetime.now().isoformat(),
+        ))
+
+    def record(self, content_hash: str, result) -> ManifestEntry:
+        """Record a PDFProcessingResult under its content hash and persist."""
+        entry = ManifestEntry(
+            filename=result.pdf_path.name,
+            content_hash=content_hash,
+            status="complete" if result.success else "failed",
+            duration=round(result.duration, 2),
+            chunk_count=result.chunk_count,
+            entity_count=result.entity_count,
+            error=result.error,
+            updated_at=datetime.now().isoformat(),
+        )
+        self._put(entry)
+        return entry
+
+    def forget(self, filename: str) -> None:
+        """Drop every entry recorded for a filename and persist."""
+        self.documents = {
+            h: e for h, e in self.documents.items() if e.filename != filename
+        }
+        self.save()
+
+    def retain(self, filenames: set[str]) -> int:
+        """Keep only entries for these filenames, persist, and return how many were dropped."""
+        kept = {h: e for h, e in self.documents.items() if e.filename in filenames}
+        dropped = len(self.documents) - len(kept)
+        self.documents = kept
+        self.save()
+        return dropped
+
+    def pending(self, pdf_files: list[Path]) -> list[Path]:
+        """Return the PDFs that are new or not yet complete."""
+        return [p for p in pdf_files if not self.is_complete(file_hash(p))]
+
+
+def reset_manifest(path: Path = MANIFEST_PATH) -> None:
+    """Forget all ingestion state (used when the database is cleared)."""
+    path.unlink(missing_ok=True)
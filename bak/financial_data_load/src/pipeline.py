@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import Optional
 
 from neo4j import Driver
+from stats import SCHEMA_RELATIONSHIPS, graph_stats
+
+from .manifest import IngestionManifest
 
 # Labels created internally by SimpleKGPipeline.
 _PIPELINE_LABELS = ["__Entity__", "__KGBuilder__"]
@@ -66,6 +69,10 @@ class PDFProcessingResult:
         self.success: bool = False
         self.error: Optional[str] = None
         self.error_traceback: Optional[str] = None
+        self.skipped: bool = False
+        self.chunk_count: int = 0
+        self.entity_count: int = 0
+        self.stage_durations: dict[str, float] = {}
 
     @property
     def duration(self) -> float:
@@ -77,36 +84,23 @@ class PDFProcessingResult:
 # ---------------------------------------------------------------------------
 
 
-def process_all_pdfs(
-    driver: Driver,
-    pdf_files: list[Path],
-    company_meta: dict[str, dict],
-) -> list[PDFProcessingResult]:
-    """Run the SimpleKGPipeline over all PDF files.
+def _create_pipeline(llm, driver: Driver, embedder, schema, documents=None):
+    """Build a SimpleKGPipeline for 10-K extraction (PDF in, graph written to Neo4j).
 
-    Creates one pipeline instance and reuses it for each PDF.
-    Returns a list of processing results for summary reporting.
+    When pre-chunked ``documents`` are given, PDF parsing and splitting read
+    from them instead of running inline on the event loop.
     """
-    from .config import get_llm, get_embedder, AgentConfig
-    from .loader import normalize_company_name
-    from .schema import build_extraction_schema
     from neo4j_graphrag.experimental.pipeline.kg_builder import SimpleKGPipeline
 
-    log_file = _setup_logging()
-    logger.info(f"Logging to: {log_file}")
+    components = {}
+    if documents is not None:
+        from .chunking import CachedPdfLoader, CachedTextSplitter
+        components = {
+            "pdf_loader": CachedPdfLoader(documents),
+            "text_splitter": CachedTextSplitter(documents),
+        }
 
-    print("Initializing Azure AI Foundry LLM and Embedder...")
-    llm = get_llm()
-    embedder = get_embedder()
-    agent_config = AgentConfig()
-    print(f"  Model: {agent_config.model_name}")
-    print(f"  Embedder: {agent_config.embedding_name}")
-    print(f"  Endpoint: {agent_config.inference_endpoint}")
-
-    schema = build_extraction_schema()
-
-    print("Creating SimpleKGPipeline...")
-    pipeline = SimpleKGPipeline(
+    return SimpleKGPipeline(
         llm=llm,
         driver=driver,
         embedder=embedder,
@@ -114,63 +108,271 @@ def process_all_pdfs(
         from_pdf=True,
         on_error="IGNORE",
         perform_entity_resolution=False,
+        **components,
     )
 
-    results: list[PDFProcessingResult] = []
 
-    async def _run_all():
-        for i, pdf_path in enumerate(pdf_files, 1):
-            result = PDFProcessingResult(pdf_path)
-            result.start_time = time.time()
-            meta = company_meta.get(pdf_path.name)
+def _create_streaming_pipeline(llm, driver: Driver, embedder, schema, documents=None):
+    """Build a StreamingPipeline with the same loader and splitter choices."""
+    from .streaming import StreamingPipeline
 
-            print(f"\n[{i}/{len(pdf_files)}] Processing: {pdf_path.name}")
-            print(f"  File size: {pdf_path.stat().st_size / 1024:.1f} KB")
-            if meta:
-                print(f"  Company: {meta.get('name', 'unknown')} ({meta.get('ticker', '')})")
+    components = {}
+    if documents is not None:
+        from .chunking import CachedPdfLoader, CachedTextSplitter
+        components = {
+            "pdf_loader": CachedPdfLoader(documents),
+            "text_splitter": CachedTextSplitter(documents),
+        }
 
-            metadata = {"source": str(pdf_path)}
-            if meta:
-                normalized_meta = dict(meta)
-                if "name" in normalized_meta:
-                    normalized_meta["name"] = normalize_company_name(normalized_meta["name"])
-                metadata.update(normalized_meta)
+    return StreamingPipeline(llm, driver, embedder, schema, **components)
 
-            try:
+
+def _document_metadata(pdf_path: Path, meta: dict | None) -> dict:
+    """Build the Document node metadata for a PDF, normalizing the company name."""
+    from .loader import normalize_company_name
+
+    metadata = {"source": str(pdf_path)}
+    if meta:
+        normalized_meta = dict(meta)
+        if "name" in normalized_meta:
+            normalized_meta["name"] = normalize_company_name(normalized_meta["name"])
+        metadata.update(normalized_meta)
+    return metadata
+
+
+def _delete_partial_writes(
+    driver: Driver, pdf_files: list[Path], manifest: IngestionManifest,
+) -> None:
+    """Delete what earlier failed or interrupted runs wrote for these PDFs."""
+    from .incremental import delete_document
+
+    for pdf_path in pdf_files:
+        if manifest.has_partial_writes(pdf_path.name):
+            counts = delete_document(driver, pdf_path.name)
+            print(f"  [CLEANUP] {pdf_path.name}: deleted {counts['documents']} document(s), "
+                  f"{counts['chunks']} chunks, {counts['orphans']} orphaned entities "
+                  f"from an unfinished run")
+
+
+def _document_counts(driver: Driver, pdf_path: Path) -> tuple[int, int]:
+    """Count chunks and extracted entities written for a PDF's Document node."""
+    rows, _, _ = driver.execute_query("""
+        MATCH (d:Document {path: $path})<-[:FROM_DOCUMENT]-(c:Chunk)
+        OPTIONAL MATCH (e:__Entity__)-[:FROM_CHUNK]->(c)
+        RETURN count(DISTINCT c) AS chunks, count(DISTINCT e) AS entities
+    """, path=str(pdf_path))
+    if not rows:
+        return 0, 0
+    return rows[0]["chunks"], rows[0]["entities"]
+
+
+def process_all_pdfs(
+    driver: Driver,
+    pdf_files: list[Path],
+    company_meta: dict[str, dict],
+    concurrency: int = 1,
+    manifest: Optional[IngestionManifest] = None,
+    parse_workers: int = 0,
+    streaming: bool = False,
+    llm=None,
+    embedder=None,
+) -> list[PDFProcessingResult]:
+    """Run the SimpleKGPipeline over all PDF files.
+
+    Up to ``concurrency`` PDFs are processed at once, bounded by an asyncio
+    semaphore. Each concurrent slot gets its own pipeline instance, reused
+    for every PDF it processes. Returns a list of processing results (in
+    input order) for summary reporting.
+
+    When a manifest is given, PDFs it already records as complete (by
+    content hash) are skipped, and every processed PDF is recorded in it.
+    A PDF whose earlier run started or failed without completing may have
+    written part of its graph, so that Document/Chunk subgraph is deleted
+    before it is reprocessed.
+
+    With ``parse_workers`` > 0, all PDFs are first parsed and chunked in a
+    process pool (see chunking.prechunk_pdfs) and extraction consumes the
+    cached chunks.
+
+    With ``streaming``, each PDF runs through a StreamingPipeline instead
+    (see streaming.py): chunk batches flow through embed, extract, and write
+    stages over bounded queues, so Neo4j writes overlap extraction.
+
+    ``llm`` and ``embedder`` default to ``get_llm()`` / ``get_embedder()``;
+    the offline benchmark (see bench.py) passes local stand-ins instead.
+    """
+    from embedding_cache import CachedEmbedder
+
+    from .config import get_llm, get_embedder, AgentConfig
+    from .llm_cache import CachedLLM, with_llm_cache
+    from .manifest import file_hash
+    from .rate_limit import llm_usage, rate_limiters
+    from .schema import build_extraction_schema
+    from .timing import PipelineTimeline
+
+    hashes = {p: file_hash(p) for p in pdf_files} if manifest is not None else {}
+    skipped: list[PDFProcessingResult] = []
+    if manifest is not None:
+        todo = []
+        for pdf_path in pdf_files:
+            if manifest.is_complete(hashes[pdf_path]):
+                result = PDFProcessingResult(pdf_path)
+                result.success = result.skipped = True
+                skipped.append(result)
+            else:
+                todo.append(pdf_path)
+        if skipped:
+            print(f"Skipping {len(skipped)} PDFs already complete in manifest.")
+        pdf_files = todo
+        _delete_partial_writes(driver, pdf_files, manifest)
+        if not pdf_files:
+            print("All PDFs already processed. Nothing to do.")
+            return skipped
+
+    concurrency = max(1, min(concurrency, len(pdf_files) or 1))
+
+    log_file = _setup_logging()
+    logger.info(f"Logging to: {log_file}")
+
+    if llm is None or embedder is None:
+        print("Initializing Azure AI Foundry LLM and Embedder...")
+        llm = llm or get_llm()
+        embedder = embedder or get_embedder()
+        agent_config = AgentConfig()
+        print(f"  Model: {agent_config.model_name}")
+        print(f"  Embedder: {agent_config.embedding_name}")
+        print(f"  Endpoint: {agent_config.inference_endpoint}")
+
+    schema = build_extraction_schema()
+    llm = with_llm_cache(llm, schema)
+
+    documents = None
+    if parse_workers > 0:
+        from .chunking import prechunk_pdfs
+        documents = prechunk_pdfs(pdf_files, workers=parse_workers)
+
+    timeline = PipelineTimeline()
+    if streaming:
+        print(f"Creating StreamingPipeline (concurrency={concurrency})...")
+        pipelines = [
+            _create_streaming_pipeline(llm, driver, embedder, schema, documents)
+            for _ in range(concurrency)
+        ]
+    else:
+        print(f"Creating SimpleKGPipeline (concurrency={concurrency})...")
+        pipelines = [
+            _create_pipeline(llm, driver, embedder, schema, documents)
+            for _ in range(concurrency)
+        ]
+        for pipeline in pipelines:
+            timeline.attach(pipeline)
+
+    async def _process_pdf(i: int, pdf_path: Path, pipeline) -> PDFProcessingResult:
+        result = PDFProcessingResult(pdf_path)
+        result.start_time = time.time()
+        meta = company_meta.get(pdf_path.name)
+
+        if manifest is not None:
+            manifest.mark_started(hashes[pdf_path], pdf_path.name)
+        print(f"\n[{i}/{len(pdf_files)}] Processing: {pdf_path.name}")
+        print(f"  File size: {pdf_path.stat().st_size / 1024:.1f} KB")
+        if meta:
+            print(f"  Company: {meta.get('name', 'unknown')} ({meta.get('ticker', '')})")
+
+        try:
+            kwargs = {"timeline": timeline} if streaming else {}
+            with llm_usage() as usage:
                 await pipeline.run_async(
                     file_path=str(pdf_path),
-                    document_metadata=metadata,
+                    document_metadata=_document_metadata(pdf_path, meta),
+                    **kwargs,
                 )
-                result.end_time = time.time()
-                result.success = True
-                print(f"  [OK] {pdf_path.name} ({result.duration:.1f}s)")
-                logger.info(f"SUCCESS: {pdf_path.name} ({result.duration:.1f}s)")
-            except Exception as e:
-                result.end_time = time.time()
-                result.success = False
-                result.error = str(e)
-                result.error_traceback = traceback.format_exc()
-                print(f"  [FAIL] {pdf_path.name}: {e}")
-                logger.error(f"FAILED: {pdf_path.name}: {e}")
-                logger.debug(f"Traceback:\n{result.error_traceback}")
-
-            results.append(result)
-
-        # Close LLM async client
-        await llm.async_client.close()
-
-    asyncio.run(_run_all())
+            if not streaming:  # streaming records tokens per extract batch
+                timeline.add_llm_usage(pdf_path.name, usage)
+            result.end_time = time.time()
+            result.success = True
+            result.chunk_count, result.entity_count = _document_counts(driver, pdf_path)
+            result.stage_durations = timeline.stage_durations(pdf_path.name)
+            print(f"  [OK] {pdf_path.name} ({result.duration:.1f}s, "
+                  f"{result.chunk_count} chunks, {result.entity_count} entities)")
+            print(f"       {_format_stages(result.stage_durations)}")
+            logger.info(f"SUCCESS: {pdf_path.name} ({result.duration:.1f}s)")
+        except Exception as e:
+            result.end_time = time.time()
+            result.success = False
+            result.error = str(e)
+            result.error_traceback = traceback.format_exc()
+            print(f"  [FAIL] {pdf_path.name}: {e}")
+            logger.error(f"FAILED: {pdf_path.name}: {e}")
+            logger.debug(f"Traceback:\n{result.error_traceback}")
+
+        if manifest is not None:
+            manifest.record(hashes[pdf_path], result)
+        return result
+
+    async def _process(
+        i: int,
+        pdf_path: Path,
+        semaphore: asyncio.Semaphore,
+        pool: asyncio.Queue,
+    ) -> PDFProcessingResult:
+        async with semaphore:
+            pipeline = await pool.get()
+            try:
+                return await _process_pdf(i, pdf_path, pipeline)
+            finally:
+                pool.put_nowait(pipeline)
+
+    async def _run_all() -> list[PDFProcessingResult]:
+        semaphore = asyncio.Semaphore(concurrency)
+        pool: asyncio.Queue = asyncio.Queue()
+        for pipeline in pipelines:
+            pool.put_nowait(pipeline)
+
+        try:
+            return list(await asyncio.gather(*(
+                _process(i, pdf_path, semaphore, pool)
+                for i, pdf_path in enumerate(pdf_files, 1)
+            )))
+        finally:
+            # Close LLM async client
+            await llm.async_client.close()
+
+    run_start = time.time()
+    results = asyncio.run(_run_all())
+    wall_time = time.time() - run_start
 
     # Print summary
     successful = [r for r in results if r.success]
     failed = [r for r in results if not r.success]
     print(f"\nProcessed {len(results)} PDFs: {len(successful)} successful, {len(failed)} failed")
+    print(f"Wall time: {wall_time:.1f}s (concurrency={concurrency})")
     if failed:
         print("Failed PDFs:")
         for r in failed:
             print(f"  - {r.pdf_path.name}: {r.error}")
 
-    _write_summary(results, log_file)
+    run_stats = {}
+    if isinstance(llm, CachedLLM):
+        run_stats["LLM cache"] = llm.summary()
+        llm.close()
+    if isinstance(embedder, CachedEmbedder):
+        run_stats["Embedding cache"] = embedder.summary()
+        embedder.close()
+    for limiter in rate_limiters():
+        run_stats[f"Rate limiter ({limiter.name})"] = limiter.summary()
+    for name, stats in run_stats.items():
+        print(f"{name}: {stats}")
+
+    print("\nStage latency:")
+    for line in _stage_table(timeline):
+        print(f"  {line}")
+    timeline_files = timeline.write(log_file)
+    print(f"Timeline written to: {timeline_files[0]} (+ .csv)")
+
+    results = skipped + results
+    _write_summary(results, log_file, wall_time=wall_time, concurrency=concurrency,
+                   run_stats=run_stats, timeline=timeline)
     return results
 
 
@@ -197,10 +399,36 @@ def run_entity_resolution(driver: Driver) -> None:
 # ---------------------------------------------------------------------------
 
 
-def _write_summary(results: list[PDFProcessingResult], log_file: Path) -> None:
+def _format_stages(stage_durations: dict[str, float]) -> str:
+    """One-line per-stage breakdown, e.g. 'pdf_loader 0.3s | extractor 41.2s'."""
+    return " | ".join(f"{stage} {secs:.1f}s" for stage, secs in stage_durations.items())
+
+
+def _stage_table(timeline) -> list[str]:
+    """Per-stage latency table plus run-wide throughput totals."""
+    lines = [f"{'Stage':<16} {'Runs':>5} {'Total':>9} {'p50':>8} {'p95':>8}"]
+    for s in timeline.stage_stats():
+        lines.append(f"{s.stage:<16} {s.count:>5} {s.total:>8.1f}s "
+                     f"{s.p50:>7.2f}s {s.p95:>7.2f}s")
+    totals = timeline.totals()
+    lines.append(f"Chunks: {totals['chunks']} | Est. LLM tokens sent/received: "
+                 f"{totals['tokens_in']}/{totals['tokens_out']} | "
+                 f"Neo4j rows written: {totals['rows']}")
+    return lines
+
+
+def _write_summary(
+    results: list[PDFProcessingResult],
+    log_file: Path,
+    wall_time: float | None = None,
+    concurrency: int = 1,
+    run_stats: dict[str, str] | None = None,
+    timeline=None,
+) -> None:
     """Write processing summary to a separate file."""
     summary_file = log_file.parent / f"summary_{log_file.stem}.txt"
-    successful = [r for r in results if r.success]
+    successful = [r for r in results if r.success and not r.skipped]
+    skipped = [r for r in results if r.skipped]
     failed = [r for r in results if not r.success]
     total_time = sum(r.duration for r in results)
 
@@ -209,11 +437,29 @@ def _write_summary(results: list[PDFProcessingResult], log_file: Path) -> None:
         f.write("PDF PROCESSING SUMMARY\n")
         f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"{'=' * 70}\n\n")
-        f.write(f"Total: {len(results)} | Successful: {len(successful)} | Failed: {len(failed)}\n")
-        f.write(f"Total time: {total_time:.1f}s\n\n")
+        f.write(f"Total: {len(results)} | Successful: {len(successful)} | "
+                f"Skipped: {len(skipped)} | Failed: {len(failed)}\n")
+        f.write(f"Total time: {total_time:.1f}s\n")
+        if wall_time is not None:
+            f.write(f"Wall time: {wall_time:.1f}s (concurrency={concurrency})\n")
+        for name, stats in (run_stats or {}).items():
+            f.write(f"{name}: {stats}\n")
+        f.write("\n")
+
+        if timeline is not None and timeline.records:
+            f.write("Stage latency:\n")
+            for line in _stage_table(timeline):
+                f.write(f"  {line}\n")
+            f.write("\n")
 
         for r in successful:
-            f.write(f"  [OK] {r.pdf_path.name} ({r.duration:.1f}s)\n")
+            f.write(f"  [OK] {r.pdf_path.name} ({r.duration:.1f}s, "
+                    f"{r.chunk_count} chunks, {r.entity_count} entities)\n")
+            if r.stage_durations:
+                f.write(f"       {_format_stages(r.stage_durations)}\n")
+
+        for r in skipped:
+            f.write(f"  [SKIP] {r.pdf_path.name} (complete in manifest)\n")
 
         for r in failed:
             f.write(f"\n  [FAIL] {r.pdf_path.name} ({r.duration:.1f}s)\n")
@@ -400,16 +646,11 @@ def _verify_entity_resolution(driver: Driver) -> None:
                 failed += 1
 
     # Check no duplicate Company names exist at all
-    dup_rows, _, _ = driver.execute_query(
-        "MATCH (c:Company) WHERE c.name IS NOT NULL "
-        "WITH c.name AS name, count(*) AS cnt "
-        "WHERE cnt > 1 "
-        "RETURN name, cnt ORDER BY cnt DESC LIMIT 10"
-    )
-    if dup_rows:
+    duplicates = graph_stats(driver).duplicate_company_names
+    if duplicates:
         print(f"    [FAIL] Duplicate Company names still exist:")
-        for r in dup_rows:
-            print(f"           {r['name']!r} x{r['cnt']}")
+        for d in duplicates:
+            print(f"           {d.name!r} x{d.count}")
         failed += 1
     else:
         print(f"    [PASS] No duplicate Company names")
@@ -447,32 +688,25 @@ def validate_enrichment(driver: Driver) -> None:
             names = ", ".join(r["name"] for r in rows)
             print(f"\n  {label} ({len(rows)} samples): {names}")
 
+    stats = graph_stats(driver)
+
     # 3. Schema relationships
-    rows, _, _ = driver.execute_query(f"""
-        MATCH (c:Company)-[r]->(target)
-        WHERE type(r) IN ['FACES_RISK', 'OFFERS', 'HAS_EXECUTIVE', 'REPORTS',
-                          'COMPETES_WITH', 'PARTNERS_WITH']
-        WITH type(r) AS rel, count(r) AS cnt
-        RETURN rel, cnt ORDER BY cnt DESC
-        LIMIT {_SAMPLE_SIZE}
-    """)
-    if rows:
+    schema_counts = sorted(
+        ((rel, stats.rel_count(rel)) for rel in SCHEMA_RELATIONSHIPS if stats.rel_count(rel)),
+        key=lambda item: item[1], reverse=True,
+    )
+    if schema_counts:
         print(f"\n  Schema relationships:")
-        for r in rows:
-            print(f"    {r['rel']}: {r['cnt']}")
+        for rel, cnt in schema_counts[:_SAMPLE_SIZE]:
+            print(f"    {rel}: {cnt}")
     else:
         print(f"\n  [WARN] No schema relationships found!")
 
     # 4. Provenance chain
-    rows, _, _ = driver.execute_query("""
-        MATCH (e:__Entity__)-[:FROM_CHUNK]->(c:Chunk)-[:FROM_DOCUMENT]->(d:Document)
-        RETURN count(DISTINCT e) AS entities,
-               count(DISTINCT c) AS chunks,
-               count(DISTINCT d) AS docs
-    """)
-    if rows:
-        r = rows[0]
-        print(f"\n  Provenance: {r['entities']} entities -> {r['chunks']} chunks -> {r['docs']} documents")
+    print(
+        f"\n  Provenance: {stats.entities_with_provenance} entities -> "
+        f"{stats.provenance_chunks} chunks -> {stats.provenance_documents} documents"
+    )
 
     # 5. Entity resolution verification
     _verify_entity_resolution(driver)
@@ -0,0 +1,159 @@
+"""neo4j-graphrag wrappers around the shared client-side rate limiter.
+
+The limiter itself (token buckets, AIMD concurrency, retries) lives in
+shared/rate_limit.py so the loader and the workshop's memory embedder share
+one implementation; it is re-exported here. This module adds the
+neo4j-graphrag LLM and embedder wrappers and per-scope LLM usage counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from neo4j_graphrag.embeddings import Embedder
+from neo4j_graphrag.llm import LLMInterface
+from neo4j_graphrag.llm.types import LLMResponse
+from rate_limit import (
+    RateLimitConfig,
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+    is_throttled,
+    is_transient,
+    rate_limiters,
+    retry_after,
+)
+
+__all__ = [
+    "LLMUsage",
+    "RateLimitConfig",
+    "RateLimitedEmbedder",
+    "RateLimitedLLM",
+    "RateLimiter",
+    "TokenBucket",
+    "estimate_tokens",
+    "get_rate_limiter",
+    "is_throttled",
+    "is_transient",
+    "llm_request_tokens",
+    "llm_usage",
+    "rate_limiters",
+    "retry_after",
+]
+
+
+# ---------------------------------------------------------------------------
+# neo4j-graphrag LLM / embedder wrappers
+# ---------------------------------------------------------------------------
+
+# Allowance for completion tokens in tokens-per-minute accounting.
+_COMPLETION_TOKENS = 1000
+
+
+def llm_request_tokens(prompt: str) -> int:
+    """Tokens-per-minute cost of an LLM request: prompt estimate + completion allowance."""
+    return estimate_tokens(prompt) + _COMPLETION_TOKENS
+
+
+def _prompt_text(input: Any, system_instruction: str | None) -> str:
+    text = input if isinstance(input, str) else str(input)
+    return text + (system_instruction or "")
+
+
+class LLMUsage:
+    """Estimated prompt and response tokens of the LLM calls in one scope."""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+
+_usage: ContextVar[LLMUsage | None] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def llm_usage() -> Iterator[LLMUsage]:
+    """Count the LLM calls made in this context, including tasks it starts."""
+    usage = LLMUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def _count_call(prompt: str, response: LLMResponse) -> None:
+    usage = _usage.get()
+    if usage is not None:
+        usage.calls += 1
+        usage.tokens_in += estimate_tokens(prompt)
+        usage.tokens_out += estimate_tokens(response.content or "")
+
+
+class RateLimitedLLM(LLMInterface):
+    """LLM whose calls go through its deployment's RateLimiter.
+
+    The wrapped LLM should be created with a NoOpRateLimitHandler so 429s
+    are retried here, once, rather than also by neo4j-graphrag's handler.
+    Other attributes (``async_client``, ...) are forwarded to it.
+    """
+
+    def __init__(self, llm: LLMInterface):
+        super().__init__(model_name=llm.model_name, model_params=llm.model_params)
+        self.llm = llm
+        self.supports_structured_output = llm.supports_structured_output
+        self.limiter = get_rate_limiter(llm.model_name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def invoke(self, input: Any, message_history: Any = None,
+               system_instruction: str | None = None, **kwargs: Any) -> LLMResponse:
+        prompt = _prompt_text(input, system_instruction)
+        response = self.limiter.run_sync(
+            lambda: self.llm.invoke(input, message_history, system_instruction, **kwargs),
+            tokens=llm_request_tokens(prompt),
+        )
+        _count_call(prompt, response)
+        return response
+
+    async def ainvoke(self, input: Any, message_history: Any = None,
+                      system_instruction: str | None = None, **kwargs: Any) -> LLMResponse:
+        prompt = _prompt_text(input, system_instruction)
+        response = await self.limiter.run(
+            lambda: self.llm.ainvoke(input, message_history, system_instruction, **kwargs),
+            tokens=llm_request_tokens(prompt),
+        )
+        _count_call(prompt, response)
+        return response
+
+
+class RateLimitedEmbedder(Embedder):
+    """Embedder whose calls go through its deployment's RateLimiter."""
+
+    def __init__(self, embedder: Embedder, model: str):
+        super().__init__()
+        self.embedder = embedder
+        self.limiter = get_rate_limiter(model)
+
+    def embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        return self.limiter.run_sync(
+            lambda: self.embedder.embed_query(text, **kwargs),
+            tokens=estimate_tokens(text),
+        )
+
+    async def async_embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        # OpenAIEmbeddings has no async client; run the blocking call in a
+        # thread so the event loop keeps serving other requests.
+        return await self.limiter.run(
+            lambda: asyncio.to_thread(self.embedder.embed_query, text, **kwargs),
+            tokens=estimate_tokens(text),
+        )
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from neo4j import Driver
+from neo4j.exceptions import TransientError
 
 # ---------------------------------------------------------------------------
 # Constraint and index definitions
@@ -31,6 +35,24 @@ EXTRACTION_CONSTRAINTS: list[tuple[str, str, str]] = [
     ("unique_financialmetric_name", "FinancialMetric", "name"),
 ]
 
+# Non-unique range indexes on the same keys, created before a load (``load
+# --lookup-indexes``) so MERGE/MATCH on names is an index seek instead of a
+# label scan while duplicates are still allowed. create_all_constraints drops
+# each one before creating the uniqueness constraint that replaces it.
+LOOKUP_INDEXES: list[tuple[str, str, str]] = [
+    (f"lookup_{label.lower()}_{prop.lower()}", label, prop)
+    for _name, label, prop in CONSTRAINTS + EXTRACTION_CONSTRAINTS
+]
+
+# Seconds to wait for new lookup indexes to come online before loading.
+_INDEX_WAIT_SECONDS = 300
+
+# Exact-name dedup: duplicate groups merged per transaction, labels deduped
+# at once, and passes over a label while batches keep failing.
+DEDUP_BATCH_SIZE = 100
+DEDUP_CONCURRENCY = 1
+_DEDUP_PASSES = 3
+
 
 # ---------------------------------------------------------------------------
 # DDL functions (all idempotent via IF NOT EXISTS)
@@ -48,45 +70,127 @@ def _cleanup_empty_properties(driver: Driver) -> None:
             print(f"  [CLEANUP] Deleted {removed} {label} node(s) with empty {prop}")
 
 
-def _dedup_exact_names(driver: Driver) -> None:
+def _dedup_label(driver: Driver, label: str, prop: str, batch_size: int) -> tuple[int, int, int]:
+    """Merge exact-name duplicates of one label; return (groups, merged, failed groups).
+
+    Grouping and merging happen in one statement: each batch of groups is
+    merged and committed in its own transaction, and a failed batch (e.g. a
+    deadlock with another label's merges) is skipped and reported. Committed
+    merges stay merged, so another pass only sees the groups that are left.
+    """
+    groups = merged = failed = 0
+    for attempt in range(_DEDUP_PASSES):
+        try:
+            # CALL ... IN TRANSACTIONS needs an auto-commit transaction (session.run).
+            with driver.session() as session:
+                record = session.run(f"""
+                    MATCH (n:`{label}`) WHERE n.`{prop}` IS NOT NULL
+                    WITH n ORDER BY size(keys(n)) + COUNT {{ (n)--() }} DESC
+                    WITH n.`{prop}` AS name, collect(n) AS nodes
+                    WHERE size(nodes) > 1
+                    CALL (nodes) {{
+                        CALL apoc.refactor.mergeNodes(nodes,
+                            {{properties: 'combine', mergeRels: true}}) YIELD node
+                        RETURN count(node) AS survivors
+                    }} IN TRANSACTIONS OF {batch_size} ROWS
+                        ON ERROR CONTINUE REPORT STATUS AS status
+                    RETURN count(nodes) AS groups,
+                           sum(CASE WHEN status.committed THEN size(nodes) - 1 ELSE 0 END) AS merged,
+                           count(CASE WHEN NOT status.committed THEN 1 END) AS failed
+                """).single()
+        except TransientError:
+            if attempt == _DEDUP_PASSES - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+            continue
+        groups = max(groups, record["groups"])
+        merged += record["merged"]
+        failed = record["failed"]
+        if not failed:
+            break
+    return groups, merged, failed
+
+
+def _dedup_exact_names(
+    driver: Driver,
+    concurrency: int = DEDUP_CONCURRENCY,
+    batch_size: int = DEDUP_BATCH_SIZE,
+) -> None:
     """Merge nodes with identical names for extraction entity types.
 
     Uses apoc.refactor.mergeNodes to collapse duplicates, keeping the node
-    with the most properties and relationships as the survivor.
+    with the most properties and relationships as the survivor. Groups are
+    merged ``batch_size`` per transaction, up to ``concurrency`` labels at a
+    time.
     """
-    for _name, label, prop in EXTRACTION_CONSTRAINTS:
-        result = driver.execute_query(
-            f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL "
-            f"WITH n.{prop} AS name, collect(n) AS nodes "
-            f"WHERE size(nodes) > 1 "
-            f"RETURN name, size(nodes) AS cnt ORDER BY cnt DESC"
-        )
-        dup_count = len(result.records)
-        if not dup_count:
-            continue
+    start = time.monotonic()
+    total_merged = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(_dedup_label, driver, label, prop, batch_size): label
+            for _name, label, prop in EXTRACTION_CONSTRAINTS
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            groups, merged, failed = future.result()
+            total_merged += merged
+            if groups:
+                print(f"  [DEDUP] {label}: merged {merged} duplicate nodes ({groups} groups)")
+            if failed:
+                print(f"  [WARN] {label}: {failed} groups still unmerged after "
+                      f"{_DEDUP_PASSES} passes; re-run finalize to retry them")
+
+    elapsed = time.monotonic() - start
+    if total_merged:
+        rate = total_merged / elapsed if elapsed > 0 else 0.0
+        print(f"  [DEDUP] {total_merged:,} nodes merged in {elapsed:.1f}s ({rate:,.0f}/sec)")
+
 
-        total_merged = 0
+def _constrained_keys(driver: Driver) -> set[tuple[str, str]]:
+    """(label, property) pairs already covered by a single-property constraint."""
+    rows, _, _ = driver.execute_query(
+        "SHOW CONSTRAINTS YIELD labelsOrTypes, properties "
+        "RETURN labelsOrTypes, properties"
+    )
+    return {
+        (r["labelsOrTypes"][0], r["properties"][0])
+        for r in rows
+        if r["labelsOrTypes"] and r["properties"] and len(r["properties"]) == 1
+    }
+
+
+def create_lookup_indexes(driver: Driver) -> None:
+    """Create range indexes on merge keys that have no uniqueness constraint yet."""
+    constrained = _constrained_keys(driver)
+    for name, label, prop in LOOKUP_INDEXES:
+        if (label, prop) in constrained:
+            print(f"  [SKIP] Lookup index: {name} ({label}.{prop} already constrained)")
+            continue
         driver.execute_query(
-            f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL "
-            f"WITH n.{prop} AS name, collect(n) AS nodes "
-            f"WHERE size(nodes) > 1 "
-            f"CALL apoc.refactor.mergeNodes(nodes, "
-            f"  {{properties: 'combine', mergeRels: true}}) YIELD node "
-            f"RETURN count(*) AS merged"
+            f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
         )
-        total_merged = sum(r["cnt"] - 1 for r in result.records)
-        print(f"  [DEDUP] {label}: merged {total_merged} duplicate nodes ({dup_count} groups)")
+        print(f"  [OK] Lookup index: {name} ({label}.{prop})")
+    driver.execute_query("CALL db.awaitIndexes($timeout)", timeout=_INDEX_WAIT_SECONDS)
 
 
-def create_all_constraints(driver: Driver) -> None:
-    """Create all uniqueness constraints (metadata + extraction)."""
+def create_all_constraints(driver: Driver, dedup_concurrency: int = DEDUP_CONCURRENCY) -> None:
+    """Create all uniqueness constraints (metadata + extraction).
+
+    A lookup index on the same key blocks the constraint (its backing index
+    would duplicate it), so it is dropped first.
+    """
     _cleanup_empty_properties(driver)
-    _dedup_exact_names(driver)
+    _dedup_exact_names(driver, concurrency=dedup_concurrency)
+    lookup_names = {(label, prop): name for name, label, prop in LOOKUP_INDEXES}
     for name, label, prop in CONSTRAINTS + EXTRACTION_CONSTRAINTS:
+        dropped = driver.execute_query(
+            f"DROP INDEX {lookup_names[(label, prop)]} IF EXISTS"
+        ).summary.counters.indexes_removed
         driver.execute_query(
             f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
         )
-        print(f"  [OK] Constraint: {name} ({label}.{prop})")
+        swapped = " (replaces lookup index)" if dropped else ""
+        print(f"  [OK] Constraint: {name} ({label}.{prop}){swapped}")
 
 
 def create_fulltext_indexes(driver: Driver) -> None:
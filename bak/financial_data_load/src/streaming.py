@@ -0,0 +1,256 @@
+"""Streaming ingestion: overlap chunk embedding, LLM extraction, and graph writes.
+
+``SimpleKGPipeline.run_async`` runs each stage over the whole document
+before starting the next, then writes the entire extracted graph at once.
+StreamingPipeline builds the same components but moves batches of chunks
+through embed -> extract -> write stages connected by bounded asyncio
+queues. Neo4j writes start while later chunks are still being extracted,
+and only a few batches of embedded chunks and extracted subgraphs are held
+in memory at a time.
+
+The lexical graph (Document, Chunk, FROM_DOCUMENT, NEXT_CHUNK, FROM_CHUNK)
+matches what SimpleKGPipeline writes: the Document node goes out with the
+first batch, and the NEXT_CHUNK link across a batch boundary is written
+with the later batch, once both chunks exist.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import neo4j
+from neo4j_graphrag.experimental.components.embedder import TextChunkEmbedder
+from neo4j_graphrag.experimental.components.entity_relation_extractor import (
+    LLMEntityRelationExtractor,
+    OnError,
+)
+from neo4j_graphrag.experimental.components.graph_pruning import GraphPruning
+from neo4j_graphrag.experimental.components.kg_writer import KGWriterModel, Neo4jWriter
+from neo4j_graphrag.experimental.components.lexical_graph import LexicalGraphBuilder
+from neo4j_graphrag.experimental.components.pdf_loader import PdfLoader
+from neo4j_graphrag.experimental.components.text_splitters.fixed_size_splitter import (
+    FixedSizeSplitter,
+)
+from neo4j_graphrag.experimental.components.types import (
+    LexicalGraphConfig,
+    Neo4jGraph,
+    TextChunk,
+    TextChunks,
+)
+
+from .rate_limit import llm_usage
+from .timing import PipelineTimeline, StageTiming
+
+# Chunks per batch flowing through the stages, and batches buffered between
+# two stages before the upstream stage waits.
+STREAM_BATCH_SIZE = 8
+STREAM_QUEUE_SIZE = 2
+
+_DONE = object()
+
+
+class StreamingWriter(Neo4jWriter):
+    """Neo4jWriter that writes one document's graph batch by batch.
+
+    Neo4jWriter clears every ``__tmp_internal_id`` after each run, which
+    would break relationships from later batches to nodes written earlier
+    (the Document node, the previous chunk). This writer keeps the temporary
+    ids of its own nodes until the document is finished, then clears only
+    those.
+    """
+
+    def __init__(self, driver: neo4j.Driver, neo4j_database: str | None = None):
+        super().__init__(driver, neo4j_database=neo4j_database, clean_db=False)
+        self._db_setup()
+
+    async def run(
+        self,
+        graph: Neo4jGraph,
+        lexical_graph_config: LexicalGraphConfig = LexicalGraphConfig(),
+    ) -> KGWriterModel:
+        return await super().run(graph, lexical_graph_config)
+
+    def write_batch(self, graph: Neo4jGraph, lexical_graph_config: LexicalGraphConfig) -> int:
+        """Write a subgraph (nodes first, then relationships); return rows written."""
+        if graph.nodes:
+            self._upsert_nodes(graph.nodes, lexical_graph_config)
+        if graph.relationships:
+            self._upsert_relationships(graph.relationships)
+        return len(graph.nodes) + len(graph.relationships)
+
+    def clean(self, node_ids: list[str]) -> None:
+        """Clear the temporary ids of the given nodes once their document is written."""
+        self.driver.execute_query(
+            "UNWIND $ids AS id "
+            "MATCH (n:__KGBuilder__ {__tmp_internal_id: id}) "
+            "SET n.__tmp_internal_id = NULL",
+            ids=node_ids,
+            database_=self.neo4j_database,
+        )
+
+
+class StreamingPipeline:
+    """The SimpleKGPipeline components, run as a bounded-queue stream per PDF."""
+
+    def __init__(
+        self,
+        llm,
+        driver: neo4j.Driver,
+        embedder,
+        schema,
+        pdf_loader: PdfLoader | None = None,
+        text_splitter=None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        queue_size: int = STREAM_QUEUE_SIZE,
+    ):
+        self.schema = schema
+        self.loader = pdf_loader or PdfLoader()
+        self.splitter = text_splitter or FixedSizeSplitter(chunk_size=4000, chunk_overlap=200)
+        self.embedder = TextChunkEmbedder(embedder=embedder)
+        # The lexical graph is built here, batch by batch; the extractor only
+        # adds FROM_CHUNK links from entities to their chunk.
+        self.extractor = LLMEntityRelationExtractor(
+            llm=llm, create_lexical_graph=False, on_error=OnError.IGNORE,
+        )
+        self.pruner = GraphPruning()
+        self.writer = StreamingWriter(driver)
+        self.lexical_graph_config = LexicalGraphConfig()
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def _chunk_graph(self, batch: list[TextChunk]) -> Neo4jGraph:
+        """Chunk nodes and NEXT_CHUNK links within one batch."""
+        builder = LexicalGraphBuilder(config=self.lexical_graph_config)
+        graph = Neo4jGraph()
+        for chunk, next_chunk in zip(batch, batch[1:] + [None]):
+            graph.nodes.append(builder.create_chunk_node(chunk))
+            if next_chunk is not None:
+                graph.relationships.append(builder.create_next_chunk_relationship(chunk, next_chunk))
+        return graph
+
+    def _document_links(
+        self,
+        batch: list[TextChunk],
+        previous: TextChunk | None,
+        document_info,
+    ) -> Neo4jGraph:
+        """Document node (first batch only), FROM_DOCUMENT, and the NEXT_CHUNK
+        link from the previous batch.
+
+        These point at nodes outside the batch, which GraphPruning would drop,
+        so they are added after pruning.
+        """
+        builder = LexicalGraphBuilder(config=self.lexical_graph_config)
+        graph = Neo4jGraph()
+        if previous is None:
+            graph.nodes.append(builder.create_document_node(document_info))
+        else:
+            graph.relationships.append(builder.create_next_chunk_relationship(previous, batch[0]))
+        for chunk in batch:
+            graph.relationships.append(builder.create_chunk_to_document_rel(chunk, document_info))
+        return graph
+
+    async def run_async(
+        self,
+        file_path: str,
+        document_metadata: dict[str, Any] | None = None,
+        timeline: PipelineTimeline | None = None,
+    ) -> dict[str, int]:
+        """Stream one PDF into Neo4j; return chunk and written-row counts."""
+        run_id = str(uuid.uuid4())
+        pdf_name = Path(file_path).name
+
+        def record(stage: str, started: float, **counts) -> None:
+            if timeline is not None:
+                timeline.records.append(StageTiming(
+                    pdf=pdf_name, run_id=run_id, stage=stage,
+                    started_at=started, duration=time.time() - started, **counts,
+                ))
+
+        started = time.time()
+        document = await self.loader.run(filepath=file_path, metadata=document_metadata)
+        record("pdf_loader", started)
+
+        started = time.time()
+        chunks = (await self.splitter.run(document.text)).chunks
+        record("splitter", started, chunks=len(chunks))
+        document_info = document.document_info
+        del document  # only the chunks are needed from here on
+
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        extract_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        written_ids: list[str] = []
+        totals = {"chunks": len(chunks), "rows": 0}
+
+        async def produce() -> None:
+            for i in range(0, len(chunks), self.batch_size):
+                await embed_q.put(chunks[i : i + self.batch_size])
+            chunks.clear()  # batches in flight hold the only references now
+            await embed_q.put(_DONE)
+
+        async def embed() -> None:
+            while (batch := await embed_q.get()) is not _DONE:
+                started = time.time()
+                embedded = await self.embedder.run(TextChunks(chunks=batch))
+                record("chunk_embedder", started, chunks=len(batch))
+                await extract_q.put(embedded.chunks)
+            await extract_q.put(_DONE)
+
+        async def extract() -> None:
+            previous = None
+            while (batch := await extract_q.get()) is not _DONE:
+                started = time.time()
+                with llm_usage() as usage:
+                    graph = await self.extractor.run(
+                        chunks=TextChunks(chunks=batch),
+                        document_info=document_info,
+                        lexical_graph_config=self.lexical_graph_config,
+                        schema=self.schema,
+                    )
+                record("extractor", started, chunks=len(batch),
+                       tokens_in=usage.tokens_in, tokens_out=usage.tokens_out)
+                links = self._document_links(batch, previous, document_info)
+                chunk_graph = self._chunk_graph(batch)
+                previous = batch[-1]
+                # Entities are pruned together with their chunks so FROM_CHUNK survives.
+                pruned = (await self.pruner.run(
+                    Neo4jGraph(
+                        nodes=chunk_graph.nodes + graph.nodes,
+                        relationships=chunk_graph.relationships + graph.relationships,
+                    ),
+                    self.schema,
+                    lexical_graph_config=self.lexical_graph_config,
+                )).graph
+                await write_q.put(Neo4jGraph(
+                    nodes=links.nodes + pruned.nodes,
+                    relationships=pruned.relationships + links.relationships,
+                ))
+            await write_q.put(_DONE)
+
+        async def write() -> None:
+            while (graph := await write_q.get()) is not _DONE:
+                started = time.time()
+                # The sync driver call runs in a thread so extraction keeps going.
+                rows = await asyncio.to_thread(
+                    self.writer.write_batch, graph, self.lexical_graph_config,
+                )
+                written_ids.extend(n.id for n in graph.nodes)
+                totals["rows"] += rows
+                record("writer", started, rows=rows)
+
+        tasks = [asyncio.create_task(stage()) for stage in (produce, embed, extract, write)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if written_ids:
+                await asyncio.to_thread(self.writer.clean, written_ids)
+        return totals
@@ -0,0 +1,175 @@
+"""Per-stage timing and throughput instrumentation for SimpleKGPipeline runs.
+
+A PipelineTimeline registers one callback on each pipeline's event notifier
+and turns TASK_STARTED / TASK_FINISHED events into one StageTiming record
+per PDF and pipeline component (pdf_loader, splitter, chunk_embedder,
+extractor, pruner, writer, ...). Records carry chunk counts, estimated LLM
+tokens in/out for the extractor (the prompts sent and the response text,
+counted by rate_limit.llm_usage), and node + relationship rows for the
+writer. The timeline is written to ``logs/`` as JSON and CSV, and
+per-stage p50/p95 latencies go into the run summary.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from .rate_limit import LLMUsage
+
+# The schema component only passes the extraction schema through; its
+# "duration" is just time spent waiting for the event loop.
+_IGNORED_STAGES = {"schema"}
+
+
+class StageTiming(BaseModel):
+    """One pipeline component run for one PDF."""
+
+    pdf: str
+    run_id: str
+    stage: str
+    started_at: float
+    duration: float
+    chunks: int | None = None
+    tokens_in: int | None = None
+    tokens_out: int | None = None
+    rows: int | None = None
+
+
+class StageStats(BaseModel):
+    """Latency distribution for one stage across a run."""
+
+    stage: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _chunk_texts(payload: dict[str, Any]) -> list[str]:
+    chunks = payload.get("chunks")
+    if isinstance(chunks, dict):  # TextChunks input to the extractor
+        chunks = chunks.get("chunks")
+    return [c.get("text", "") for c in chunks or [] if isinstance(c, dict)]
+
+
+class PipelineTimeline:
+    """Collects StageTiming records from pipeline events, keyed by run id."""
+
+    def __init__(self):
+        self.records: list[StageTiming] = []
+        self._pdf_by_run: dict[str, str] = {}
+        self._open: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+
+    def attach(self, pipeline) -> None:
+        """Register the timeline callback on a SimpleKGPipeline."""
+        pipeline.runner.pipeline.event_notifier.add_callback(self._on_event)
+
+    async def _on_event(self, event) -> None:
+        event_type = event.event_type.value
+        payload = event.payload or {}
+
+        if event_type == "PIPELINE_STARTED":
+            filepath = (payload.get("pdf_loader") or {}).get("filepath", "")
+            self._pdf_by_run[event.run_id] = Path(filepath).name
+        elif getattr(event, "task_name", None) in _IGNORED_STAGES:
+            return
+        elif event_type == "TASK_STARTED":
+            self._open[(event.run_id, event.task_name)] = (event.timestamp.timestamp(), payload)
+        elif event_type == "TASK_FINISHED":
+            started = self._open.pop((event.run_id, event.task_name), None)
+            if started is None:
+                return
+            self.records.append(self._record(event, *started))
+
+    def _record(self, event, started_at: float, inputs: dict[str, Any]) -> StageTiming:
+        outputs = event.payload or {}
+        record = StageTiming(
+            pdf=self._pdf_by_run.get(event.run_id, ""),
+            run_id=event.run_id,
+            stage=event.task_name,
+            started_at=started_at,
+            duration=event.timestamp.timestamp() - started_at,
+        )
+        if "chunks" in outputs or "chunks" in inputs:
+            record.chunks = len(_chunk_texts(outputs) or _chunk_texts(inputs))
+        metadata = outputs.get("metadata") or {}
+        if "node_count" in metadata:
+            record.rows = metadata.get("node_count", 0) + metadata.get("relationship_count", 0)
+        return record
+
+    def add_llm_usage(self, pdf: str, usage: LLMUsage) -> None:
+        """Attribute a PDF run's LLM tokens to its extractor record."""
+        for r in self.records:
+            if r.pdf == pdf and r.stage == "extractor":
+                r.tokens_in = (r.tokens_in or 0) + usage.tokens_in
+                r.tokens_out = (r.tokens_out or 0) + usage.tokens_out
+                return
+
+    # -- aggregation ---------------------------------------------------------
+
+    def stage_durations(self, pdf: str) -> dict[str, float]:
+        """Seconds spent in each stage for one PDF (summed over reruns)."""
+        durations: dict[str, float] = {}
+        for r in self.records:
+            if r.pdf == pdf:
+                durations[r.stage] = durations.get(r.stage, 0.0) + r.duration
+        return durations
+
+    def stage_stats(self) -> list[StageStats]:
+        """Per-stage count, total, p50, and p95 across all PDFs, in pipeline order."""
+        by_stage: dict[str, list[float]] = {}
+        for r in sorted(self.records, key=lambda r: r.started_at):
+            by_stage.setdefault(r.stage, []).append(r.duration)
+        return [
+            StageStats(
+                stage=stage,
+                count=len(values),
+                total=sum(values),
+                p50=_percentile(values, 50),
+                p95=_percentile(values, 95),
+            )
+            for stage, values in by_stage.items()
+        ]
+
+    def totals(self) -> dict[str, int]:
+        """Run-wide chunk, token, and write-row totals."""
+        return {
+            "chunks": sum(r.chunks or 0 for r in self.records if r.stage == "splitter"),
+            "tokens_in": sum(r.tokens_in or 0 for r in self.records),
+            "tokens_out": sum(r.tokens_out or 0 for r in self.records),
+            "rows": sum(r.rows or 0 for r in self.records),
+        }
+
+    # -- output --------------------------------------------------------------
+
+    def write(self, log_file: Path) -> tuple[Path, Path]:
+        """Write the timeline next to the run log as JSON and CSV."""
+        json_file = log_file.parent / f"timeline_{log_file.stem}.json"
+        csv_file = json_file.with_suffix(".csv")
+
+        json_file.write_text(json.dumps({
+            "stages": [s.model_dump() for s in self.stage_stats()],
+            "totals": self.totals(),
+            "records": [r.model_dump() for r in self.records],
+        }, indent=2))
+
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(StageTiming.model_fields))
+            writer.writeheader()
+            for r in self.records:
+                writer.writerow(r.model_dump())
+
+        return json_file, csv_file
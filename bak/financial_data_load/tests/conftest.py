@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Tests import the loader's modules as ``src.*``, and the workshop's shared/
+# modules as top-level modules, as main.py does.
+_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT.parent / "shared"))
+sys.path.insert(0, str(_ROOT))
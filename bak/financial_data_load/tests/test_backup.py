@@ -0,0 +1,207 @@
+"""Differential backups: a full backup and two diffs on top restore the graph
+as it was when each was taken."""
+
+import json
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+from src import backup, loader
+
+
+class _Result(list):
+    def consume(self):
+        pass
+
+
+class FakeGraph:
+    """Driver stand-in holding nodes and relationships in memory.
+
+    Answers the queries backup_database and restore_database send: label and
+    type listings, partition exports, the UNWIND batches that create and
+    remove nodes and relationships, and dropping the temporary restore ids.
+    Schema statements are accepted and ignored.
+    """
+
+    def __init__(self):
+        self.nodes: dict[str, dict] = {}
+        self.rels: dict[str, dict] = {}
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def _next_id(self) -> str:
+        self._ids += 1
+        return f"4:test:{self._ids}"
+
+    def add_node(self, labels: list[str], **props) -> str:
+        eid = self._next_id()
+        self.nodes[eid] = {"labels": labels, "props": props}
+        return eid
+
+    def add_rel(self, start: str, rel_type: str, end: str, **props) -> str:
+        rid = self._next_id()
+        self.rels[rid] = {"s": start, "e": end, "type": rel_type, "props": props}
+        return rid
+
+    def delete_node(self, eid: str) -> None:
+        del self.nodes[eid]
+        self.rels = {
+            rid: r for rid, r in self.rels.items() if eid not in (r["s"], r["e"])
+        }
+
+    def clear(self, driver=None) -> None:
+        self.nodes.clear()
+        self.rels.clear()
+
+    def canonical(self) -> tuple[Counter, Counter]:
+        """Nodes and relationships by content, ignoring element ids."""
+        def node(eid):
+            n = self.nodes[eid]
+            return json.dumps([sorted(n["labels"]), n["props"]], sort_keys=True)
+
+        nodes = Counter(node(eid) for eid in self.nodes)
+        rels = Counter(
+            json.dumps([node(r["s"]), r["type"], node(r["e"]), r["props"]], sort_keys=True)
+            for r in self.rels.values()
+        )
+        return nodes, rels
+
+    # -- driver API ----------------------------------------------------------
+
+    @contextmanager
+    def session(self, **kwargs):
+        yield self
+
+    def run(self, query, params=None):
+        params = params or {}
+        with self._lock:
+            if "REMOVE n:" in query:
+                for n in self.nodes.values():
+                    n["labels"] = [l for l in n["labels"] if l != backup._RESTORE_LABEL]
+                    n["props"].pop(backup._RESTORE_ID, None)
+                return _Result()
+            if "size(labels(n)) = 0" in query:
+                return _Result(self._node_records(lambda labels: not labels))
+            if match := re.search(r"MATCH \(n:`([^`]+)`\)", query):
+                label, earlier = match.group(1), set(params["earlier"])
+                return _Result(self._node_records(
+                    lambda labels: label in labels and not earlier & set(labels)))
+            if match := re.search(r"MATCH \(a\)-\[r:`([^`]+)`\]->\(b\)", query):
+                return _Result(
+                    {"start_eid": r["s"], "end_eid": r["e"], "type": r["type"],
+                     "props": dict(r["props"])}
+                    for r in self.rels.values() if r["type"] == match.group(1)
+                )
+        raise AssertionError(f"unexpected session query: {query}")
+
+    def _node_records(self, keep):
+        return [
+            {"eid": eid, "labels": list(n["labels"]), "props": dict(n["props"])}
+            for eid, n in self.nodes.items() if keep(n["labels"])
+        ]
+
+    def _restored(self, bid):
+        (eid,) = [
+            eid for eid, n in self.nodes.items()
+            if backup._RESTORE_LABEL in n["labels"]
+            and n["props"].get(backup._RESTORE_ID) == bid
+        ]
+        return eid
+
+    def execute_query(self, query, **params):
+        with self._lock:
+            records = self._execute(query, params.get("batch", []))
+        return records, None, None
+
+    def _execute(self, query, batch):
+        if "CALL db.labels()" in query:
+            labels = sorted({l for n in self.nodes.values() for l in n["labels"]})
+            return [{"label": l} for l in labels]
+        if "CALL db.relationshipTypes()" in query:
+            return [{"relationshipType": t} for t in sorted({r["type"] for r in self.rels.values()})]
+        if "UNWIND $batch AS row" in query:
+            labels = re.findall(r"`([^`]+)`", re.search(r"CREATE \(n([^)]*)\)", query).group(1))
+            for row in batch:
+                props = {**row["props"], **row["emb"], backup._RESTORE_ID: row["bid"]}
+                self.nodes[self._next_id()] = {"labels": labels, "props": props}
+        elif "UNWIND $batch AS rel" in query:
+            rel_type = re.search(r"\[r:`([^`]+)`\]", query).group(1)
+            for rel in batch:
+                start, end = self._restored(rel["s"]), self._restored(rel["e"])
+                if "CREATE (a)" in query:
+                    self.add_rel(start, rel_type, end, **rel["props"])
+                    continue
+                # Removal: delete one matching relationship.
+                rid = next(
+                    rid for rid, r in self.rels.items()
+                    if (r["s"], r["type"], r["e"], r["props"]) == (start, rel_type, end, rel["props"])
+                )
+                del self.rels[rid]
+        elif "UNWIND $batch AS key" in query:
+            for key in batch:
+                self.delete_node(self._restored(key))
+        return []
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    graph = FakeGraph()
+    monkeypatch.setattr(backup, "BACKUP_DIR", tmp_path)
+    monkeypatch.setattr(loader, "clear_database", graph.clear)
+    return graph
+
+
+def _take(graph, name, base=None):
+    """Back up the graph under a fixed name; backups taken within one second
+    would otherwise share a timestamped directory name."""
+    path = backup.backup_database(graph, concurrency=2, compress=name != "diff2", base=base)
+    return path.rename(path.parent / name)
+
+
+def test_full_then_two_diffs_restore_each_state(graph):
+    embedding = [i / 8 for i in range(backup._MIN_EMBEDDING_DIMS)]
+    apple = graph.add_node(["Company"], name="Apple", ticker="AAPL")
+    acme = graph.add_node(["Company"], name="Acme")
+    # Identical nodes and identical parallel relationships share a content hash.
+    twin_a = graph.add_node(["Product"], name="Widget")
+    twin_b = graph.add_node(["Product"], name="Widget")
+    chunk = graph.add_node(["Chunk"], text="Apple makes widgets", embedding=embedding)
+    graph.add_rel(apple, "MAKES", twin_a)
+    graph.add_rel(apple, "MAKES", twin_b)
+    mention = graph.add_rel(chunk, "MENTIONS", apple, count=1)
+    graph.add_rel(chunk, "MENTIONS", apple, count=1)
+    graph.add_rel(acme, "COMPETES_WITH", apple)
+
+    states = {}
+    states["full"] = graph.canonical()
+    full = _take(graph, "full")
+
+    # A changed node is a removal plus an addition, and so are its relationships.
+    graph.nodes[acme]["props"]["name"] = "Acme Corp"
+    del graph.rels[mention]
+    risk = graph.add_node(["RiskFactor"], name="Supply chain")
+    graph.add_rel(apple, "FACES_RISK", risk)
+    states["diff1"] = graph.canonical()
+    diff1 = _take(graph, "diff1", base=full)
+
+    graph.delete_node(twin_b)
+    graph.add_rel(twin_a, "MENTIONED_IN", chunk)
+    states["diff2"] = graph.canonical()
+    diff2 = _take(graph, "diff2", base=diff1)
+
+    manifest = json.loads((diff2 / "manifest.json").read_text())
+    assert (manifest["kind"], manifest["base"]) == ("differential", "diff1")
+    assert (manifest["added_nodes"], manifest["removed_nodes"]) == (0, 1)
+    assert backup._backup_chain(diff2) == [full, diff1, diff2]
+
+    for path in (full, diff1, diff2):
+        graph.add_node(["Stale"], name="left over from before the restore")
+        backup.restore_database(graph, path, concurrency=2)
+        assert graph.canonical() == states[path.name]
+        assert not any(
+            backup._RESTORE_LABEL in n["labels"] or backup._RESTORE_ID in n["props"]
+            for n in graph.nodes.values()
+        )
@@ -0,0 +1,26 @@
+"""Entity resolution verdicts are cached per unordered pair, model, and prompt version."""
+
+from src.decision_cache import DecisionCache, fingerprint
+
+VERDICT = {"same_entity": True, "confidence": 0.9, "reasoning": "same ticker"}
+
+
+def test_pair_order_shares_an_entry_and_model_or_prompt_changes_miss(tmp_path):
+    path = tmp_path / "decisions.sqlite"
+    a, b = fingerprint("Apple Inc. [Company]"), fingerprint("Apple [Company]")
+
+    cache = DecisionCache("gpt-4o", "v1", path=path)
+    cache.put_many([(a, b, VERDICT)])
+    assert cache.get(a, b) == VERDICT
+    assert cache.get(b, a) == VERDICT
+    cache.close()
+
+    reopened = DecisionCache("gpt-4o", "v1", path=path)
+    assert reopened.get(b, a) == VERDICT
+    reopened.close()
+
+    for model, prompt_version in (("gpt-4o", "v2"), ("gpt-4o-mini", "v1")):
+        other = DecisionCache(model, prompt_version, path=path)
+        assert other.get(a, b) is None
+        assert other.cache.misses == 1
+        other.close()
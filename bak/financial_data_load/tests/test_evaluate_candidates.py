@@ -0,0 +1,80 @@
+"""Concurrent LLM batches give the same decisions, in the same order, as a serial run."""
+
+import asyncio
+import json
+import re
+from collections import Counter
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+from src.entity_resolution import (
+    CandidatePair,
+    EntityResolutionConfig,
+    _evaluate_candidates,
+)
+from src.snapshot import SnapshotEntity
+
+
+def _entity(name: str) -> SnapshotEntity:
+    return SnapshotEntity(
+        element_id=name, name=name, labels=["Company"],
+        properties={}, source_chunks=[], relationship_count=0,
+    )
+
+
+def _bad_request() -> openai.BadRequestError:
+    request = httpx.Request("POST", "https://llm.test/chat/completions")
+    return openai.BadRequestError(
+        "bad request", response=httpx.Response(400, request=request), body=None,
+    )
+
+
+class FakeChatClient:
+    """Answers every pair as a match, listing decisions in reverse pair order.
+
+    The batch holding ``slow`` finishes last, the one holding ``flaky``
+    fails on its first call, and the one holding ``broken`` always fails.
+    """
+
+    def __init__(self, slow: str, flaky: str, broken: str):
+        self.slow, self.flaky, self.broken = slow, flaky, broken
+        self.calls: Counter[str] = Counter()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        first = re.search(r'Entity A: "([^"]+)"', prompt).group(1)
+        self.calls[first] += 1
+        if first == self.broken or (first == self.flaky and self.calls[first] == 1):
+            raise _bad_request()
+        if first == self.slow:
+            await asyncio.sleep(0.05)
+        pairs = len(re.findall(r"^Pair \d+:", prompt, flags=re.M))
+        decisions = [
+            {"pair_index": i, "same_entity": True, "confidence": 0.9, "reasoning": first}
+            for i in range(pairs, 0, -1)
+        ]
+        content = json.dumps({"decisions": decisions})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_decisions_keep_candidate_order_and_failed_batches_are_retried_then_dropped():
+    candidates = [
+        CandidatePair(entity_a=_entity(f"a{i}"), entity_b=_entity(f"b{i}"), pre_filter_score=0.9)
+        for i in range(10)
+    ]
+    config = EntityResolutionConfig(
+        model_name="fake-er-model", batch_size=2, concurrency=4, batch_retries=1,
+    )
+    # Batches start with a0, a2, a4, a6, a8.
+    client = FakeChatClient(slow="a0", flaky="a4", broken="a8")
+
+    decisions = asyncio.run(_evaluate_candidates(candidates, config, client))
+
+    assert [d.entity_a_element_id for d in decisions] == [f"a{i}" for i in range(8)]
+    assert all(d.decision == "merge" for d in decisions)
+    assert client.calls["a4"] == 2  # retried once, then succeeded
+    assert client.calls["a8"] == config.batch_retries + 1  # then dropped
+    assert client.calls["a0"] == client.calls["a2"] == client.calls["a6"] == 1
@@ -0,0 +1,59 @@
+"""The vectorised pre-filters return the same pairs as the all-pairs loops they replaced."""
+
+import pytest
+from rapidfuzz import fuzz, utils
+
+from src.bench import synthetic_entity_names
+from src.entity_resolution import _CDIST_ROWS, _fuzzy_pre_filter, _prefix_pre_filter
+from src.snapshot import SnapshotEntity
+
+
+def _entities(n: int) -> list[SnapshotEntity]:
+    return [
+        SnapshotEntity(
+            element_id=str(i), name=name, labels=["Product"],
+            properties={}, source_chunks=[], relationship_count=0,
+        )
+        for i, name in enumerate(synthetic_entity_names(n, seed=1))
+    ]
+
+
+def _all_pairs_fuzzy(entities, threshold):
+    pairs = []
+    for i, a in enumerate(entities):
+        for b in entities[i + 1 :]:
+            score = fuzz.WRatio(a.name, b.name, processor=utils.default_process) / 100
+            if score >= threshold:
+                pairs.append((a.element_id, b.element_id, score))
+    return pairs
+
+
+def _all_pairs_prefix(entities, threshold):
+    pairs = []
+    for i, a in enumerate(entities):
+        for b in entities[i + 1 :]:
+            a_lower = a.name.lower().strip()
+            b_lower = b.name.lower().strip()
+            if a_lower.startswith(b_lower) or b_lower.startswith(a_lower):
+                score = min(len(a_lower), len(b_lower)) / max(len(a_lower), len(b_lower), 1)
+                if score >= threshold:
+                    pairs.append((a.element_id, b.element_id, score))
+    return pairs
+
+
+def _as_tuples(pairs):
+    return [(p.entity_a.element_id, p.entity_b.element_id, p.pre_filter_score) for p in pairs]
+
+
+# More names than one cdist block, so block boundaries are covered.
+ENTITIES = _entities(_CDIST_ROWS + 250)
+
+
+@pytest.mark.parametrize("threshold", [0.6, 0.8])
+def test_fuzzy_matches_all_pairs_loop(threshold):
+    assert _as_tuples(_fuzzy_pre_filter(ENTITIES, threshold)) == _all_pairs_fuzzy(ENTITIES, threshold)
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.6])
+def test_prefix_matches_all_pairs_loop(threshold):
+    assert _as_tuples(_prefix_pre_filter(ENTITIES, threshold)) == _all_pairs_prefix(ENTITIES, threshold)
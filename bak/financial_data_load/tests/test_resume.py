@@ -0,0 +1,114 @@
+"""load --resume after a failure that already wrote part of a filing, and
+the manifest after restoring an older backup."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from src import backup, config, pipeline
+from src.manifest import IngestionManifest
+
+
+class FakeGraph:
+    """Driver stand-in holding Document nodes; answers delete_document."""
+
+    def __init__(self):
+        self.documents: list[str] = []
+
+    def execute_query(self, query, **params):
+        if "DETACH DELETE" in query:
+            name = params["filename"]
+            before = len(self.documents)
+            self.documents = [d for d in self.documents if not d.endswith(name)]
+            return [{"documents": before - len(self.documents), "chunks": 0, "orphans": 0}], None, None
+        if "RETURN d.path AS path" in query:
+            return [{"path": d} for d in self.documents], None, None
+        return [], None, None
+
+
+class FlakyPipeline:
+    """Writes the Document node, then fails the first run of every PDF."""
+
+    def __init__(self, graph: FakeGraph, failures: set[str]):
+        self.graph = graph
+        self.failures = failures
+
+    async def run_async(self, file_path, document_metadata, **kwargs):
+        self.graph.documents.append(file_path)
+        if file_path in self.failures:
+            self.failures.discard(file_path)
+            raise RuntimeError("Neo4jWriter failed mid-batch")
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    paths = []
+    for name in ("a.pdf", "b.pdf"):
+        path = tmp_path / name
+        path.write_bytes(f"%PDF {name}".encode())
+        paths.append(path)
+    return paths
+
+
+def test_resume_after_failure_leaves_one_document_per_pdf(monkeypatch, tmp_path, pdfs):
+    graph = FakeGraph()
+    failures = {str(pdfs[0])}
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setattr(IngestionManifest, "save", lambda self, path=None: None)
+    monkeypatch.setattr(pipeline, "_setup_logging", lambda: tmp_path / "load.log")
+    monkeypatch.setattr(
+        pipeline, "_create_streaming_pipeline",
+        lambda *args, **kwargs: FlakyPipeline(graph, failures),
+    )
+    monkeypatch.setattr(pipeline, "_document_counts", lambda driver, path: (
+        sum(d == str(path) for d in graph.documents), 0,
+    ))
+
+    async def close():
+        pass
+
+    llm = SimpleNamespace(async_client=SimpleNamespace(close=close))
+    manifest = IngestionManifest()
+
+    def load(files):
+        return pipeline.process_all_pdfs(
+            graph, files, {}, manifest=manifest, streaming=True,
+            llm=llm, embedder=object(),
+        )
+
+    first = load(pdfs)
+    assert [r.success for r in first] == [False, True]
+    assert graph.documents.count(str(pdfs[0])) == 1  # partial write left behind
+
+    second = load(manifest.pending(pdfs))
+    assert [r.success for r in second] == [True]
+    for pdf in pdfs:
+        assert graph.documents.count(str(pdf)) == 1
+    assert all(manifest.is_complete(h) for h in manifest.documents)
+
+
+def test_restore_forgets_pdfs_missing_from_the_backup(monkeypatch, tmp_path, pdfs):
+    graph = FakeGraph()
+    manifest = IngestionManifest()
+    for pdf in pdfs:
+        manifest.record(pdf.name, SimpleNamespace(
+            pdf_path=pdf, success=True, duration=1.0, chunk_count=1, entity_count=1, error=None,
+        ))
+
+    def restore(driver, backup_path, concurrency):
+        graph.documents = [str(pdfs[0])]  # the backup predates b.pdf
+
+    @contextmanager
+    def connect():
+        yield graph
+
+    monkeypatch.setattr(IngestionManifest, "save", lambda self, path=None: None)
+    monkeypatch.setattr(IngestionManifest, "load", classmethod(lambda cls, path=None: manifest))
+    monkeypatch.setattr(backup, "restore_database", restore)
+    monkeypatch.setattr(config, "connect", connect)
+
+    main.cmd_restore(SimpleNamespace(backup=str(tmp_path), concurrency=1))
+
+    assert [e.filename for e in manifest.documents.values()] == ["a.pdf"]
@@ -33,6 +33,7 @@ from neo4j_agent_memory.embeddings.base import BaseEmbedder
 from neo4j_agent_memory.extraction.llm_extractor import LLMEntityExtractor
 
 from config import _get_azure_token, get_agent_config
+from rate_limit import estimate_tokens, get_rate_limiter
 
 if TYPE_CHECKING:
     from neo4j_agent_memory.extraction.base import EntityExtractor
@@ -41,7 +42,11 @@ logger = logging.getLogger(__name__)
 
 
 class AzureFoundryEmbedder(BaseEmbedder):
-    """Embedder using Azure AI Foundry's OpenAI-compatible inference endpoint."""
+    """Embedder using Azure AI Foundry's OpenAI-compatible inference endpoint.
+
+    Requests go through the deployment's shared rate limiter, which handles
+    429s and retries, so the OpenAI client's own retries are disabled.
+    """
 
     def __init__(
         self,
@@ -56,7 +61,8 @@ class AzureFoundryEmbedder(BaseEmbedder):
         self._model = model
         self._dimensions = dimensions
         self._batch_size = batch_size
-        self._client = AsyncOpenAI(base_url=base_url, api_key=api_key)
+        self._client = AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+        self._limiter = get_rate_limiter(model)
 
     @property
     def dimensions(self) -> int:
@@ -64,9 +70,12 @@ class AzureFoundryEmbedder(BaseEmbedder):
 
     async def embed(self, text: str) -> list[float]:
         try:
-            response = await self._client.embeddings.create(
-                input=text,
-                model=self._model,
+            response = await self._limiter.run(
+                lambda: self._client.embeddings.create(
+                    input=text,
+                    model=self._model,
+                ),
+                tokens=estimate_tokens(text),
             )
             return response.data[0].embedding
         except Exception as e:
@@ -77,9 +86,12 @@ class AzureFoundryEmbedder(BaseEmbedder):
             all_embeddings: list[list[float]] = []
             for i in range(0, len(texts), self._batch_size):
                 batch = texts[i : i + self._batch_size]
-                response = await self._client.embeddings.create(
-                    input=batch,
-                    model=self._model,
+                response = await self._limiter.run(
+                    lambda: self._client.embeddings.create(
+                        input=batch,
+                        model=self._model,
+                    ),
+                    tokens=sum(estimate_tokens(t) for t in batch),
                 )
                 all_embeddings.extend([item.embedding for item in response.data])
             return all_embeddings
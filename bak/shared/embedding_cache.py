@@ -0,0 +1,108 @@
+"""Persistent, content-addressed embedding cache.
+
+Wraps an Embedder so identical texts are embedded once: vectors are stored
+in a local SQLite file keyed by (model, dimensions, SHA-256 of the text) as
+packed float32. Re-running notebooks, loads, ``verify``, and solution
+scripts then reads chunk and query embeddings from disk instead of calling
+the endpoint. The notebooks (via config.py) and financial_data_load import
+this one module. The loader caches by default; the workshop notebooks and
+solution scripts only with EMBED_CACHE_ENABLED=true, so a lab run calls the
+endpoint as its instructions describe. The cache is capped at ``max_entries``; the least recently
+used vectors are evicted first (see sqlite_cache.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Any
+
+from neo4j_graphrag.embeddings import Embedder
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from sqlite_cache import SQLiteCache
+
+EMBEDDING_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "embeddings.sqlite"
+
+
+class EmbeddingCacheConfig(BaseSettings):
+    """Embedding cache settings loaded from .env (EMBED_CACHE_ prefix)."""
+
+    model_config = SettingsConfigDict(env_prefix="EMBED_CACHE_", extra="ignore")
+
+    # Unset: the caller's default (see with_embedding_cache).
+    enabled: bool | None = None
+    max_entries: int = 200_000
+    path: Path = EMBEDDING_CACHE_PATH
+
+
+def _cache_key(model: str, dimensions: int | None, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{dimensions or 0}:{digest}"
+
+
+class CachedEmbedder(Embedder):
+    """Embedder that serves repeated texts from a local SQLite cache."""
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        model: str,
+        path: Path = EMBEDDING_CACHE_PATH,
+        max_entries: int = 200_000,
+    ):
+        super().__init__()
+        self.embedder = embedder
+        self.model = model
+        self.path = path
+        self.cache = SQLiteCache(
+            path, "embeddings", "vector", value_type="BLOB", max_entries=max_entries,
+        )
+
+    def _get(self, key: str) -> list[float] | None:
+        vector = self.cache.get(key)
+        return array("f", vector).tolist() if vector is not None else None
+
+    def _put(self, key: str, vector: list[float]) -> None:
+        self.cache.put(key, array("f", vector).tobytes())
+
+    # -- Embedder interface --------------------------------------------------
+
+    def embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        key = _cache_key(self.model, kwargs.get("dimensions"), text)
+        vector = self._get(key)
+        if vector is None:
+            vector = self.embedder.embed_query(text, **kwargs)
+            self._put(key, vector)
+        return vector
+
+    async def async_embed_query(self, text: str, **kwargs: Any) -> list[float]:
+        key = _cache_key(self.model, kwargs.get("dimensions"), text)
+        vector = self._get(key)
+        if vector is None:
+            vector = await self.embedder.async_embed_query(text, **kwargs)
+            self._put(key, vector)
+        return vector
+
+    # -- reporting -----------------------------------------------------------
+
+    def summary(self) -> str:
+        return self.cache.summary()
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def with_embedding_cache(
+    embedder: Embedder, model: str, enabled_by_default: bool = False
+) -> Embedder:
+    """Wrap an embedder in a CachedEmbedder if EMBED_CACHE_ENABLED is true, or
+    if it is unset and ``enabled_by_default``."""
+    config = EmbeddingCacheConfig()
+    enabled = config.enabled if config.enabled is not None else enabled_by_default
+    if not enabled:
+        return embedder
+    return CachedEmbedder(
+        embedder, model, path=config.path, max_entries=config.max_entries,
+    )
@@ -0,0 +1,314 @@
+"""Client-side rate limiting for Azure / OpenAI LLM and embedding calls.
+
+One RateLimiter per model deployment is shared by every caller in the
+process (AzureFoundryEmbedder here; the KG pipeline, entity resolution,
+and the embedder in financial_data_load, whose src/rate_limit.py wraps this
+module for neo4j-graphrag), because quotas are enforced per deployment, not
+per caller. Each limiter combines:
+
+- Optional token buckets for requests-per-minute and tokens-per-minute,
+  enabled only when RATE_LIMIT_REQUESTS_PER_MINUTE / _TOKENS_PER_MINUTE are
+  set. Buckets hold one sixth of the per-minute quota, matching the
+  10-second windows Azure enforces, so bursts stay under quota instead of
+  tripping it.
+- AIMD concurrency: the number of in-flight async requests grows by one per
+  window of successes and halves on a 429, settling just under the quota.
+- Jittered exponential retries for 429s and transient errors, honouring
+  ``Retry-After`` by pausing every caller of the deployment, not only the
+  one that was throttled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Azure enforces per-minute quotas over 10-second windows.
+_BURST_FRACTION = 1 / 6
+
+# Rough prompt size estimate used for tokens-per-minute accounting.
+_CHARS_PER_TOKEN = 4
+
+
+class RateLimitConfig(BaseSettings):
+    """Rate limiter settings loaded from .env (RATE_LIMIT_ prefix)."""
+
+    model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_", extra="ignore")
+
+    # Deployment quotas; unset means no client-side pacing, and 429s are
+    # handled by AIMD concurrency and retries alone.
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    max_retries: int = 6
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a prompt from its length."""
+    return max(1, len(text) // _CHARS_PER_TOKEN)
+
+
+# ---------------------------------------------------------------------------
+# Error classification
+# ---------------------------------------------------------------------------
+
+
+def _error_chain(exc: BaseException):
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for e in _error_chain(exc):
+        status = getattr(e, "status_code", None)
+        if status is None:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+_THROTTLE_PATTERNS = ("error code: 429", "too many requests", "rate limit")
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """True for 429 responses, including ones wrapped by neo4j-graphrag."""
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429
+    return any(
+        pattern in str(e).lower() for e in _error_chain(exc) for pattern in _THROTTLE_PATTERNS
+    )
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for errors worth retrying without reducing concurrency (5xx, timeouts)."""
+    status = _status_code(exc)
+    if status is not None:
+        return status >= 500 or status == 408
+    names = {type(e).__name__ for e in _error_chain(exc)}
+    return bool(names & {"APIConnectionError", "APITimeoutError", "TimeoutError"})
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds to wait from Retry-After / retry-after-ms response headers."""
+    for e in _error_chain(exc):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if not headers:
+            continue
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            return None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Token bucket
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``per_minute`` / 60 per second.
+
+    ``reserve`` takes tokens immediately (the balance may go negative) and
+    returns how long the caller must wait before using them, so sync and
+    async callers share one bucket and are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float, burst_fraction: float = _BURST_FRACTION):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, per_minute * burst_fraction)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _bucket(per_minute: int | None) -> TokenBucket | None:
+    return TokenBucket(per_minute) if per_minute else None
+
+
+# ---------------------------------------------------------------------------
+# Rate limiter
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Token-bucket + AIMD scheduler for one model deployment."""
+
+    def __init__(self, name: str, config: RateLimitConfig | None = None):
+        self.name = name
+        self.config = config or RateLimitConfig()
+        self.requests = _bucket(self.config.requests_per_minute)
+        self.tokens = _bucket(self.config.tokens_per_minute)
+        self.limit = float(self.config.max_concurrency)
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+
+    # -- AIMD ----------------------------------------------------------------
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.limit = min(self.config.max_concurrency, self.limit + 1 / self.limit)
+
+    def _on_throttle(self, started: float, wait: float | None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.throttled += 1
+            # Requests sent before the last decrease were admitted under the
+            # old limit; their 429s must not halve concurrency again.
+            if started >= self._last_decrease:
+                self.limit = max(self.config.min_concurrency, self.limit / 2)
+                self._last_decrease = now
+                logger.warning(f"{self.name}: throttled, concurrency -> {int(self.limit)}")
+            if wait:
+                self._paused_until = max(self._paused_until, now + wait)
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        cap = min(self.config.max_delay, self.config.base_delay * 2 ** attempt)
+        return max(retry_after(exc) or 0.0, random.uniform(0, cap))
+
+    def _admission_delay(self, tokens: int) -> float:
+        pause = max(0.0, self._paused_until - time.monotonic())
+        if self.requests is not None:
+            pause = max(pause, self.requests.reserve(1))
+        if self.tokens is not None:
+            pause = max(pause, self.tokens.reserve(tokens))
+        return pause
+
+    def _should_retry(self, attempt: int, started: float, exc: BaseException) -> bool:
+        if attempt >= self.config.max_retries:
+            return False
+        if is_throttled(exc):
+            self._on_throttle(started, retry_after(exc))
+        elif not is_transient(exc):
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    # -- async ---------------------------------------------------------------
+
+    def _async_condition(self) -> asyncio.Condition:
+        # asyncio primitives bind to one event loop; each asyncio.run() needs its own.
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+    async def run(self, fn: Callable[[], Awaitable[T]], tokens: int = 1) -> T:
+        """Await ``fn()`` within the rate limits, retrying 429s and transient errors."""
+        condition = self._async_condition()
+        attempt = 0
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+            try:
+                await asyncio.sleep(self._admission_delay(tokens))
+                started = time.monotonic()
+                result = await fn()
+            except Exception as e:
+                if not self._should_retry(attempt, started, e):
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.info(f"{self.name}: retry {attempt + 1} in {delay:.1f}s ({e})")
+            else:
+                self._on_success()
+                return result
+            finally:
+                async with condition:
+                    self.in_flight -= 1
+                    condition.notify_all()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # -- sync ----------------------------------------------------------------
+
+    def run_sync(self, fn: Callable[[], T], tokens: int = 1) -> T:
+        """Call ``fn()`` within the rate limits, retrying 429s and transient errors.
+
+        Sync callers are sequential, so only the token buckets, Retry-After
+        pauses, and retries apply; concurrency is gated on the async path.
+        """
+        attempt = 0
+        while True:
+            time.sleep(self._admission_delay(tokens))
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._should_retry(attempt, started, e):
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.info(f"{self.name}: retry {attempt + 1} in {delay:.1f}s ({e})")
+                attempt += 1
+                time.sleep(delay)
+            else:
+                self._on_success()
+                return result
+
+    def summary(self) -> str:
+        return (f"{self.calls} calls, {self.throttled} throttled, "
+                f"{self.retries} retries, concurrency {int(self.limit)}")
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, config: RateLimitConfig | None = None) -> RateLimiter:
+    """Return the process-wide limiter for a model deployment, creating it once.
+
+    ``config`` (default: RATE_LIMIT_* settings) only applies if this call
+    creates the limiter.
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(name, config)
+        return _limiters[name]
+
+
+def rate_limiters() -> list[RateLimiter]:
+    """All limiters created in this process, for run summaries."""
+    with _limiters_lock:
+        return list(_limiters.values())
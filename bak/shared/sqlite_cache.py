@@ -0,0 +1,162 @@
+"""SQLite key/value table with LRU eviction, shared by the on-disk caches.
+
+The embedding, LLM response, and entity resolution decision caches each
+keep one table of (key, value, last_used) rows -- plus ``created_at`` when
+entries expire -- in a local SQLite file. Hits only record their
+``last_used`` time in memory; the times are written in batches with the
+next write, once ``_TOUCH_EVERY`` distinct keys were hit, and on close, so
+a lookup costs one SELECT and no commit. Least recently used rows beyond
+``max_entries`` are evicted on open, every ``_PRUNE_EVERY`` inserts, and
+on close.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+# Prune at most once per this many inserts, not on every write.
+_PRUNE_EVERY = 100
+
+# Write pending last_used times once this many distinct keys were hit.
+_TOUCH_EVERY = 100
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class SQLiteCache:
+    """One cache table: ``get``/``put`` by key, with hit/miss counts."""
+
+    def __init__(
+        self,
+        path: Path,
+        table: str,
+        value_column: str,
+        value_type: str = "TEXT",
+        max_entries: int = 200_000,
+        max_age_days: float | None = None,
+    ):
+        self.table = table
+        self.value_column = value_column
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._inserts = 0
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        created_at = "created_at REAL NOT NULL," if max_age_days is not None else ""
+        path.parent.mkdir(exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                {value_column} {value_type} NOT NULL,
+                {created_at}
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_last_used ON {table}(last_used)"
+        )
+        self._evict()
+        self._conn.commit()
+
+    def _oldest_allowed(self) -> float:
+        return time.time() - self.max_age_days * _SECONDS_PER_DAY
+
+    def get(self, key: str, accept: Callable[[Any], bool] | None = None) -> Any | None:
+        """The stored value, or None. A value ``accept`` rejects is deleted and missed."""
+        query = f"SELECT {self.value_column} FROM {self.table} WHERE key = ?"
+        params: tuple = (key,)
+        if self.max_age_days is not None:
+            query += " AND created_at >= ?"
+            params += (self._oldest_allowed(),)
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is not None and accept is not None and not accept(row[0]):
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= _TOUCH_EVERY:
+                self._flush_touched()
+                self._conn.commit()
+        return row[0]
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[tuple[str, Any]]) -> None:
+        """Store several values in one transaction."""
+        now = time.time()
+        if self.max_age_days is not None:
+            sql = (f"INSERT OR REPLACE INTO {self.table} "
+                   f"(key, {self.value_column}, created_at, last_used) VALUES (?, ?, ?, ?)")
+            rows = [(key, value, now, now) for key, value in items]
+        else:
+            sql = (f"INSERT OR REPLACE INTO {self.table} "
+                   f"(key, {self.value_column}, last_used) VALUES (?, ?, ?)")
+            rows = [(key, value, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._flush_touched()
+            before = self._inserts
+            self._inserts += len(rows)
+            if self._inserts // _PRUNE_EVERY > before // _PRUNE_EVERY:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write the last_used times of hits since the previous flush."""
+        if self._touched:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop expired rows, then the least recently used beyond ``max_entries``."""
+        if self.max_age_days is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (self._oldest_allowed(),)
+            )
+        (count,) = self._conn.execute(f"SELECT count(*) FROM {self.table}").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY last_used LIMIT ?
+                )
+            """, (excess,))
+
+    # -- reporting -----------------------------------------------------------
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate:.0%} hit rate)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._evict()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,270 @@
+"""Graph statistics collected once and shared by verify, validation, and tests.
+
+``loader.verify``, ``pipeline.validate_enrichment``, ``main.py test`` and
+``01_test_full_data_load`` all read node/relationship counts, embedding
+coverage, provenance, and duplicate/orphan metrics from one GraphStats
+snapshot instead of each scanning the graph. The module lives in shared/
+so the solution scripts import it the same way as the loader's src/:
+
+- Per-label and per-type counts come from Neo4j's count store (a single
+  ``MATCH (n:Label) RETURN count(n)`` per label, answered without a scan).
+- Everything else is one statement of ``CALL () { ... }`` subqueries, so
+  Chunk and ``__Entity__`` nodes are each scanned once per metric group in
+  a single round trip.
+
+Snapshots are keyed by graph version -- the database id plus its last
+committed transaction -- kept in memory and in ``cache/graph_stats.json``,
+so commands run against an unchanged graph reuse the last snapshot. Where
+the server does not report a transaction id, the version falls back to a
+fingerprint of the count store and the snapshot is only cached in memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from neo4j import Driver
+from neo4j.exceptions import Neo4jError
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "graph_stats.json"
+
+SCHEMA_RELATIONSHIPS = [
+    "FACES_RISK", "OFFERS", "HAS_EXECUTIVE", "REPORTS", "COMPETES_WITH", "PARTNERS_WITH",
+]
+
+_DUPLICATE_LIMIT = 10
+
+
+class DuplicateName(BaseModel):
+    """A name shared by more than one node of the same label."""
+
+    label: str
+    name: str
+    count: int
+
+
+class GraphStats(BaseModel):
+    """One snapshot of graph-wide counts and quality metrics."""
+
+    version: str
+    collected_at: str
+
+    # Count store
+    nodes: int
+    relationships: int
+    labels: dict[str, int]
+    relationship_types: dict[str, int]
+
+    # Lexical graph
+    chunks_with_text: int
+    chunks_with_index: int
+    chunks_with_embedding: int
+    chunks_linked: int
+    documents_with_chunks: int
+    embedding_dimensions: int | None
+
+    # Extracted entities
+    entities_with_name: int
+    entities_with_embedding: int
+    entities_with_provenance: int
+    provenance_links: int
+    provenance_chunks: int
+    provenance_documents: int
+    orphan_entities: int
+    orphan_examples: list[str]
+    entities_without_schema_relationships: int
+    companies_with_name: int
+    companies_with_ticker: int
+    duplicate_names: list[DuplicateName]
+    duplicate_company_names: list[DuplicateName]
+
+    def count(self, label: str) -> int:
+        return self.labels.get(label, 0)
+
+    def rel_count(self, rel_type: str) -> int:
+        return self.relationship_types.get(rel_type, 0)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def _graph_version(driver: Driver) -> str | None:
+    """Database id + last committed transaction, or None if unavailable."""
+    try:
+        rows, _, _ = driver.execute_query(
+            "SHOW HOME DATABASE YIELD databaseID, lastCommittedTxn "
+            "RETURN databaseID, lastCommittedTxn"
+        )
+    except Neo4jError as e:
+        logger.debug(f"Graph version unavailable: {e}")
+        return None
+    if not rows or rows[0]["lastCommittedTxn"] is None:
+        return None
+    return f"{rows[0]['databaseID']}:{rows[0]['lastCommittedTxn']}"
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _store_counts(driver: Driver) -> tuple[int, int, dict[str, int], dict[str, int]]:
+    """Total, per-label, and per-type counts, all answered from the count store."""
+    rows, _, _ = driver.execute_query("""
+        CALL () { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+        CALL () {
+            CALL db.relationshipTypes() YIELD relationshipType
+            RETURN collect(relationshipType) AS types
+        }
+        RETURN labels, types
+    """)
+    labels, types = rows[0]["labels"], rows[0]["types"]
+
+    # One plain MATCH ... RETURN count() per subquery so each is planned as a
+    # count-store lookup rather than a scan.
+    subqueries = [
+        "CALL () { MATCH (n) RETURN count(n) AS nodes }",
+        "CALL () { MATCH ()-[r]->() RETURN count(r) AS relationships }",
+    ]
+    subqueries += [
+        f"CALL () {{ MATCH (n:{_quote(label)}) RETURN count(n) AS l{i} }}"
+        for i, label in enumerate(labels)
+    ]
+    subqueries += [
+        f"CALL () {{ MATCH ()-[r:{_quote(t)}]->() RETURN count(r) AS t{i} }}"
+        for i, t in enumerate(types)
+    ]
+    rows, _, _ = driver.execute_query("\n".join(subqueries) + "\nRETURN *")
+    counts = rows[0]
+    return (
+        counts["nodes"],
+        counts["relationships"],
+        {label: counts[f"l{i}"] for i, label in enumerate(labels)},
+        {t: counts[f"t{i}"] for i, t in enumerate(types)},
+    )
+
+
+_METRICS_QUERY = """
+CALL () {
+    MATCH (c:Chunk)
+    RETURN count(c.text) AS chunks_with_text,
+           count(c.index) AS chunks_with_index,
+           count(c.embedding) AS chunks_with_embedding,
+           max(size(c.embedding)) AS embedding_dimensions,
+           count(CASE WHEN EXISTS { (c)-[:FROM_DOCUMENT]->(:Document) } THEN 1 END) AS chunks_linked
+}
+CALL () {
+    MATCH (:Chunk)-[:FROM_DOCUMENT]->(d:Document)
+    RETURN count(DISTINCT d) AS documents_with_chunks
+}
+CALL () {
+    MATCH (e:__Entity__)
+    WITH e,
+         COUNT { (e)--() } AS degree,
+         COUNT { (e)-[:FROM_CHUNK]->(:Chunk) } AS links,
+         EXISTS { (e)-[:%s]-() } AS has_schema_rel
+    RETURN count(e.name) AS entities_with_name,
+           count(e.embedding) AS entities_with_embedding,
+           count(CASE WHEN links > 0 THEN 1 END) AS entities_with_provenance,
+           sum(links) AS provenance_links,
+           count(CASE WHEN degree = 0 THEN 1 END) AS orphan_entities,
+           collect(CASE WHEN degree = 0 THEN e.name END)[0..5] AS orphan_examples,
+           count(CASE WHEN NOT has_schema_rel THEN 1 END) AS entities_without_schema_relationships
+}
+CALL () {
+    MATCH (:__Entity__)-[:FROM_CHUNK]->(c:Chunk)-[:FROM_DOCUMENT]->(d:Document)
+    RETURN count(DISTINCT c) AS provenance_chunks, count(DISTINCT d) AS provenance_documents
+}
+CALL () {
+    MATCH (c:Company)
+    RETURN count(c.name) AS companies_with_name, count(c.ticker) AS companies_with_ticker
+}
+CALL () {
+    MATCH (e:__Entity__) WHERE e.name IS NOT NULL
+    WITH [l IN labels(e) WHERE NOT l STARTS WITH '__'] AS lbls, e.name AS name, count(e) AS cnt
+    WHERE cnt > 1
+    WITH lbls, name, cnt ORDER BY cnt DESC LIMIT $limit
+    RETURN collect({label: coalesce(lbls[0], '__Entity__'), name: name, count: cnt})
+        AS duplicate_names
+}
+CALL () {
+    MATCH (c:Company) WHERE c.name IS NOT NULL
+    WITH c.name AS name, count(*) AS cnt
+    WHERE cnt > 1
+    WITH name, cnt ORDER BY cnt DESC LIMIT $limit
+    RETURN collect({label: 'Company', name: name, count: cnt}) AS duplicate_company_names
+}
+RETURN *
+""" % "|".join(SCHEMA_RELATIONSHIPS)
+
+
+def _collect(driver: Driver, version: str, store_counts=None) -> GraphStats:
+    nodes, relationships, labels, types = store_counts or _store_counts(driver)
+    rows, _, _ = driver.execute_query(_METRICS_QUERY, limit=_DUPLICATE_LIMIT)
+    return GraphStats(
+        version=version,
+        collected_at=datetime.now().isoformat(timespec="seconds"),
+        nodes=nodes,
+        relationships=relationships,
+        labels=labels,
+        relationship_types=types,
+        **rows[0].data(),
+    )
+
+
+def _fingerprint(*counts) -> str:
+    payload = json.dumps(counts, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+_memory_cache: dict[str, GraphStats] = {}
+
+
+def _load_cached(version: str) -> GraphStats | None:
+    if not STATS_CACHE_PATH.exists():
+        return None
+    try:
+        stats = GraphStats.model_validate_json(STATS_CACHE_PATH.read_text())
+    except ValueError:
+        return None
+    return stats if stats.version == version else None
+
+
+def _save_cached(stats: GraphStats) -> None:
+    STATS_CACHE_PATH.parent.mkdir(exist_ok=True)
+    STATS_CACHE_PATH.write_text(stats.model_dump_json(indent=2))
+
+
+def graph_stats(driver: Driver, refresh: bool = False) -> GraphStats:
+    """Return statistics for the current graph version, collecting them if needed."""
+    version = _graph_version(driver)
+    store_counts = None
+    if version is None:
+        store_counts = _store_counts(driver)
+        version = "counts:" + _fingerprint(*store_counts)
+
+    if not refresh:
+        cached = _memory_cache.get(version)
+        if cached is None and not version.startswith("counts:"):
+            cached = _load_cached(version)
+        if cached is not None:
+            logger.info(f"Graph stats: cached snapshot for version {version}")
+            return cached
+
+    stats = _collect(driver, version, store_counts)
+    _memory_cache[version] = stats
+    if not version.startswith("counts:"):
+        _save_cached(stats)
+    return stats